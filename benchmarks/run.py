@@ -0,0 +1,319 @@
+"""
+Benchmarki gorących ścieżek gry.
+
+Dla każdego rozmiaru tworzona jest osobna, tymczasowa baza z syntetycznym słownikiem
+i historią gier. Mierzone są: import słownika (init_db), start na gotowej bazie,
+wczytanie indeksu słów, get_random_word, kolejne słowo maratonu, get_categories,
+save_game, zapis ruchów i wznowienie gry w toku, statystyki i historia gracza,
+czołówka rankingu i miejsce gracza, a jeśli da się uruchomić Tk - także przygotowanie
+rundy (plansza), animacja błędu na planszy i ekran statystyk w ukrytym oknie.
+Wyniki (percentyle opóźnień, przepustowość, szczytowa pamięć) są zapisywane do JSON
+i mogą być porównane z zapisanym wzorcem.
+
+Uruchomienie z katalogu głównego repozytorium:
+
+    python benchmarks/run.py
+    python benchmarks/run.py --sizes 1000 100000 10000000 --output wyniki.json
+    python benchmarks/run.py --baseline benchmarks/baseline.json --threshold 2
+    python benchmarks/run.py --save-baseline benchmarks/baseline.json
+
+Czasy zależą od maszyny, więc wzorzec trzeba nagrać na tej maszynie (i tej wersji
+Pythona), na której będzie porównywany; przy innej platformie porównanie wypisuje
+ostrzeżenie. Przypadki z medianą poniżej MIN_MS są pomijane, bo ich wahania między
+uruchomieniami przekraczają próg.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import string
+import sys
+import tempfile
+import time
+import tracemalloc
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src")
+sys.path.insert(0, os.path.abspath(SRC))
+
+import database
+import game
+import models  # init_db mierzy migrację i import słownika, a nie jednorazowy import SQLAlchemy
+from session import WordQueue
+from word_index import word_index
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+CATEGORIES = 10
+GAME_BATCH = 10000
+REPEAT = 2000
+GUI_REPEAT = 50
+THRESHOLD = 2.0     # całe uruchomienia na współdzielonej maszynie wahają się do ~1.7x
+MIN_MS = 1.0        # mediany poniżej 1 ms to głównie szum (planista, pamięć podręczna)
+LOAD_REPEAT = 20
+FLUSH_REPEAT = 5
+
+def summarize(samples):
+    """
+    Liczy statystyki z listy czasów pojedynczych wywołań (w sekundach).
+    :param samples: czasy wywołań
+    :return: dict z percentylami (ms) i przepustowością (wywołania/s)
+    """
+    samples = sorted(samples)
+    count = len(samples)
+    total = sum(samples)
+
+    def percentile(q):
+        return samples[min(count - 1, int(q * count))] * 1000
+
+    return {
+        "count": count,
+        "mean_ms": total / count * 1000,
+        "p50_ms": percentile(0.50),
+        "p95_ms": percentile(0.95),
+        "p99_ms": percentile(0.99),
+        "max_ms": samples[-1] * 1000,
+        "ops_per_second": count / total if total > 0 else 0.0,
+    }
+
+def measure(fn, repeat, setup=None):
+    """
+    Mierzy czas 'repeat' wywołań funkcji, a potem szczytową pamięć jednego dodatkowego wywołania.
+    :param fn: mierzona funkcja
+    :param repeat: liczba wywołań
+    :param setup: funkcja wywoływana przed każdym pomiarem (nie wliczana do czasu)
+    :return: dict jak w summarize() z dodanym peak_memory_kb
+    """
+    samples = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+
+    if setup:
+        setup()
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    result = summarize(samples)
+    result["peak_memory_kb"] = peak / 1024
+    return result
+
+def random_word(rng):
+    """
+    Losuje syntetyczne słowo z małych liter.
+    """
+    return "".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 12)))
+
+def write_dictionary(path, size, rng):
+    """
+    Zapisuje syntetyczny słownik NDJSON z 'size' słowami w CATEGORIES kategoriach.
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(size):
+            f.write(json.dumps({"word": f"{random_word(rng)}{i}", "category": f"Kategoria{i % CATEGORIES}"}))
+            f.write("\n")
+
+def fresh_database(workdir, name, words_file):
+    """
+    Przełącza aplikację na nową, pustą bazę i czyści pamięć podręczną słów i kategorii.
+    """
+    database.configure_db(os.path.join(workdir, name))
+    database.WORDS_FILE = words_file
+    word_index.invalidate()
+    game.words_changed()
+
+def add_history(user_id, size, rng):
+    """
+    Dopisuje 'size' gier użytkownika, partiami, z pominięciem kolejki zapisu.
+    """
+    for start in range(0, size, GAME_BATCH):
+        rows = [(user_id, random_word(rng).upper(), rng.randint(0, 6), rng.random() < 0.5, "Kategoria0")
+                for _ in range(min(GAME_BATCH, size - start))]
+        game.save_games(rows)
+
+def add_players(size, rng):
+    """
+    Dodaje 'size' graczy z jedną grą każdy (użytkownicy i ranking), z pominięciem kolejki zapisu.
+    :return: id dodanych graczy
+    """
+    with database.get_connection() as conn:
+        first = conn.execute("SELECT COALESCE(MAX(id), 0) FROM users").fetchone()[0] + 1
+        ids = list(range(first, first + size))
+        conn.executemany("INSERT INTO users (id, username, password) VALUES (?, ?, '')",
+                         [(user_id, f"gracz{user_id}") for user_id in ids])
+    for start in range(0, size, GAME_BATCH):
+        game.save_games([(user_id, random_word(rng).upper(), rng.randint(0, 6), rng.random() < 0.5, "Kategoria0")
+                         for user_id in ids[start:start + GAME_BATCH]])
+    return ids
+
+def bench_data(size, workdir, rng, repeat):
+    """
+    Benchmarki warstwy danych dla słownika i historii o rozmiarze 'size'.
+    :return: dict {nazwa przypadku: wynik}
+    """
+    results = {}
+    words_file = os.path.join(workdir, f"words_{size}.ndjson")
+    write_dictionary(words_file, size, rng)
+
+    counter = iter(range(1000000))
+    results["init_db"] = measure(database.init_db, 1,
+                                 setup=lambda: fresh_database(workdir, f"init_{size}_{next(counter)}.db", words_file))
+    fresh_database(workdir, f"bench_{size}.db", words_file)
+    database.init_db()
+    results["init_db_ready"] = measure(database.init_db, 100)
+
+    results["word_index_load"] = measure(lambda: word_index.words("Kategoria0"), LOAD_REPEAT,
+                                          setup=word_index.invalidate)
+    results["get_random_word"] = measure(lambda: game.get_random_word("Kategoria0"), repeat)
+    queue = WordQueue(game.get_words("Kategoria0"))
+    results["marathon_next_word"] = measure(queue.next, repeat)
+    game.get_categories()
+    results["get_categories"] = measure(game.get_categories, repeat)
+
+    results["save_game"] = measure(lambda: game.save_game(2, "SLOWO", 3, True), repeat)
+    results["save_game_flush"] = measure(game.game_writer.flush, FLUSH_REPEAT,
+                                         setup=lambda: [game.save_game(2, "SLOWO", 3, True) for _ in range(repeat)])
+
+    game.start_progress(2, "SLOWO", "Kategoria0", "classic", "ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+    seq = iter(range(1, 1000000))
+    results["save_guess_flush"] = measure(game.progress_writer.flush, FLUSH_REPEAT,
+                                          setup=lambda: [game.save_guess(2, next(seq), "A", 1) for _ in range(repeat)])
+    results["get_progress"] = measure(lambda: game.get_progress(2), repeat)
+
+    add_history(1, size, rng)
+    results["get_user_stats"] = measure(lambda: game.get_user_stats(1), repeat)
+    results["history_first_page"] = measure(lambda: game.get_game_history(1, None, 100), repeat)
+    middle_id = game.get_game_history(1, None, 1)[0][0] - size // 2
+    results["history_middle_page"] = measure(lambda: game.get_game_history(1, middle_id, 100), repeat)
+
+    players = add_players(size // 10, rng)
+    results["leaderboard_top"] = measure(lambda: game.get_leaderboard("Kategoria0", 20), repeat)
+    results["leaderboard_rank"] = measure(lambda: game.get_rank(players[len(players) // 2]), repeat)
+    return results
+
+def bench_gui(repeat):
+    """
+    Benchmarki ekranu gry i statystyk w ukrytym oknie Tk (na bieżącej bazie).
+    :return: dict {nazwa przypadku: wynik} albo pusty dict, jeśli Tk nie działa (brak ekranu)
+    """
+    try:
+        import tkinter as tk
+        from gui import HangmanApp
+        root = tk.Tk()
+    except Exception as error:
+        print(f"Pomijam benchmarki GUI: {error}", file=sys.stderr)
+        return {}
+
+    root.withdraw()
+    app = HangmanApp(root)
+    app.user_id = 1
+    results = {}
+    try:
+        def round_setup():
+            app.plansza("Kategoria0", game.get_random_word("Kategoria0"))
+            root.update_idletasks()
+
+        results["gui_round_setup"] = measure(round_setup, repeat)
+
+        def mistake_animation():
+            app.wisielec()
+            app.strzala()
+            app.animacje.finish()
+            root.update_idletasks()
+
+        app.game.mistakes = 3
+        results["gui_mistake_animation"] = measure(mistake_animation, repeat)
+
+        def stats_screen():
+            app.statystyki()
+            while app.history_loading or app.summary_label.cget("text") == "Ładowanie...":
+                root.update()
+
+        results["gui_statystyki"] = measure(stats_screen, max(1, repeat // 5))
+    finally:
+        app.executor.shutdown()
+        root.destroy()
+    return results
+
+def compare(results, baseline, threshold, min_ms=MIN_MS):
+    """
+    Porównuje mediany opóźnień z wzorcem. Regresją jest mediana powyżej
+    'threshold' razy mediana wzorca i zarazem powyżej 'min_ms'.
+    :return: lista opisów regresji (pusta, jeśli ich nie ma)
+    """
+    regressions = []
+    for key, result in results.items():
+        reference = baseline.get(key)
+        if reference is None:
+            continue
+        limit = max(reference["p50_ms"] * threshold, min_ms)
+        if result["p50_ms"] > limit:
+            regressions.append(f"{key}: p50 {result['p50_ms']:.3f} ms > {limit:.3f} ms "
+                               f"(wzorzec {reference['p50_ms']:.3f} ms)")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarki gry w wisielca")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="rozmiary słownika i historii gier")
+    parser.add_argument("--repeat", type=int, default=REPEAT, help="liczba powtórzeń szybkich przypadków")
+    parser.add_argument("--no-gui", action="store_true", help="pomiń benchmarki Tk")
+    parser.add_argument("--seed", type=int, default=0, help="ziarno danych syntetycznych")
+    parser.add_argument("--output", help="plik JSON z wynikami")
+    parser.add_argument("--baseline", help="plik JSON z wynikami wzorcowymi")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                        help="dopuszczalny iloraz p50 względem wzorca")
+    parser.add_argument("--min-ms", type=float, default=MIN_MS,
+                        help="pomiń przypadki z medianą poniżej tylu ms (szum pomiaru)")
+    parser.add_argument("--save-baseline", help="zapisz wyniki jako nowy wzorzec")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="hangman-bench-") as workdir:
+        for size in args.sizes:
+            print(f"Rozmiar {size}...", file=sys.stderr)
+            for name, result in bench_data(size, workdir, rng, args.repeat).items():
+                results[f"{name}@{size}"] = result
+            if not args.no_gui:
+                for name, result in bench_gui(GUI_REPEAT).items():
+                    results[f"{name}@{size}"] = result
+        game.close_writers()
+        database.pool.dispose()
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "sizes": args.sizes,
+        "results": results,
+    }
+    for key, result in results.items():
+        print(f"{key:32} p50 {result['p50_ms']:9.3f} ms  p99 {result['p99_ms']:9.3f} ms  "
+              f"{result['ops_per_second']:12.1f} op/s  {result['peak_memory_kb']:10.1f} KiB")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            recorded = json.load(f)
+        if (recorded.get("python"), recorded.get("platform")) != (report["python"], report["platform"]):
+            print(f"Uwaga: wzorzec nagrano na innej platformie ({recorded.get('platform')}, Python "
+                  f"{recorded.get('python')}); nagraj go tutaj przez --save-baseline", file=sys.stderr)
+        regressions = compare(results, recorded["results"], args.threshold, args.min_ms)
+        for regression in regressions:
+            print(f"REGRESJA {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
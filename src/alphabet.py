@@ -0,0 +1,120 @@
+import unicodedata
+
+BASE_LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+# Litery z ogonkami, które mają na klawiaturze własny klawisz (nie są sprowadzane do liter podstawowych).
+OWN_KEYS = "ĄĆĘŁŃÓŚŹŻ"
+# Litery, których rozkład Unicode (NFD) nie daje litery podstawowej, a które sortujemy obok niej.
+SORT_BASE = {"Ł": "L", "Ø": "O", "Đ": "D"}
+
+def normalize(word):
+    """
+    Sprowadza słowo do postaci NFC (litery z ogonkami jako pojedyncze znaki).
+    :param word: słowo
+    :return: słowo w postaci NFC
+    """
+    return unicodedata.normalize("NFC", word)
+
+def base_letter(letter):
+    """
+    Zwraca literę bez znaków diakrytycznych (np. É -> E), jeśli taka istnieje w BASE_LETTERS.
+    :param letter: wielka litera
+    :return: litera podstawowa albo ta sama litera
+    """
+    base = unicodedata.normalize("NFD", letter)[0]
+    return base if base in BASE_LETTERS else letter
+
+def _sort_key(letter):
+    """
+    Kolejność liter na klawiaturze: litera podstawowa, a za nią jej odmiany (A, Ą, B, C, Ć, ...).
+    """
+    base = SORT_BASE.get(letter) or base_letter(letter)
+    return base, letter != base, letter
+
+class Alphabet:
+    """
+    Alfabet kategorii: litery klawiatury i mapa sprowadzania pozostałych liter.
+
+    Litery klawiatury to litery podstawowe (A-Z) oraz litery ze słów kategorii, które
+    mają własny klawisz (polskie litery, litery spoza alfabetu łacińskiego). Jeśli słowa
+    zawierają którąkolwiek polską literę, na klawiaturze są wszystkie (żeby klawiatura
+    nie zdradzała, które z nich występują w słowach). Pozostałe litery ze znakami
+    diakrytycznymi (np. É, Ü) są sprowadzane do liter podstawowych, więc zgadywane są
+    klawiszem litery podstawowej. Tablica translacji jest budowana raz, a postać słowa
+    do porównań liczona jednym str.translate. Kolejność liter klawiatury wyznacza też
+    bity maski użytych liter (patrz mask).
+    """
+    __slots__ = ("letters", "folding", "bits", "_table")
+
+    def __init__(self, letters=BASE_LETTERS, folding=""):
+        """
+        Args:
+            letters: Litery klawiatury w kolejności wyświetlania.
+            folding: Pary znaków "litera, klawisz" zapisane jednym napisem (np. "ÉEÜU").
+        """
+        self.letters = letters
+        self.folding = folding
+        self.bits = {letter: 1 << i for i, letter in enumerate(letters)}
+        self._table = str.maketrans(folding[0::2], folding[1::2])
+
+    @classmethod
+    def derive(cls, letters):
+        """
+        Wyznacza alfabet z liter użytych w słowach kategorii.
+        :param letters: zbiór wielkich liter ze słów (w postaci NFC)
+        :return: Alphabet
+        """
+        keys = set(BASE_LETTERS)
+        folding = {}
+        for letter in letters:
+            if not letter.isalpha():
+                continue
+            base = base_letter(letter)
+            if letter in OWN_KEYS:
+                keys.update(OWN_KEYS)
+            elif base == letter:
+                keys.add(letter)
+            else:
+                folding[letter] = base
+        return cls("".join(sorted(keys, key=_sort_key)),
+                   "".join(letter + key for letter, key in sorted(folding.items())))
+
+    def used_letters(self):
+        """
+        Zwraca litery, z których alfabet został wyznaczony (do łączenia przy kolejnym imporcie).
+        """
+        return set(self.letters) | set(self.folding[0::2])
+
+    def mask(self, letters):
+        """
+        Koduje zbiór liter klawiatury jako liczbę (bit i - i-ta litera w self.letters).
+        :param letters: litery klawiatury
+        :return: maska bitowa
+        """
+        mask = 0
+        for letter in letters:
+            mask |= self.bits[letter]
+        return mask
+
+    def unmask(self, mask):
+        """
+        Odtwarza litery klawiatury zapisane w masce (w kolejności klawiatury).
+        :param mask: maska bitowa (patrz mask)
+        :return: napis z literami
+        """
+        return "".join(letter for i, letter in enumerate(self.letters) if mask >> i & 1)
+
+    def key(self, letter):
+        """
+        Zwraca klawisz, którym zgaduje się daną literę.
+        :param letter: wielka litera
+        """
+        return letter.translate(self._table)
+
+    def fold(self, word):
+        """
+        Zwraca postać słowa do porównań: każda litera zastąpiona swoim klawiszem.
+        :param word: słowo wielkimi literami
+        """
+        return word.translate(self._table)
+
+DEFAULT_ALPHABET = Alphabet()
@@ -0,0 +1,128 @@
+import time
+
+import metrics
+from defaults import FPS
+
+DURATION = 0.3      # domyślny czas trwania animacji (s)
+
+def ease_out(progress):
+    """
+    Krzywa zwalniająca pod koniec ruchu (kwadratowa).
+    :param progress: postęp animacji od 0 do 1
+    :return: przesunięcie od 0 do 1
+    """
+    return 1 - (1 - progress) ** 2
+
+class FrameScheduler:
+    """
+    Harmonogram klatek animacji w oknie Tk.
+
+    Klatki są wywoływane przez widget.after z docelową liczbą klatek na sekundę,
+    tylko wtedy, gdy jakaś animacja trwa. Animacja to funkcja step(progress)
+    wywoływana w każdej klatce z postępem liczonym z upływu czasu (0-1), więc
+    opóźniona klatka nie spowalnia ruchu, a ostatnia klatka zawsze ma postęp 1.
+    Czas pracy każdej klatki i odstęp między klatkami trafiają do pomiarów
+    (metrics: 'animacja.klatka' i 'animacja.odstep'), a liczniki klatek
+    i klatek spóźnionych o więcej niż jeden okres - do self.frames i self.late.
+    """
+    def __init__(self, widget, fps=FPS):
+        """
+        Args:
+            widget: Widżet Tk, którego metoda after planuje klatki.
+            fps: Docelowa liczba klatek na sekundę (większa od zera).
+        """
+        if fps <= 0:
+            raise ValueError(f"Nieprawidłowa liczba klatek na sekundę: {fps}")
+        self.widget = widget
+        self.period = 1.0 / fps
+        self._animations = {}
+        self._job = None
+        self._due = 0.0
+        self._last = None
+        self.frames = 0
+        self.late = 0
+        self.worst = 0.0
+
+    def animate(self, key, step, duration=DURATION):
+        """
+        Uruchamia animację. Trwająca animacja o tym samym kluczu jest najpierw
+        kończona (jej ostatnia klatka jest rysowana od razu).
+
+        Args:
+            key: Klucz animacji (np. element rysunku, który porusza).
+            step: Funkcja step(progress) ustawiająca elementy płótna dla postępu 0-1.
+            duration: Czas trwania w sekundach; 0 - od razu stan końcowy.
+        """
+        self.finish(key)
+        if duration <= 0:
+            step(1.0)
+            return
+        now = time.perf_counter()
+        self._animations[key] = (now, duration, step)
+        step(0.0)
+        if self._job is None:
+            self._due = now + self.period
+            self._last = now
+            self._job = self.widget.after(int(self.period * 1000), self._frame)
+
+    def finish(self, key=None):
+        """
+        Kończy animację (albo wszystkie, jeśli key to None), ustawiając jej stan końcowy.
+        """
+        keys = list(self._animations) if key is None else [key] if key in self._animations else []
+        for name in keys:
+            _, _, step = self._animations.pop(name)
+            step(1.0)
+        self._stop_if_idle()
+
+    def cancel(self):
+        """
+        Przerywa wszystkie animacje bez rysowania ich stanu końcowego.
+        """
+        self._animations.clear()
+        self._stop_if_idle()
+
+    @property
+    def running(self):
+        """
+        Czy trwa jakaś animacja.
+        """
+        return bool(self._animations)
+
+    def _stop_if_idle(self):
+        """
+        Odwołuje zaplanowaną klatkę, jeśli nie ma już animacji.
+        """
+        if not self._animations and self._job is not None:
+            self.widget.after_cancel(self._job)
+            self._job = None
+
+    def _frame(self):
+        """
+        Rysuje jedną klatkę wszystkich trwających animacji i planuje następną.
+        """
+        self._job = None
+        start = time.perf_counter()
+        for key, (began, duration, step) in list(self._animations.items()):
+            progress = min((start - began) / duration, 1.0)
+            step(progress)
+            if progress >= 1.0:
+                del self._animations[key]
+        end = time.perf_counter()
+
+        work = end - start
+        self.frames += 1
+        self.worst = max(self.worst, work)
+        if metrics.ENABLED:
+            metrics.record("animacja.klatka", work)
+            metrics.record("animacja.odstep", start - self._last)
+        self._last = start
+
+        if not self._animations:
+            return
+        self._due += self.period
+        if self._due < end:
+            # Klatka spóźniona o ponad okres - nie nadrabiamy, tylko liczymy od teraz.
+            self.late += 1
+            self._due = end + self.period
+        self._job = self.widget.after(max(int((self._due - end) * 1000), 1), self._frame)
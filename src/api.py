@@ -0,0 +1,125 @@
+import auth
+import game
+from repository import Repository
+
+class LocalApi(Repository):
+    """
+    Dostęp interfejsu gry (Tk lub terminal) do lokalnej bazy danych.
+
+    Udostępnia te same metody co client.GameClient, więc interfejs działa tak samo
+    z lokalną bazą i z serwerem gry. To domyślny magazyn danych 'sqlite'; pozostałe
+    implementacje interfejsu repository.Repository są w module storage.
+    """
+    def login(self, username, password):
+        """
+        Patrz auth.login.
+        """
+        return auth.login(username, password)
+
+    def register(self, username, password):
+        """
+        Patrz auth.register.
+        """
+        return auth.register(username, password)
+
+    def get_random_word(self, category=None, difficulty=None):
+        """
+        Patrz game.get_random_word.
+        """
+        return game.get_random_word(category, difficulty)
+
+    def get_words(self, category):
+        """
+        Patrz game.get_words.
+        """
+        return game.get_words(category)
+
+    def get_categories(self):
+        """
+        Patrz game.get_categories.
+        """
+        return game.get_categories()
+
+    def cached_categories(self):
+        """
+        Patrz game.cached_categories.
+        """
+        return game.cached_categories()
+
+    def get_alphabet(self, category):
+        """
+        Patrz game.get_alphabet.
+        """
+        return game.get_alphabet(category)
+
+    def save_game(self, user_id, word, mistakes, won, category=None):
+        """
+        Patrz game.save_game.
+        """
+        game.save_game(user_id, word, mistakes, won, category)
+
+    def start_progress(self, user_id, word, category, mode, letters):
+        """
+        Patrz game.start_progress.
+        """
+        game.start_progress(user_id, word, category, mode, letters)
+
+    def save_guess(self, user_id, seq, letter, mask):
+        """
+        Patrz game.save_guess.
+        """
+        game.save_guess(user_id, seq, letter, mask)
+
+    def finish_game(self, user_id, word, mistakes, won, category=None):
+        """
+        Patrz game.finish_game.
+        """
+        game.finish_game(user_id, word, mistakes, won, category)
+
+    def get_progress(self, user_id):
+        """
+        Patrz game.get_progress.
+        """
+        return game.get_progress(user_id)
+
+    def get_user_stats(self, user_id):
+        """
+        Patrz game.get_user_stats.
+        """
+        return game.get_user_stats(user_id)
+
+    def get_game_history(self, user_id, before_id=None, limit=100):
+        """
+        Patrz game.get_game_history.
+        """
+        return game.get_game_history(user_id, before_id, limit)
+
+    def get_leaderboard(self, category=None, limit=10):
+        """
+        Patrz game.get_leaderboard.
+        """
+        return game.get_leaderboard(category, limit)
+
+    def get_rank(self, user_id, category=None):
+        """
+        Patrz game.get_rank.
+        """
+        return game.get_rank(user_id, category)
+
+    def start_session(self, user_id, category, mode):
+        """
+        Patrz game.start_session.
+        """
+        return game.start_session(user_id, category, mode)
+
+    def update_session(self, user_id, session_id, rounds, wins, mistakes, best_streak):
+        """
+        Patrz game.update_session.
+        """
+        game.update_session(user_id, session_id, rounds, wins, mistakes, best_streak)
+
+    def flush(self):
+        """
+        Patrz game.flush_writes.
+        """
+        game.flush_writes()
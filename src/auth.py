@@ -0,0 +1,175 @@
+import base64
+import hashlib
+import hmac
+import os
+import sqlite3
+import threading
+import time
+
+from database import get_connection
+from metrics import timed
+
+SCHEME = "scrypt"
+SCRYPT_N = 2 ** 14
+SCRYPT_R = 8
+SCRYPT_P = 1
+KEY_LENGTH = 32
+SALT_SIZE = 16
+
+HASH_WORKERS = 2
+USE_PROCESSES = True
+
+FIND_USER_SQL = "SELECT id, password FROM users WHERE username=?"
+ADD_USER_SQL = "INSERT INTO users (username, password) VALUES (?, ?)"
+UPDATE_PASSWORD_SQL = "UPDATE users SET password=? WHERE id=?"
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def _scrypt(password, salt, n, r, p):
+    """
+    Liczy skrót scrypt hasła. Funkcja na poziomie modułu, żeby dało się ją
+    wykonać w osobnym procesie.
+    """
+    return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p,
+                          maxmem=256 * n * r + 2 ** 20, dklen=KEY_LENGTH)
+
+def _executor():
+    """
+    Zwraca (tworząc przy pierwszym użyciu) pulę procesów liczących skróty haseł.
+    multiprocessing jest importowany dopiero tutaj, żeby nie wydłużać startu gry.
+    """
+    global _pool
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=HASH_WORKERS,
+                                        mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+def _compute(password, salt, n, r, p):
+    """
+    Liczy skrót scrypt w puli procesów (albo w bieżącym wątku, jeśli USE_PROCESSES=False).
+    Wątek wywołujący czeka na wynik, ale nie zajmuje GIL-a.
+    """
+    if USE_PROCESSES:
+        return _executor().submit(_scrypt, password, salt, n, r, p).result()
+    return _scrypt(password, salt, n, r, p)
+
+def _b64(data):
+    """
+    Koduje bajty w base64 do zapisu w bazie.
+    """
+    return base64.b64encode(data).decode("ascii")
+
+def hash_password(password, n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P):
+    """
+    Tworzy solony skrót hasła w formacie 'scrypt$n$r$p$sól$skrót' (sól i skrót w base64).
+    :param password: hasło w formie tekstowej
+    :param n: parametr kosztu scrypt (potęga dwójki)
+    :param r: rozmiar bloku scrypt
+    :param p: współczynnik równoległości scrypt
+    :return: zapisywalny w bazie napis ze skrótem i parametrami
+    """
+    salt = os.urandom(SALT_SIZE)
+    digest = _compute(password, salt, n, r, p)
+    return f"{SCHEME}${n}${r}${p}${_b64(salt)}${_b64(digest)}"
+
+def legacy_hash(password):
+    """
+    Stary, niesolony skrót SHA-256 (tylko do weryfikacji kont założonych wcześniej).
+    :param password: hasło w formie tekstowej
+    :return: skrót w postaci heksadecymalnej
+    """
+    return hashlib.sha256(password.encode()).hexdigest()
+
+def verify_password(password, stored):
+    """
+    Sprawdza hasło z zapisanym skrótem.
+    :param password: hasło w formie tekstowej
+    :param stored: skrót zapisany w bazie (nowy format albo stary SHA-256)
+    :return: krotka (czy hasło pasuje, czy skrót trzeba przeliczyć z aktualnymi parametrami)
+    """
+    if "$" not in stored:
+        ok = hmac.compare_digest(legacy_hash(password), stored)
+        return ok, ok
+
+    scheme, n, r, p, salt, digest = stored.split("$")
+    if scheme != SCHEME:
+        raise ValueError(f"Nieznany format skrótu hasła: {scheme}")
+    n, r, p = int(n), int(r), int(p)
+    computed = _compute(password, base64.b64decode(salt), n, r, p)
+    ok = hmac.compare_digest(computed, base64.b64decode(digest))
+    return ok, ok and (n, r, p) != (SCRYPT_N, SCRYPT_R, SCRYPT_P)
+
+@timed("auth.login")
+def login(username, password):
+    """
+    Loguje użytkownika. Użytkownik jest wyszukiwany tylko po nazwie (indeks unikalny),
+    a hasło sprawdzane poza bazą. Skróty w starym formacie lub ze starymi parametrami
+    są po udanym logowaniu przeliczane i nadpisywane.
+    :param username: nazwa użytkownika
+    :param password: hasło w formie tekstowej
+    :return: id użytkownika albo None, jeśli dane są nieprawidłowe
+    """
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(FIND_USER_SQL, (username,))
+        row = cursor.fetchone()
+    if row is None:
+        return None
+
+    user_id, stored = row
+    ok, needs_rehash = verify_password(password, stored)
+    if not ok:
+        return None
+    if needs_rehash:
+        new_hash = hash_password(password)
+        with get_connection() as conn:
+            conn.cursor().execute(UPDATE_PASSWORD_SQL, (new_hash, user_id))
+    return user_id
+
+@timed("auth.register")
+def register(username, password):
+    """
+    Dodaje nowego użytkownika z solonym skrótem hasła.
+    :param username: nazwa użytkownika
+    :param password: hasło w formie tekstowej
+    :return: False, jeśli nazwa użytkownika jest już zajęta
+    """
+    password_hash = hash_password(password)
+    try:
+        with get_connection() as conn:
+            conn.cursor().execute(ADD_USER_SQL, (username, password_hash))
+    except sqlite3.IntegrityError:
+        return False
+    return True
+
+def benchmark(costs=(2 ** 12, 2 ** 14, 2 ** 15), logins=32, r=SCRYPT_R, p=SCRYPT_P):
+    """
+    Mierzy, ile weryfikacji haseł na sekundę daje pula przy różnych kosztach scrypt.
+    Wszystkie logowania są zlecane naraz, jak przy wielu jednoczesnych użytkownikach.
+    :param costs: sprawdzane wartości parametru n
+    :param logins: liczba logowań na każdy koszt
+    :return: lista dict z kluczami n, logins, seconds, logins_per_second
+    """
+    salt = os.urandom(SALT_SIZE)
+    executor = _executor()
+    executor.submit(_scrypt, "rozgrzewka", salt, 2, 1, 1).result()
+
+    results = []
+    for n in costs:
+        start = time.perf_counter()
+        futures = [executor.submit(_scrypt, "haslo", salt, n, r, p) for _ in range(logins)]
+        for future in futures:
+            future.result()
+        seconds = time.perf_counter() - start
+        results.append({
+            "n": n,
+            "logins": logins,
+            "seconds": seconds,
+            "logins_per_second": logins / seconds,
+        })
+    return results
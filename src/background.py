@@ -0,0 +1,74 @@
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+MAX_WORKERS = 4
+POLL_INTERVAL = 15
+
+class TkExecutor:
+    """
+    Wykonuje funkcje (np. zapytania do bazy) w puli wątków w tle.
+
+    Wyniki są zbierane w kolejce i przekazywane do funkcji zwrotnych w wątku Tk
+    przez root.after, ponieważ widżetów Tk nie wolno dotykać z innych wątków.
+    """
+    def __init__(self, root, max_workers=MAX_WORKERS, poll_interval=POLL_INTERVAL):
+        """
+        Args:
+            root: Główne okno aplikacji Tkinter.
+            max_workers: Liczba wątków w puli.
+            poll_interval: Co ile milisekund sprawdzać gotowe wyniki.
+        """
+        self.root = root
+        self.poll_interval = poll_interval
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hangman-db")
+        self._results = queue.Queue()
+        self._pending = 0
+        self._poll_id = None
+
+    def submit(self, fn, *args, on_done=None, on_error=None):
+        """
+        Zleca wykonanie funkcji w tle.
+
+        Args:
+            fn: Funkcja do wykonania w wątku z puli.
+            *args: Argumenty funkcji.
+            on_done: Wywoływana w wątku Tk z wynikiem funkcji.
+            on_error: Wywoływana w wątku Tk z wyjątkiem; domyślnie błąd zgłasza Tk.
+        """
+        future = self._pool.submit(fn, *args)
+        future.add_done_callback(lambda f: self._results.put((f, on_done, on_error)))
+        self._pending += 1
+        if self._poll_id is None:
+            self._poll_id = self.root.after(self.poll_interval, self._poll)
+
+    def _poll(self):
+        """
+        Przekazuje gotowe wyniki do funkcji zwrotnych (w wątku Tk).
+        """
+        self._poll_id = None
+        while True:
+            try:
+                future, on_done, on_error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._pending -= 1
+            try:
+                error = future.exception()
+                if error is None:
+                    if on_done is not None:
+                        on_done(future.result())
+                elif on_error is not None:
+                    on_error(error)
+                else:
+                    raise error
+            except Exception as e:
+                self.root.report_callback_exception(type(e), e, e.__traceback__)
+
+        if self._pending > 0:
+            self._poll_id = self.root.after(self.poll_interval, self._poll)
+
+    def shutdown(self):
+        """
+        Czeka na zakończenie zleconych zadań i zamyka pulę wątków.
+        """
+        self._pool.shutdown(wait=True)
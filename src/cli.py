@@ -0,0 +1,266 @@
+import getpass
+
+from alphabet import normalize
+from engine import HangmanGame, MAX_MISTAKES
+from session import Marathon, restore_game
+
+SZUBIENICA = (
+    "  +---+\n  |   |\n      |\n      |\n      |\n      |\n=======",
+    "  +---+\n  |   |\n  O   |\n      |\n      |\n      |\n=======",
+    "  +---+\n  |   |\n  O   |\n  |   |\n  |   |\n      |\n=======",
+    "  +---+\n  |   |\n  O   |\n /|   |\n  |   |\n      |\n=======",
+    "  +---+\n  |   |\n  O   |\n /|\\  |\n  |   |\n      |\n=======",
+    "  +---+\n  |   |\n  O   |\n /|\\  |\n  |   |\n /    |\n=======",
+    "  +---+\n  |   |\n  O   |\n /|\\  |\n  |   |\n / \\  |\n=======",
+)
+DROGA_STRZALY = 24
+
+class TerminalApp:
+    """
+    Tekstowa wersja gry w wisielca dla terminali bez środowiska graficznego.
+
+    Korzysta z tych samych funkcji co wersja Tk (losowanie słów, zapis gier, logowanie)
+    i obsługuje oba tryby gry: klasyczny i "Uratuj wisielca".
+    """
+    def __init__(self, api=None, input_fn=input, output=print, password_fn=getpass.getpass):
+        """
+        Args:
+            api: Dostęp do danych gry: api.LocalApi (domyślnie) albo client.GameClient.
+            input_fn: Funkcja wczytująca linię od użytkownika.
+            output: Funkcja wypisująca tekst.
+            password_fn: Funkcja wczytująca hasło bez wyświetlania.
+        """
+        if api is None:
+            from api import LocalApi
+            api = LocalApi()
+        self.api = api
+        self.input = input_fn
+        self.output = output
+        self.password = password_fn
+        self.user_id = None
+        self.game_mode = "classic"
+        self.max_mistakes = MAX_MISTAKES
+        self.game = None
+
+    def run(self):
+        """
+        Główna pętla programu: logowanie, wybór trybu, a potem kolejne gry.
+        Kończy się po wybraniu wyjścia albo końcu wejścia (Ctrl+D).
+        """
+        try:
+            if self.ekran_logowania():
+                if not self.wznow_gre():
+                    self.wybierz_tryb()
+                self.wybierz_kategorie()
+        except (EOFError, KeyboardInterrupt):
+            self.output("")
+
+    def wybor(self, prompt, options):
+        """
+        Wyświetla ponumerowaną listę i wczytuje wybór użytkownika.
+
+        Args:
+            prompt: Tekst pytania.
+            options: Lista opisów opcji.
+
+        Returns:
+            int: Indeks wybranej opcji.
+        """
+        for i, option in enumerate(options, 1):
+            self.output(f"  {i}. {option}")
+        while True:
+            answer = self.input(f"{prompt} ").strip()
+            if answer.isdigit() and 1 <= int(answer) <= len(options):
+                return int(answer) - 1
+            self.output("Nieprawidłowy wybór.")
+
+    def ekran_logowania(self):
+        """
+        Logowanie lub rejestracja użytkownika.
+
+        Returns:
+            bool: True po udanym logowaniu, False po wybraniu wyjścia.
+        """
+        while True:
+            choice = self.wybor("Wybierz:", ["Zaloguj", "Zarejestruj", "Wyjście"])
+            if choice == 2:
+                return False
+            username = self.input("Nazwa użytkownika: ").strip()
+            password = self.password("Hasło: ")
+            if choice == 0:
+                self.user_id = self.api.login(username, password)
+                if self.user_id is not None:
+                    return True
+                self.output("Nieprawidłowe dane logowania")
+            elif self.api.register(username, password):
+                self.output("Rejestracja zakończona pomyślnie")
+            else:
+                self.output("Nazwa użytkownika już istnieje")
+
+    def wybierz_tryb(self):
+        """
+        Wybór trybu gry: klasyczny albo "Uratuj wisielca".
+        """
+        self.output("\nWybierz tryb gry")
+        choice = self.wybor("Tryb:", ["Klasyczny Wisielec - tradycyjny rysunek z 6 dozwolonymi błędami",
+                                      "Uratuj wisielca - strzała zbliża się z każdym błędem"])
+        self.game_mode = "classic" if choice == 0 else "arrow"
+
+    def wybierz_kategorie(self):
+        """
+        Menu wyboru kategorii; z niego rozpoczyna się gry i ogląda statystyki oraz ranking.
+        """
+        while True:
+            categories = self.api.get_categories()
+            mode_text = "Klasyczny Wisielec" if self.game_mode == "classic" else "Uratuj wisielca"
+            self.output(f"\nTryb gry: {mode_text}")
+            options = categories + ["Pokaż statystyki", "Ranking graczy", "Maraton (gra ciągła)",
+                                    "Zmień tryb gry", "Wyjście"]
+            choice = self.wybor("Wybierz kategorię:", options)
+            if choice < len(categories):
+                self.graj(categories[choice])
+            elif choice == len(categories):
+                self.statystyki()
+            elif choice == len(categories) + 1:
+                self.ranking(categories)
+            elif choice == len(categories) + 2:
+                self.maraton(categories)
+            elif choice == len(categories) + 3:
+                self.wybierz_tryb()
+            else:
+                return
+
+    def rysunek(self):
+        """
+        Zwraca rysunek ASCII dla bieżącej liczby błędów i trybu gry.
+
+        Returns:
+            str: Rysunek.
+        """
+        if self.game_mode == "classic":
+            return SZUBIENICA[min(self.game.mistakes, len(SZUBIENICA) - 1)]
+        distance = DROGA_STRZALY * self.game.mistakes // self.max_mistakes
+        if self.game.mistakes >= self.max_mistakes:
+            return " " * (DROGA_STRZALY - 3) + "--->X\n" + " " * DROGA_STRZALY + "KONIEC GRY!"
+        return " " * distance + "--->" + " " * (DROGA_STRZALY - distance - 3) + "O\n" + \
+            " " * DROGA_STRZALY + "/|\\\n" + " " * DROGA_STRZALY + "/ \\"
+
+    def wznow_gre(self):
+        """
+        Proponuje wznowienie niedokończonej gry użytkownika (np. po awarii).
+
+        Returns:
+            bool: True, jeśli gra została wznowiona i rozegrana.
+        """
+        progress = self.api.get_progress(self.user_id)
+        if progress is None:
+            return False
+        game, alphabet = restore_game(progress, self.api.get_alphabet(progress["category"]), self.max_mistakes)
+        if not game.finished:
+            answer = self.input("Masz niedokończoną grę. Kontynuować? [T/n] ").strip().lower()
+            if answer not in ("", "t", "tak"):
+                return False
+        self.game_mode = progress["mode"]
+        self.graj(progress["category"], alphabet=alphabet, game=game)
+        return True
+
+    def graj(self, category, word=None, alphabet=None, game=None):
+        """
+        Rozgrywa jedną grę w wybranej kategorii. Stan gry jest zapisywany po każdym
+        ruchu (game.save_guess), więc po awarii można ją wznowić.
+
+        Args:
+            category: Nazwa kategorii.
+            word: Słowo do odgadnięcia; domyślnie losowane z kategorii.
+            alphabet: Alfabet kategorii; domyślnie pobierany.
+            game: Wznawiana gra (HangmanGame); domyślnie nowa.
+        """
+        if alphabet is None:
+            alphabet = self.api.get_alphabet(category)
+        if game is None:
+            if word is None:
+                word = self.api.get_random_word(category)
+            game = HangmanGame(word, self.max_mistakes, alphabet)
+            self.api.start_progress(self.user_id, word, category, self.game_mode, alphabet.letters)
+        self.game = game
+        mask = alphabet.mask(game.used_letters)
+        self.output(f"\nKategoria: {category}")
+        self.output(f"Litery: {' '.join(alphabet.letters)}")
+        while not self.game.finished:
+            self.output(self.rysunek())
+            self.output(" ".join(self.game.guessed))
+            used = " ".join(letter for letter in alphabet.letters if letter in self.game.used_letters)
+            self.output(f"Błędy: {self.game.mistakes}/{self.max_mistakes}   Użyte litery: {used}")
+            letter = alphabet.key(normalize(self.input("Litera: ").strip().upper()))
+            if len(letter) != 1 or letter not in alphabet.letters:
+                self.output("Podaj jedną literę.")
+            elif self.game.guess(letter) is None:
+                self.output("Ta litera była już użyta.")
+            else:
+                mask |= alphabet.bits[letter]
+                self.api.save_guess(self.user_id, len(self.game.used_letters), letter, mask)
+
+        self.output(self.rysunek())
+        self.api.finish_game(self.user_id, self.game.word, self.game.mistakes, self.game.won, category)
+        if self.game.won:
+            self.output(f"Wygrana! Odgadłeś słowo: {self.game.word}")
+        else:
+            self.output(f"Przegrałeś! Słowo to: {self.game.word}")
+
+    def statystyki(self):
+        """
+        Wyświetla podsumowanie statystyk użytkownika.
+        """
+        stats = self.api.get_user_stats(self.user_id)
+        self.output("\nTwoje statystyki gry")
+        self.output(f"Łącznie gier: {stats['games']}")
+        self.output(f"Wygranych: {stats['wins']}")
+        self.output(f"Procent wygranych: {stats['win_percentage']:.1f}%")
+        self.output(f"Średnia błędów: {stats['avg_mistakes']:.1f}")
+
+    def ranking(self, categories):
+        """
+        Wyświetla czołówkę rankingu graczy (łącznego albo wybranej kategorii)
+        i miejsce użytkownika.
+
+        Args:
+            categories: Nazwy kategorii do wyboru.
+        """
+        choice = self.wybor("Ranking:", ["Wszystkie kategorie"] + categories)
+        category = categories[choice - 1] if choice else None
+        self.output(f"\nRanking graczy - {category or 'wszystkie kategorie'}")
+        for place, username, games, wins, win_percentage, avg_mistakes in self.api.get_leaderboard(category):
+            self.output(f"{place:3}. {username:20} wygranych: {wins:5}  gier: {games:5}  "
+                        f"{win_percentage:5.1f}%  śr. błędów: {avg_mistakes:.1f}")
+        rank = self.api.get_rank(self.user_id, category)
+        if rank is None:
+            self.output("Nie masz jeszcze gier w tym rankingu.")
+        else:
+            self.output(f"Twoje miejsce: {rank['rank']} (wygranych: {rank['wins']}, "
+                        f"{rank['win_percentage']:.1f}%)")
+
+    def maraton(self, categories):
+        """
+        Seria rund w jednej kategorii; słowa są brane z kolejki bez powtórzeń,
+        a podsumowanie sesji jest zapisywane po każdej rundzie.
+
+        Args:
+            categories: Nazwy kategorii do wyboru.
+        """
+        category = categories[self.wybor("Kategoria maratonu:", categories)]
+        session_id = self.api.start_session(self.user_id, category, self.game_mode)
+        marathon = Marathon(session_id, category, self.api.get_words(category), self.api.get_alphabet(category))
+        if not marathon.queue.words:
+            self.output("Brak słów w tej kategorii.")
+            return
+        while True:
+            self.output(f"\nMaraton - runda {marathon.rounds + 1}")
+            self.graj(category, marathon.queue.next(), marathon.alphabet)
+            marathon.record(self.game.won, self.game.mistakes)
+            summary = marathon.summary()
+            self.api.update_session(self.user_id, session_id, summary["rounds"], summary["wins"],
+                                    summary["mistakes"], summary["best_streak"])
+            self.output(f"Wygrane: {marathon.wins}/{marathon.rounds}   seria: {marathon.streak}   "
+                        f"najdłuższa seria: {marathon.best_streak}")
+            if self.input("Następna runda? [T/n] ").strip().lower() not in ("", "t", "tak"):
+                return
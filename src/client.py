@@ -0,0 +1,239 @@
+import json
+import socket
+import threading
+
+from alphabet import Alphabet
+from defaults import HOST, PORT
+
+TIMEOUT = 10
+
+class ServerError(Exception):
+    """
+    Błąd zgłoszony przez serwer gry w odpowiedzi na żądanie.
+    """
+
+class GameClient:
+    """
+    Klient serwera gry (server.GameServer).
+
+    Udostępnia te same metody co api.LocalApi, więc interfejs gry może korzystać
+    z serwera zamiast z lokalnej bazy. Jedno połączenie TCP jest współdzielone
+    przez wątki (żądania są wysyłane po kolei). Identyfikator użytkownika
+    w zapisie gry i statystykach wynika z zalogowania na tym połączeniu.
+    """
+    def __init__(self, host=HOST, port=PORT, timeout=TIMEOUT):
+        """
+        Args:
+            host: Adres serwera.
+            port: Port serwera.
+            timeout: Limit czasu oczekiwania na odpowiedź (s).
+        """
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._socket = None
+        self._file = None
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self._categories = None
+        self._alphabets = {}
+
+    def connect(self):
+        """
+        Łączy się z serwerem (jeśli połączenie nie jest jeszcze otwarte).
+        """
+        with self._lock:
+            self._connect()
+
+    def _connect(self):
+        """
+        Otwiera połączenie; wywoływane z założoną blokadą.
+        """
+        if self._file is None:
+            self._socket = socket.create_connection((self.host, self.port), timeout=self.timeout)
+            self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._file = self._socket.makefile("rwb")
+
+    def close(self):
+        """
+        Zamyka połączenie z serwerem.
+        """
+        with self._lock:
+            self._disconnect()
+
+    def _disconnect(self):
+        """
+        Zamyka połączenie (np. po błędzie); kolejne żądanie otworzy nowe.
+        """
+        if self._file is not None:
+            try:
+                self._file.close()
+                self._socket.close()
+            except OSError:
+                pass
+            self._file = self._socket = None
+
+    def _send(self, request):
+        """
+        Wysyła jedną linię żądania; wywoływane z założoną blokadą.
+        """
+        self._connect()
+        try:
+            self._file.write(json.dumps(request, ensure_ascii=False).encode() + b"\n")
+            self._file.flush()
+        except OSError:
+            self._disconnect()
+            raise
+
+    def call(self, op, **args):
+        """
+        Wysyła żądanie i czeka na odpowiedź.
+        :param op: nazwa operacji (patrz server.GameServer.OPS)
+        :return: wynik operacji
+        """
+        with self._lock:
+            self._next_id += 1
+            self._send({"id": self._next_id, "op": op, "args": args})
+            try:
+                line = self._file.readline()
+            except OSError:
+                self._disconnect()
+                raise
+            if not line:
+                self._disconnect()
+                raise ConnectionError("Serwer zamknął połączenie")
+        response = json.loads(line)
+        if not response["ok"]:
+            raise ServerError(response["error"])
+        return response["result"]
+
+    def send(self, op, **args):
+        """
+        Wysyła żądanie bez czekania na odpowiedź (serwer jej nie wysyła).
+        Kolejność żądań na połączeniu jest zachowana.
+        :param op: nazwa operacji
+        """
+        with self._lock:
+            self._send({"op": op, "args": args})
+
+    def login(self, username, password):
+        """
+        Loguje użytkownika na tym połączeniu.
+        :return: id użytkownika albo None
+        """
+        return self.call("login", username=username, password=password)
+
+    def register(self, username, password):
+        """
+        Rejestruje nowego użytkownika.
+        :return: False, jeśli nazwa użytkownika jest już zajęta
+        """
+        return self.call("register", username=username, password=password)
+
+    def get_random_word(self, category=None, difficulty=None):
+        """
+        Losuje słowo z kategorii i przedziału trudności (na serwerze).
+        """
+        return self.call("random_word", category=category, difficulty=difficulty)
+
+    def get_words(self, category):
+        """
+        Pobiera wszystkie słowa kategorii jednym żądaniem.
+        """
+        return self.call("words", category=category)
+
+    def get_categories(self):
+        """
+        Pobiera nazwy kategorii i zapamiętuje je.
+        """
+        self._categories = self.call("categories")
+        return list(self._categories)
+
+    def cached_categories(self):
+        """
+        Zwraca zapamiętane nazwy kategorii albo None (bez żądania).
+        """
+        return list(self._categories) if self._categories is not None else None
+
+    def get_alphabet(self, category):
+        """
+        Pobiera alfabet kategorii (przy pierwszym użyciu) i zapamiętuje go.
+        :return: alphabet.Alphabet
+        """
+        alphabet = self._alphabets.get(category)
+        if alphabet is None:
+            letters, folding = self.call("alphabet", category=category)
+            alphabet = self._alphabets[category] = Alphabet(letters, folding)
+        return alphabet
+
+    def save_game(self, user_id, word, mistakes, won, category=None):
+        """
+        Zleca zapis gry zalogowanego użytkownika (bez czekania na odpowiedź).
+        Argument user_id jest ignorowany - serwer używa użytkownika z logowania.
+        """
+        self.send("save_game", word=word, mistakes=mistakes, won=bool(won), category=category)
+
+    def start_progress(self, user_id, word, category, mode, letters):
+        """
+        Zleca rozpoczęcie zapisu gry w toku (bez czekania na odpowiedź).
+        """
+        self.send("start_progress", word=word, category=category, mode=mode, letters=letters)
+
+    def save_guess(self, user_id, seq, letter, mask):
+        """
+        Zleca dopisanie ruchu do dziennika gry w toku (bez czekania na odpowiedź).
+        """
+        self.send("save_guess", seq=seq, letter=letter, mask=mask)
+
+    def finish_game(self, user_id, word, mistakes, won, category=None):
+        """
+        Zleca zakończenie i zapis gry w toku (bez czekania na odpowiedź).
+        """
+        self.send("finish_game", word=word, mistakes=mistakes, won=bool(won), category=category)
+
+    def get_progress(self, user_id):
+        """
+        Pobiera niedokończoną grę zalogowanego użytkownika.
+        :return: dict (patrz game.get_progress) albo None
+        """
+        return self.call("progress")
+
+    def get_user_stats(self, user_id):
+        """
+        Pobiera statystyki zalogowanego użytkownika.
+        """
+        return self.call("stats")
+
+    def get_game_history(self, user_id, before_id=None, limit=100):
+        """
+        Pobiera stronę historii gier zalogowanego użytkownika.
+        :return: lista krotek (id, word, mistakes, won)
+        """
+        return [tuple(row) for row in self.call("history", before_id=before_id, limit=limit)]
+
+    def get_leaderboard(self, category=None, limit=10):
+        """
+        Pobiera czołówkę rankingu.
+        :return: lista krotek (miejsce, username, games, wins, win_percentage, avg_mistakes)
+        """
+        return [tuple(row) for row in self.call("leaderboard", category=category, limit=limit)]
+
+    def get_rank(self, user_id, category=None):
+        """
+        Pobiera miejsce zalogowanego użytkownika w rankingu.
+        """
+        return self.call("rank", category=category)
+
+    def start_session(self, user_id, category, mode):
+        """
+        Zakłada sesję gry ciągłej zalogowanego użytkownika.
+        :return: id sesji
+        """
+        return self.call("start_session", category=category, mode=mode)
+
+    def update_session(self, user_id, session_id, rounds, wins, mistakes, best_streak):
+        """
+        Zleca zapis podsumowania sesji (bez czekania na odpowiedź).
+        """
+        self.send("update_session", session_id=session_id, rounds=rounds, wins=wins, mistakes=mistakes,
+                  best_streak=best_streak)
@@ -1,62 +1,272 @@
-from sqlalchemy import create_engine, Column, Integer, String, ForeignKey, Boolean
-from sqlalchemy.orm import declarative_base, sessionmaker, relationship
+import sqlite3
+import threading
+from contextlib import contextmanager
 
-Base = declarative_base()
-engine = create_engine("sqlite:///hangman.db")
-Session = sessionmaker(bind=engine)
+DB_NAME = "hangman.db"
+POOL_SIZE = 5
+STATEMENT_CACHE_SIZE = 256
+SYNCHRONOUS = "NORMAL"
 
-class User(Base):
+# Wersja schematu zapisywana w PRAGMA user_version. Baza z aktualną wersją jest
+# gotowa (tabele, indeksy i słownik istnieją), więc start pomija migrację
+# i nie importuje SQLAlchemy. Każda zmiana schematu podnosi tę wartość.
+SCHEMA_VERSION = 9
+
+# Kategoria wierszy rankingu łącznego (wszystkie kategorie) w tabeli 'leaderboard'.
+ALL_CATEGORIES = "*"
+
+# Podnoszą licznik id tabeli 'games' (AUTOINCREMENT) co najmniej do podanego id,
+# żeby nowe gry nie dostały id gier już zarchiwizowanych albo policzonych przez zadania.
+GAMES_SEQUENCE_SQL = (
+    "INSERT INTO sqlite_sequence (name, seq) SELECT 'games', ? "
+    "WHERE NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = 'games')",
+    "UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = 'games'",
+)
+
+PRAGMAS = (
+    ("auto_vacuum", "INCREMENTAL"),   # działa w nowej bazie; istniejącą przestawia dopiero VACUUM
+    ("journal_mode", "WAL"),
+    ("synchronous", SYNCHRONOUS),
+    ("cache_size", -16000),       # wartość ujemna = rozmiar w KiB (~16 MB)
+    ("mmap_size", 268435456),     # 256 MB
+    ("temp_store", "MEMORY"),
+)
+
+def _set_pragmas(dbapi_conn, connection_record=None):
+    """
+    Ustawia parametry SQLite dla każdego nowego połączenia w puli.
+    Przy włączonych pomiarach (metrics) podpina też licznik zapytań.
+    :param dbapi_conn: surowe połączenie sqlite3
+    :param connection_record: rekord puli SQLAlchemy (nieużywany)
+    """
+    cursor = dbapi_conn.cursor()
+    for name, value in PRAGMAS:
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+
+    import metrics
+    if metrics.ENABLED:
+        dbapi_conn.set_trace_callback(metrics.count_query)
+
+class ConnectionPool:
+    """
+    Pula długo żyjących połączeń sqlite3.
+
+    Połączenia mogą być współdzielone między wątkami (jedno połączenie naraz
+    w jednym wątku), a każde z nich ma własną pamięć podręczną przygotowanych
+    zapytań. Pula nie wymaga SQLAlchemy, więc zwykły start gry go nie importuje.
+    """
+    def __init__(self, db_name=DB_NAME, size=POOL_SIZE):
+        """
+        Args:
+            db_name: Ścieżka do pliku bazy danych.
+            size: Liczba bezczynnych połączeń utrzymywanych w puli.
+        """
+        self.db_name = db_name
+        self.size = size
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def open(self):
+        """
+        Otwiera nowe połączenie z ustawionymi parametrami SQLite (poza pulą).
+        """
+        conn = sqlite3.connect(self.db_name, check_same_thread=False,
+                               cached_statements=STATEMENT_CACHE_SIZE)
+        _set_pragmas(conn)
+        return conn
+
+    def acquire(self):
+        """
+        Wypożycza bezczynne połączenie albo otwiera nowe, jeśli pula jest pusta.
+        """
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return self.open()
+
+    def release(self, conn):
+        """
+        Oddaje połączenie do puli; nadmiarowe połączenia są zamykane.
+        """
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def dispose(self):
+        """
+        Zamyka wszystkie bezczynne połączenia.
+        """
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+pool = ConnectionPool()
+
+def configure_db(db_name=DB_NAME, pool_size=POOL_SIZE):
+    """
+    Zamyka obecną pulę połączeń i tworzy nową dla podanej bazy danych.
+    :param db_name: ścieżka do pliku bazy danych
+    :param pool_size: liczba połączeń utrzymywanych w puli
+    """
+    global pool
+    pool.dispose()
+    pool = ConnectionPool(db_name, pool_size)
+
+@contextmanager
+def get_connection():
     """
-    Tabela użytkowników.
-    Przechowuje dane użytkowników, takie jak
-    nazwa użytkownika i hasło.
+    Wypożycza połączenie z puli na czas bloku 'with'. Po udanym bloku zatwierdza
+    transakcję, po wyjątku ją wycofuje, a połączenie zawsze wraca do puli.
+    :return: połączenie DB-API (sqlite3) z puli
     """
-    __tablename__ = "users"
-    id = Column(Integer, primary_key=True)
-    username = Column(String, unique=True, nullable=False)
-    password = Column(String, nullable=False)
-    games = relationship("Game", back_populates="user")
+    conn = pool.acquire()
+    try:
+        yield conn
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        pool.release(conn)
 
-class Game(Base):
+WORDS_FILE = '../words.json'
+
+def schema_version():
+    """
+    Odczytuje wersję schematu zapisaną w bazie (PRAGMA user_version).
+    :return: wersja schematu; 0 dla nowej bazy albo bazy sprzed wprowadzenia wersji
+    """
+    with get_connection() as conn:
+        return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def set_schema_version(version):
+    """
+    Zapisuje wersję schematu w bazie.
+    :param version: numer wersji
+    """
+    with get_connection() as conn:
+        conn.execute(f"PRAGMA user_version={int(version)}")
+
+def backfill_user_stats():
+    """
+    Jednorazowo wypełnia tabelę 'user_stats' na podstawie istniejących gier
+    (dla baz utworzonych przed jej dodaniem).
+    """
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT 1 FROM user_stats LIMIT 1")
+        if cursor.fetchone() is None:
+            cursor.execute("""
+                INSERT INTO user_stats (user_id, games, wins, mistakes)
+                SELECT user_id, COUNT(*), SUM(won), SUM(mistakes) FROM games
+                WHERE user_id IS NOT NULL
+                GROUP BY user_id
+            """)
+
+def backfill_leaderboard():
     """
-    Tabela informacji o grach.
-    Przechowuje informacje takie jak: słowo do odgadnięcia, liczba błędów,
-    oraz czy gra została wygrana i klucz obcy do użytkownika.
+    Jednorazowo wypełnia tabelę 'leaderboard' na podstawie podsumowań w 'user_stats'
+    (ranking łączny) i gier z zapisaną kategorią (rankingi kategorii).
     """
-    __tablename__ = "games"
-    id = Column(Integer, primary_key=True)
-    user_id = Column(Integer, ForeignKey("users.id"))
-    word = Column(String, nullable=False)
-    mistakes = Column(Integer, default=0)
-    won = Column(Boolean, default=False)
-    user = relationship("User", back_populates="games")
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT 1 FROM leaderboard LIMIT 1")
+        if cursor.fetchone() is None:
+            cursor.execute("""
+                INSERT INTO leaderboard (category, user_id, games, wins, mistakes, win_rate, avg_mistakes)
+                SELECT ?, user_id, games, wins, mistakes, wins * 1.0 / games, mistakes * 1.0 / games
+                FROM user_stats WHERE games > 0
+            """, (ALL_CATEGORIES,))
+            cursor.execute("""
+                INSERT INTO leaderboard (category, user_id, games, wins, mistakes, win_rate, avg_mistakes)
+                SELECT category, user_id, COUNT(*), SUM(won), SUM(mistakes),
+                       SUM(won) * 1.0 / COUNT(*), SUM(mistakes) * 1.0 / COUNT(*)
+                FROM games
+                WHERE user_id IS NOT NULL AND category IS NOT NULL
+                GROUP BY category, user_id
+            """)
 
-class Word(Base):
+def rebuild_categories(cursor):
     """
-    Tabela słów używanych w grze.
+    Przelicza liczby słów w tabeli 'categories' na podstawie tabeli 'words'
+    (jedno przejście po indeksie (category, word)). Alfabety kategorii są zachowywane.
+    :param cursor: kursor w otwartej transakcji
+    """
+    cursor.execute("DELETE FROM categories WHERE name NOT IN (SELECT DISTINCT category FROM words)")
+    cursor.execute("""
+        INSERT INTO categories (name, word_count)
+        SELECT category, COUNT(*) FROM words WHERE true GROUP BY category
+        ON CONFLICT(name) DO UPDATE SET word_count = excluded.word_count
+    """)
+
+def update_alphabets(cursor, letters):
+    """
+    Dołącza litery nowych słów do alfabetów kategorii w tabeli 'categories'.
+    :param cursor: kursor w otwartej transakcji
+    :param letters: dict {kategoria: zbiór wielkich liter z nowych słów}
+    """
+    from alphabet import Alphabet
+
+    rows = []
+    for category, category_letters in letters.items():
+        cursor.execute("SELECT alphabet, folding FROM categories WHERE name=?", (category,))
+        row = cursor.fetchone()
+        if row is not None and row[0] is not None:
+            category_letters = category_letters | Alphabet(row[0], row[1] or "").used_letters()
+        alphabet = Alphabet.derive(category_letters)
+        rows.append((alphabet.letters, alphabet.folding, category))
+    cursor.executemany("UPDATE categories SET alphabet=?, folding=? WHERE name=?", rows)
 
-    Przechowuje słowa wraz z ich kategorią.
+def backfill_alphabets():
     """
-    __tablename__ = "words"
-    id = Column(Integer, primary_key=True)
-    word = Column(String, nullable=False)
-    category = Column(String, nullable=False)
+    Wyznacza alfabety kategorii, które go nie mają (np. w bazach sprzed ich wprowadzenia),
+    jednym przejściem po słowach tych kategorii.
+    """
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT name FROM categories WHERE alphabet IS NULL")
+        missing = [name for (name,) in cursor.fetchall()]
+        letters = {}
+        for start in range(0, len(missing), 500):
+            chunk = missing[start:start + 500]
+            cursor.execute(f"SELECT category, word FROM words WHERE category IN ({','.join('?' * len(chunk))})",
+                           chunk)
+            for category, word in cursor:
+                letters.setdefault(category, set()).update(word.upper())
+        if letters:
+            update_alphabets(cursor, letters)
 
 def init_db():
     """
     Inicjalizuje bazę danych, tworząc wszystkie tabele i słowa (tylko na początku jeśli
-    nie istnieją). Słowa są dodawane z pliku 'words.json'.
+    nie istnieją). Słowa są importowane strumieniowo z pliku 'words.json'.
+
+    Jeśli baza ma już aktualną wersję schematu (PRAGMA user_version), kończy się
+    po jednym zapytaniu - bez importu SQLAlchemy, create_all i liczenia słów.
     """
-    Base.metadata.create_all(engine)
-    session = Session()
+    if schema_version() >= SCHEMA_VERSION:
+        return
 
-    if session.query(Word).count() == 0:    # SELECT COUNT(1) FROM words
-        words = read_words_file('../words.json')
-        for word in words:
-            session.add(Word(**word))
-        session.commit()
+    import models
+    models.migrate()
+    backfill_user_stats()
+    backfill_leaderboard()
+    with get_connection() as conn:
+        empty = conn.execute("SELECT 1 FROM words LIMIT 1").fetchone() is None
+        no_categories = conn.execute("SELECT 1 FROM categories LIMIT 1").fetchone() is None
 
-    session.close()
+    if empty:
+        from importer import import_words
+        import_words(WORDS_FILE)
+    elif no_categories:
+        with get_connection() as conn:
+            rebuild_categories(conn.cursor())
+    backfill_alphabets()
+    set_schema_version(SCHEMA_VERSION)
 
 def read_words_file(file):
     """
@@ -64,15 +274,6 @@ def read_words_file(file):
     :param file: scieżka do pliku ze słowami i kategoriami
     :return: lista dict {'word': _, 'category': _}
     """
-    import json
-
-    data = []
-
-    with open(file, 'r', encoding='utf-8') as f:
-        json_data = json.load(f)
-
-    for category, words in json_data.items():
-        for w in words:
-            data.append({"word": w, "category": category})
+    from importer import iter_words
 
-    return data
+    return list(iter_words(file, "json"))
@@ -0,0 +1,30 @@
+# Domyślne wartości opcji wiersza poleceń. Moduł niczego nie importuje, więc
+# main.parse_args czyta je bez ładowania modułów poleceń (czas startu gry);
+# moduły, których dotyczą, importują je stąd.
+
+# storage
+BACKENDS = ("sqlite", "memory", "sqlalchemy")
+
+# animation
+FPS = 60
+
+# client, server
+HOST = "127.0.0.1"
+PORT = 5151
+SERVER_WORKERS = 8
+
+# importer
+BATCH_SIZE = 10000
+FORMATS = ("json", "ndjson", "csv", "txt")
+
+# simulation, solver
+SIMULATION_STRATEGIES = ("frequency", "random")
+SOLVER_STRATEGIES = ("frequency", "entropy", "category")
+SOLVER_WORKERS = 4
+
+# maintenance
+ARCHIVE_FILE = "hangman-archive.db"
+RETENTION_DAYS = 90
+CHUNK_ROWS = 5000
+PAUSE = 0.05            # przerwa (s) między partiami, żeby zapisy gry nie czekały na blokadę
+VACUUM_PAGES = 1000
@@ -0,0 +1,164 @@
+import time
+from itertools import groupby
+
+from alphabet import Alphabet
+from database import get_connection
+from engine import MAX_MISTAKES
+from simulation import letter_order, play, words_alphabet
+from word_index import DIFFICULTIES, DEFAULT_BAND, word_index
+
+JOB_NAME = "word_difficulty"
+PRIOR_GAMES = 5     # waga oceny z cech słowa, liczona jak tyle rozegranych gier
+
+NEW_WORDS_SQL = """
+    SELECT id, word, category FROM words
+    WHERE id > (SELECT COALESCE(MAX(word_id), 0) FROM word_difficulty)
+    ORDER BY id
+"""
+INSERT_SQL = """
+    INSERT OR REPLACE INTO word_difficulty (word_id, lexical, games, wins, mistakes, score, band)
+    VALUES (?, ?, 0, 0, 0, ?, ?)
+"""
+ALPHABETS_SQL = "SELECT name, alphabet, folding FROM categories WHERE alphabet IS NOT NULL"
+PROGRESS_SQL = "SELECT last_id FROM job_progress WHERE name=?"
+SAVE_PROGRESS_SQL = """
+    INSERT INTO job_progress (name, last_id) VALUES (?, ?)
+    ON CONFLICT(name) DO UPDATE SET last_id = excluded.last_id
+"""
+NEW_GAMES_SQL = """
+    SELECT word, COUNT(*), SUM(won), SUM(mistakes) FROM games
+    WHERE id > ? AND id <= ?
+    GROUP BY word
+"""
+ARCHIVED_GAMES_SQL = "SELECT word, SUM(games), SUM(wins), SUM(mistakes) FROM games_daily GROUP BY word"
+ADD_GAMES_SQL = "UPDATE word_difficulty SET games=games+?, wins=wins+?, mistakes=mistakes+? WHERE word_id=?"
+# Wygrana daje ułamek wykorzystanych błędów, a przegrana (zawsze max_mistakes błędów)
+# - co najmniej 1, ale nie mniej niż ocena z cech, bo przegrana nie mówi, ilu błędów brakło.
+SCORE_SQL = """
+    UPDATE word_difficulty SET score = (
+        ? * lexical
+        + (mistakes - (games - wins) * ?) * 1.0 / ?
+        + (games - wins) * MAX(lexical, 1.0)
+    ) / (? + games)
+    WHERE word_id = ?
+"""
+CATEGORY_SCORES_SQL = """
+    SELECT w.category, d.word_id, d.band FROM word_difficulty d
+    JOIN words w ON w.id = d.word_id
+    WHERE w.category IN ({})
+    ORDER BY w.category, d.score, d.word_id
+"""
+SET_BAND_SQL = "UPDATE word_difficulty SET band=? WHERE word_id=?"
+
+def lexical_difficulty(word, order, max_mistakes=MAX_MISTAKES, alphabet=None):
+    """
+    Ocenia trudność słowa na podstawie jego cech: rozgrywa grę bez limitu błędów,
+    zgadując litery od najczęstszych w kategorii. Liczba błędów rośnie, gdy słowo
+    ma wiele różnych liter, rzadkie litery albo jest krótkie (mało trafień na początku).
+    :param word: słowo (wielkimi literami)
+    :param order: wszystkie litery klawiatury od najczęstszych (simulation.letter_order)
+    :param alphabet: alfabet kategorii słowa (alphabet.Alphabet)
+    :return: liczba błędów potrzebnych do odgadnięcia słowa podzielona przez dozwoloną
+        liczbę błędów (w skali jak mistakes / max_mistakes z gier; powyżej 1 - słowo
+        zwykle przegrywane)
+    """
+    return play(word, order, len(order), alphabet).mistakes / max_mistakes
+
+def update_difficulty(full=False):
+    """
+    Przelicza trudność słów przyrostowo: ocenia cechy tylko nowych słów i dolicza
+    tylko gry rozegrane od poprzedniego uruchomienia (postęp w tabeli 'job_progress').
+    Przeliczenie od początku uwzględnia też gry przeniesione do archiwum (tabela 'games_daily').
+    Ocena słowa to średnia ułamka wykorzystanych błędów w jego grach, wygładzona
+    oceną z cech (waga PRIOR_GAMES gier). Przedziały trudności (tercyle oceny
+    w kategorii) są przeliczane tylko w kategoriach, w których coś się zmieniło.
+    :param full: przelicz wszystko od początku
+    :return: dict z liczbą nowych słów, przetworzonych gier, zmienionych kategorii i czasem
+    """
+    start = time.perf_counter()
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        if full:
+            cursor.execute("DELETE FROM word_difficulty")
+            cursor.execute("DELETE FROM job_progress WHERE name=?", (JOB_NAME,))
+
+        new_words = cursor.execute(NEW_WORDS_SQL).fetchall()
+        if new_words:
+            alphabets = {name: Alphabet(letters, folding or "")
+                         for name, letters, folding in cursor.execute(ALPHABETS_SQL)}
+            words = {}
+            for category, word in cursor.execute("SELECT category, word FROM words"):
+                words.setdefault(category, []).append(word.upper())
+            orders = {}
+            rows = []
+            for word_id, word, category in new_words:
+                if category not in orders:
+                    alphabet = alphabets.get(category) or words_alphabet(words[category])
+                    orders[category] = (letter_order(words[category], alphabet), alphabet)
+                order, alphabet = orders[category]
+                lexical = lexical_difficulty(word.upper(), order, alphabet=alphabet)
+                rows.append((word_id, lexical, lexical, DEFAULT_BAND))
+            cursor.executemany(INSERT_SQL, rows)
+        touched = {word_id for word_id, _, _ in new_words}
+
+        row = cursor.execute(PROGRESS_SQL, (JOB_NAME,)).fetchone()
+        last_id = row[0] if row else 0
+        max_id = cursor.execute("SELECT COALESCE(MAX(id), 0) FROM games").fetchone()[0]
+        played = cursor.execute(NEW_GAMES_SQL, (last_id, max_id)).fetchall()
+        if full:
+            played += cursor.execute(ARCHIVED_GAMES_SQL).fetchall()
+        games = 0
+        if played:
+            ids = {}
+            for word_id, word in cursor.execute("SELECT id, word FROM words"):
+                ids.setdefault(word.upper(), []).append(word_id)
+            updates = []
+            for word, count, wins, mistakes in played:
+                games += count
+                for word_id in ids.get(word, ()):
+                    updates.append((count, wins, mistakes, word_id))
+            cursor.executemany(ADD_GAMES_SQL, updates)
+            cursor.executemany(SCORE_SQL, [(PRIOR_GAMES, MAX_MISTAKES, MAX_MISTAKES, PRIOR_GAMES, row[-1])
+                                           for row in updates])
+            touched.update(row[-1] for row in updates)
+        cursor.execute(SAVE_PROGRESS_SQL, (JOB_NAME, max_id))
+
+        categories = assign_bands(cursor, touched)
+
+    if touched:
+        word_index.invalidate()
+    return {
+        "new_words": len(new_words),
+        "games": games,
+        "categories": len(categories),
+        "seconds": time.perf_counter() - start,
+    }
+
+def assign_bands(cursor, word_ids):
+    """
+    Dzieli słowa kategorii, w których są podane słowa, na przedziały trudności
+    (równe części posortowane według oceny) i zapisuje zmienione przedziały.
+    :param cursor: kursor w otwartej transakcji
+    :param word_ids: id słów, których ocena się zmieniła
+    :return: zbiór przeliczonych kategorii
+    """
+    categories = set()
+    word_ids = list(word_ids)
+    for start in range(0, len(word_ids), 500):
+        chunk = word_ids[start:start + 500]
+        placeholders = ",".join("?" * len(chunk))
+        cursor.execute(f"SELECT DISTINCT category FROM words WHERE id IN ({placeholders})", chunk)
+        categories.update(category for (category,) in cursor.fetchall())
+    if not categories:
+        return categories
+
+    changes = []
+    rows = cursor.execute(CATEGORY_SCORES_SQL.format(",".join("?" * len(categories))), list(categories))
+    for _, group in groupby(rows.fetchall(), key=lambda row: row[0]):
+        group = list(group)
+        for i, (_, word_id, band) in enumerate(group):
+            new_band = i * len(DIFFICULTIES) // len(group)
+            if new_band != band:
+                changes.append((new_band, word_id))
+    cursor.executemany(SET_BAND_SQL, changes)
+    return categories
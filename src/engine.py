@@ -0,0 +1,87 @@
+MAX_MISTAKES = 6
+
+class HangmanGame:
+    """
+    Stan pojedynczej rozgrywki w wisielca, niezależny od interfejsu.
+
+    Przy tworzeniu gry wyliczana jest mapa litera -> pozycje w słowie, więc sprawdzenie
+    litery kosztuje tyle, ile jest jej wystąpień, a nie tyle, ile liter ma słowo.
+    Z tej klasy korzysta zarówno interfejs Tk, jak i symulacje.
+
+    Mapa jest budowana z postaci słowa do porównań (alphabet.Alphabet.fold), więc
+    np. É w słowie odsłania klawisz E. Znaki niebędące literami (spacja, myślnik)
+    są odsłonięte od początku.
+    """
+    __slots__ = ("word", "positions", "guessed", "used_letters", "mistakes", "max_mistakes", "hidden")
+
+    def __init__(self, word, max_mistakes=MAX_MISTAKES, alphabet=None):
+        """
+        :param word: słowo do odgadnięcia (wielkimi literami)
+        :param max_mistakes: liczba błędów kończąca grę przegraną
+        :param alphabet: alfabet kategorii (alphabet.Alphabet); None - litery porównywane wprost
+        """
+        positions = {}
+        guessed = ["_"] * len(word)
+        folded = alphabet.fold(word) if alphabet is not None else word
+        if folded.isalpha():
+            for i, letter in enumerate(folded):
+                positions.setdefault(letter, []).append(i)
+            hidden = len(word)
+        else:
+            hidden = 0
+            for i, letter in enumerate(folded):
+                if letter.isalpha():
+                    positions.setdefault(letter, []).append(i)
+                    hidden += 1
+                else:
+                    guessed[i] = letter
+        self.word = word
+        self.positions = positions
+        self.guessed = guessed
+        self.used_letters = set()
+        self.mistakes = 0
+        self.max_mistakes = max_mistakes
+        self.hidden = hidden
+
+    def guess(self, letter):
+        """
+        Sprawdza literę i aktualizuje stan gry.
+        :param letter: zgadywana litera (wielka; klawisz alfabetu)
+        :return: True - trafienie, False - błąd, None - litera już użyta albo gra skończona
+        """
+        if letter in self.used_letters or self.hidden == 0 or self.mistakes >= self.max_mistakes:
+            return None
+        self.used_letters.add(letter)
+
+        positions = self.positions.get(letter)
+        if positions is None:
+            self.mistakes += 1
+            return False
+
+        guessed = self.guessed
+        word = self.word
+        for i in positions:
+            guessed[i] = word[i]
+        self.hidden -= len(positions)
+        return True
+
+    @property
+    def won(self):
+        """
+        True, jeśli wszystkie litery słowa zostały odgadnięte.
+        """
+        return self.hidden == 0
+
+    @property
+    def lost(self):
+        """
+        True, jeśli wykorzystano wszystkie dozwolone błędy.
+        """
+        return self.mistakes >= self.max_mistakes
+
+    @property
+    def finished(self):
+        """
+        True, jeśli gra zakończyła się wygraną lub przegraną.
+        """
+        return self.hidden == 0 or self.mistakes >= self.max_mistakes
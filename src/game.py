@@ -1,46 +1,434 @@
-import sqlite3
+import atexit
+import threading
 
-DB_NAME = "hangman.db"
+from alphabet import Alphabet, DEFAULT_ALPHABET
+from database import get_connection, ALL_CATEGORIES, SYNCHRONOUS
+from metrics import timed
+from word_index import word_index
+from writer import GameWriter
 
-def get_random_word(category=None):
+CATEGORIES_SQL = "SELECT name, word_count, alphabet, folding FROM categories ORDER BY name"
+SAVE_GAME_SQL = """
+    INSERT INTO games (user_id, word, mistakes, won, category, played_at) VALUES (?, ?, ?, ?, ?, datetime('now'))
+"""
+UPDATE_STATS_SQL = """
+    INSERT INTO user_stats (user_id, games, wins, mistakes) VALUES (?, 1, ?, ?)
+    ON CONFLICT(user_id) DO UPDATE SET
+        games = games + 1,
+        wins = wins + excluded.wins,
+        mistakes = mistakes + excluded.mistakes
+"""
+UPDATE_LEADERBOARD_SQL = """
+    INSERT INTO leaderboard (category, user_id, games, wins, mistakes, win_rate, avg_mistakes)
+    VALUES (?, ?, 1, ?, ?, ?, ?)
+    ON CONFLICT(category, user_id) DO UPDATE SET
+        games = games + 1,
+        wins = wins + excluded.wins,
+        mistakes = mistakes + excluded.mistakes,
+        win_rate = (wins + excluded.wins) * 1.0 / (games + 1),
+        avg_mistakes = (mistakes + excluded.mistakes) * 1.0 / (games + 1)
+"""
+# Kolejność rankingu: wygrane, procent wygranych, średnia błędów (rosnąco), id gracza
+# - taka sama jak w indeksie ix_leaderboard_rank, więc ORDER BY ... LIMIT czyta tylko N wpisów.
+LEADERBOARD_SQL = """
+    SELECT u.username, l.games, l.wins, l.win_rate, l.avg_mistakes
+    FROM leaderboard l JOIN users u ON u.id = l.user_id
+    WHERE l.category = ?
+    ORDER BY l.wins DESC, l.win_rate DESC, l.avg_mistakes, l.user_id
+    LIMIT ?
+"""
+PLAYER_SQL = "SELECT games, wins, win_rate, avg_mistakes FROM leaderboard WHERE category=? AND user_id=?"
+# Liczba graczy przed danym graczem jako suma czterech zakresów indeksu ix_leaderboard_rank.
+RANK_SQL = """
+    SELECT (SELECT COUNT(*) FROM leaderboard WHERE category=:category AND wins>:wins)
+         + (SELECT COUNT(*) FROM leaderboard WHERE category=:category AND wins=:wins AND win_rate>:win_rate)
+         + (SELECT COUNT(*) FROM leaderboard WHERE category=:category AND wins=:wins AND win_rate=:win_rate
+                AND avg_mistakes<:avg_mistakes)
+         + (SELECT COUNT(*) FROM leaderboard WHERE category=:category AND wins=:wins AND win_rate=:win_rate
+                AND avg_mistakes=:avg_mistakes AND user_id<:user_id)
+"""
+USER_STATS_SQL = "SELECT games, wins, mistakes FROM user_stats WHERE user_id=?"
+HISTORY_SQL = "SELECT id, word, mistakes, won FROM games WHERE user_id=? AND id<? ORDER BY id DESC LIMIT ?"
+START_PROGRESS_SQL = """
+    INSERT OR REPLACE INTO active_games (user_id, word, category, mode, letters) VALUES (?, ?, ?, ?, ?)
+"""
+CLEAR_LOG_SQL = "DELETE FROM guess_log WHERE user_id=?"
+LOG_GUESS_SQL = "INSERT OR IGNORE INTO guess_log (user_id, seq, letter, mask) VALUES (?, ?, ?, ?)"
+LOG_LETTERS_SQL = "SELECT letter FROM guess_log WHERE user_id=? ORDER BY seq"
+FINISH_GAME_SQL = """
+    INSERT INTO games (user_id, word, mistakes, won, category, guesses, played_at)
+    VALUES (?, ?, ?, ?, ?, ?, datetime('now'))
+"""
+PROGRESS_SQL = """
+    SELECT word, category, mode, letters,
+           (SELECT mask FROM guess_log WHERE user_id = a.user_id ORDER BY seq DESC LIMIT 1)
+    FROM active_games a WHERE user_id=?
+"""
+START_SESSION_SQL = """
+    INSERT INTO sessions (user_id, category, mode, started_at, updated_at, rounds, wins, mistakes, best_streak)
+    VALUES (?, ?, ?, datetime('now'), datetime('now'), 0, 0, 0, 0)
+"""
+UPDATE_SESSION_SQL = """
+    UPDATE sessions SET updated_at=datetime('now'), rounds=?, wins=?, mistakes=?, best_streak=?
+    WHERE id=? AND user_id=?
+"""
+
+@timed("game.get_random_word")
+def get_random_word(category=None, difficulty=None):
     """
     Zwraca losowe słowo z bazy danych z wybranej kategorii.
+    Słowo jest losowane z indeksu w pamięci (patrz word_index), bez zapytania do bazy.
     :param category: nazwa kategorii, po której będziemy szukać w bazie danych
+    :param difficulty: przedział trudności ('easy', 'medium', 'hard') albo None - dowolny
     :return: słowo wielkimi litegami
     """
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
+    return word_index.random_word(category, difficulty)
 
-    cursor.execute("SELECT word FROM words WHERE category=? ORDER BY RANDOM() LIMIT 1", (category,))
-    result = cursor.fetchone()
-    word = result[0] if result else None
-    conn.close()
-    return word.upper() if word else None
+def get_words(category):
+    """
+    Zwraca wszystkie słowa kategorii jednym odczytem z indeksu w pamięci (patrz word_index),
+    np. do zbudowania kolejki słów maratonu. Lista nie powinna być modyfikowana.
+    :param category: nazwa kategorii
+    :return: lista słów wielkimi literami
+    """
+    return word_index.words(category)
+
+_categories = None
+_alphabets = {}
+_categories_lock = threading.Lock()
+
+def _load_categories():
+    """
+    Wczytuje z tabeli 'categories' liczby słów i alfabety kategorii.
+    Wywoływane z założoną blokadą.
+    """
+    global _categories, _alphabets
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(CATEGORIES_SQL)
+        rows = cursor.fetchall()
+    _categories = {name: count for name, count, _, _ in rows}
+    _alphabets = {name: Alphabet(letters, folding or "") for name, _, letters, folding in rows if letters}
+
+@timed("game.get_category_counts")
+def get_category_counts():
+    """
+    Zwraca liczbę słów w każdej kategorii. Wynik jest trzymany w pamięci
+    i odczytywany z bazy (tabela 'categories') tylko po jego unieważnieniu.
+    :return: dict {kategoria: liczba słów}
+    """
+    with _categories_lock:
+        if _categories is None:
+            _load_categories()
+        return _categories
+
+def get_alphabet(category):
+    """
+    Zwraca alfabet kategorii (litery klawiatury i mapę sprowadzania liter), wyznaczony
+    przy imporcie słów i trzymany w pamięci razem z listą kategorii.
+    :param category: nazwa kategorii
+    :return: alphabet.Alphabet; dla nieznanej kategorii - alfabet podstawowy A-Z
+    """
+    with _categories_lock:
+        if _categories is None:
+            _load_categories()
+        return _alphabets.get(category, DEFAULT_ALPHABET)
 
 def get_categories():
     """
     Wyszukuje i zwraca nazwy wszystkich kategorii w liście
     :return: Nazwy kategorii w liście
     """
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    cursor.execute("SELECT DISTINCT category FROM words")
-    categories = [row[0] for row in cursor.fetchall()]
-    conn.close()
-    return categories
+    return list(get_category_counts())
+
+def cached_categories():
+    """
+    Zwraca nazwy kategorii tylko, jeśli są już w pamięci (bez zapytania do bazy).
+    :return: Nazwy kategorii w liście albo None
+    """
+    categories = _categories
+    return list(categories) if categories is not None else None
+
+def words_changed():
+    """
+    Powiadamia pamięć podręczną o zmianie tabeli 'words' (np. po imporcie słownika):
+    unieważnia listę kategorii i dociąga nowe słowa do indeksu.
+    """
+    global _categories
+    with _categories_lock:
+        _categories = None
+    word_index.refresh()
+
+@timed("game.save_games")
+def save_games(rows, synchronous=None):
+    """
+    Zapisuje partię gier w jednej transakcji i aktualizuje podsumowania w tabeli 'user_stats'
+    oraz ranking (tabela 'leaderboard': łączny i kategorii gry, jeśli jest znana).
+    :param rows: lista krotek (user_id, word, mistakes, won, category)
+    :param synchronous: tryb PRAGMA synchronous dla tej transakcji (None - domyślny)
+    """
+    # Tryb domyślny połączeń (database.SYNCHRONOUS) nie wymaga przestawiania.
+    override = synchronous is not None and synchronous != SYNCHRONOUS
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        if override:
+            cursor.execute(f"PRAGMA synchronous={synchronous}")
+        try:
+            cursor.executemany(SAVE_GAME_SQL, rows)
+            _update_summaries(cursor, rows)
+            conn.commit()
+        finally:
+            if override:
+                cursor.execute(f"PRAGMA synchronous={SYNCHRONOUS}")
+
+def _update_summaries(cursor, rows):
+    """
+    Dolicza zapisane gry do podsumowań w tabeli 'user_stats' i do rankingu.
+    Gry bez zalogowanego gracza (user_id None) są pomijane, jak w backfill_user_stats.
+    :param cursor: kursor w otwartej transakcji
+    :param rows: lista krotek (user_id, word, mistakes, won, category)
+    """
+    stats = []
+    ranking = []
+    for user_id, _, mistakes, won, category in rows:
+        if user_id is None:
+            continue
+        stats.append((user_id, won, mistakes))
+        ranking.append((ALL_CATEGORIES, user_id, won, mistakes, float(won), float(mistakes)))
+        if category is not None:
+            ranking.append((category, user_id, won, mistakes, float(won), float(mistakes)))
+    cursor.executemany(UPDATE_STATS_SQL, stats)
+    cursor.executemany(UPDATE_LEADERBOARD_SQL, ranking)
+
+game_writer = GameWriter(save_games)
+atexit.register(game_writer.close)
+
+@timed("game.save_progress")
+def save_progress(rows, synchronous=None):
+    """
+    Zapisuje w jednej transakcji, w kolejności, partię zmian gier w toku:
+    ('start', user_id, word, category, mode, letters) - nowa gra (zastępuje poprzednią),
+    ('guess', user_id, seq, letter, mask) - dopisanie ruchu do dziennika 'guess_log',
+    ('finish', user_id, word, mistakes, won, category) - zapis gry do tabeli 'games'
+    ze zgadywanymi literami z dziennika (w kolejności) i usunięcie dziennika.
+    Po błędzie cała partia jest wycofywana, więc w bazie zawsze jest spójny stan
+    z ostatniej zatwierdzonej partii.
+    :param rows: lista krotek jak wyżej
+    :param synchronous: tryb PRAGMA synchronous dla tej transakcji (None - domyślny)
+    """
+    override = synchronous is not None and synchronous != SYNCHRONOUS
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        if override:
+            cursor.execute(f"PRAGMA synchronous={synchronous}")
+        try:
+            for kind, user_id, *values in rows:
+                if kind == "guess":
+                    cursor.execute(LOG_GUESS_SQL, (user_id, *values))
+                elif kind == "start":
+                    cursor.execute(CLEAR_LOG_SQL, (user_id,))
+                    cursor.execute(START_PROGRESS_SQL, (user_id, *values))
+                else:
+                    word, mistakes, won, category = values
+                    guesses = "".join(letter for (letter,) in cursor.execute(LOG_LETTERS_SQL, (user_id,)))
+                    cursor.execute(FINISH_GAME_SQL, (user_id, word, mistakes, won, category, guesses))
+                    _update_summaries(cursor, [(user_id, word, mistakes, won, category)])
+                    cursor.execute(CLEAR_LOG_SQL, (user_id,))
+                    cursor.execute("DELETE FROM active_games WHERE user_id=?", (user_id,))
+            conn.commit()
+        finally:
+            if override:
+                cursor.execute(f"PRAGMA synchronous={SYNCHRONOUS}")
+
+progress_writer = GameWriter(save_progress)
+atexit.register(progress_writer.close)
+
+def flush_writes():
+    """
+    Czeka, aż zaległe zapisy gier i gier w toku trafią do bazy.
+    """
+    progress_writer.flush()
+    game_writer.flush()
 
-def save_game(user_id, word, mistakes, won):
+def close_writers():
     """
-    Dodaje to tabeli 'games' informacje o grze. Informacje te podajemy w parametrach
+    Zapisuje zaległe gry i gry w toku i zatrzymuje wątki zapisujące.
+    """
+    progress_writer.close()
+    game_writer.close()
+
+@timed("game.save_game")
+def save_game(user_id, word, mistakes, won, category=None):
+    """
+    Dodaje to tabeli 'games' informacje o grze. Informacje te podajemy w parametrach.
+    Gra trafia do kolejki zapisu w tle (game_writer) i jest zapisywana partiami
+    razem z aktualizacją podsumowania w tabeli 'user_stats' i rankingu; funkcja nie czeka na dysk.
     :param user_id:
     :param word:
     :param mistakes:
     :param won:
+    :param category: kategoria słowa (None - gra liczy się tylko do rankingu łącznego)
     :return:
     """
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    cursor.execute("INSERT INTO games (user_id, word, mistakes, won) VALUES (?, ?, ?, ?)",
-                   (user_id, word, mistakes, int(won)))
-    conn.commit()
-    conn.close()
+    game_writer.put((user_id, word, mistakes, int(won), category))
+
+def start_progress(user_id, word, category, mode, letters):
+    """
+    Rozpoczyna zapisywanie gry w toku (zastępuje poprzednią niedokończoną grę użytkownika).
+    Zmiana trafia do kolejki zapisu w tle (progress_writer); funkcja nie czeka na dysk.
+    :param user_id: id użytkownika
+    :param word: słowo do odgadnięcia
+    :param category: kategoria słowa
+    :param mode: tryb gry ('classic' albo 'arrow')
+    :param letters: litery klawiatury gry (alphabet.Alphabet.letters), wyznaczające bity masek
+    """
+    progress_writer.put(("start", user_id, word, category, mode, letters))
+
+def save_guess(user_id, seq, letter, mask):
+    """
+    Dopisuje ruch do dziennika gry w toku (przez kolejkę zapisu partiami).
+    :param user_id: id użytkownika
+    :param seq: numer ruchu w grze (od 1)
+    :param letter: zgadywana litera
+    :param mask: maska wszystkich użytych dotąd liter (patrz alphabet.Alphabet.mask)
+    """
+    progress_writer.put(("guess", user_id, seq, letter, mask))
+
+@timed("game.finish_game")
+def finish_game(user_id, word, mistakes, won, category=None):
+    """
+    Kończy grę w toku: zapisuje ją w tabeli 'games' (jak save_game, razem z literami
+    z dziennika ruchów) i usuwa dziennik. Idzie przez tę samą kolejkę co ruchy gry,
+    więc jest zapisywana po nich.
+    """
+    progress_writer.put(("finish", user_id, word, mistakes, int(won), category))
+
+@timed("game.get_progress")
+def get_progress(user_id):
+    """
+    Zwraca niedokończoną grę użytkownika: wiersz 'active_games' i maskę użytych liter
+    z ostatniego wpisu dziennika (odczyt po kluczu głównym, bez przeglądania dziennika).
+    :param user_id: id użytkownika
+    :return: dict z kluczami word, category, mode, letters, mask albo None
+    """
+    progress_writer.flush()
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(PROGRESS_SQL, (user_id,))
+        row = cursor.fetchone()
+    if row is None:
+        return None
+    word, category, mode, letters, mask = row
+    return {"word": word, "category": category, "mode": mode, "letters": letters, "mask": mask or 0}
+
+@timed("game.get_user_stats")
+def get_user_stats(user_id):
+    """
+    Zwraca podsumowanie statystyk użytkownika jednym zapytaniem po kluczu głównym
+    tabeli 'user_stats' (bez przeglądania tabeli 'games').
+    :param user_id: id użytkownika
+    :return: dict z kluczami games, wins, mistakes, win_percentage, avg_mistakes
+    """
+    flush_writes()
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(USER_STATS_SQL, (user_id,))
+        row = cursor.fetchone()
+    games, wins, mistakes = row if row else (0, 0, 0)
+    return {
+        "games": games,
+        "wins": wins,
+        "mistakes": mistakes,
+        "win_percentage": wins / games * 100 if games else 0.0,
+        "avg_mistakes": mistakes / games if games else 0.0,
+    }
+
+@timed("game.get_leaderboard")
+def get_leaderboard(category=None, limit=10):
+    """
+    Zwraca czołówkę rankingu z tabeli 'leaderboard' (odczyt pierwszych wpisów indeksu
+    ix_leaderboard_rank, bez grupowania tabeli 'games').
+    :param category: nazwa kategorii albo None - ranking łączny
+    :param limit: liczba graczy
+    :return: lista krotek (miejsce, username, games, wins, win_percentage, avg_mistakes)
+    """
+    flush_writes()
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(LEADERBOARD_SQL, (category or ALL_CATEGORIES, limit))
+        return [(place, username, games, wins, win_rate * 100, avg_mistakes)
+                for place, (username, games, wins, win_rate, avg_mistakes) in enumerate(cursor.fetchall(), 1)]
+
+@timed("game.get_rank")
+def get_rank(user_id, category=None):
+    """
+    Zwraca miejsce użytkownika w rankingu. Wiersz gracza jest odczytywany po kluczu głównym,
+    a miejsce to liczba graczy przed nim policzona w zakresach indeksu ix_leaderboard_rank.
+    :param user_id: id użytkownika
+    :param category: nazwa kategorii albo None - ranking łączny
+    :return: dict z kluczami rank, games, wins, win_percentage, avg_mistakes
+        albo None, jeśli użytkownik nie grał w tej kategorii
+    """
+    category = category or ALL_CATEGORIES
+    flush_writes()
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(PLAYER_SQL, (category, user_id))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        games, wins, win_rate, avg_mistakes = row
+        cursor.execute(RANK_SQL, {"category": category, "user_id": user_id, "wins": wins,
+                                  "win_rate": win_rate, "avg_mistakes": avg_mistakes})
+        above = cursor.fetchone()[0]
+    return {
+        "rank": above + 1,
+        "games": games,
+        "wins": wins,
+        "win_percentage": win_rate * 100,
+        "avg_mistakes": avg_mistakes,
+    }
+
+@timed("game.start_session")
+def start_session(user_id, category, mode):
+    """
+    Zakłada w tabeli 'sessions' wiersz nowej sesji gry ciągłej (maratonu).
+    :param user_id: id użytkownika
+    :param category: kategoria słów sesji
+    :param mode: tryb gry ('classic' albo 'arrow')
+    :return: id sesji
+    """
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(START_SESSION_SQL, (user_id, category, mode))
+        return cursor.lastrowid
+
+@timed("game.update_session")
+def update_session(user_id, session_id, rounds, wins, mistakes, best_streak):
+    """
+    Zapisuje bieżące podsumowanie sesji gry ciągłej (po każdej rundzie).
+    Sesje innych użytkowników nie są zmieniane.
+    :param user_id: id użytkownika
+    :param session_id: id sesji (patrz start_session)
+    """
+    with get_connection() as conn:
+        conn.execute(UPDATE_SESSION_SQL, (rounds, wins, mistakes, best_streak, session_id, user_id))
+
+@timed("game.get_game_history")
+def get_game_history(user_id, before_id=None, limit=100):
+    """
+    Zwraca stronę historii gier użytkownika, od najnowszych.
+    Kolejne strony pobieramy, podając id ostatniej gry z poprzedniej strony
+    (stronicowanie po kluczu, korzysta z indeksu (user_id, id)).
+    :param user_id: id użytkownika
+    :param before_id: zwracane są tylko gry o id mniejszym od podanego; None - od najnowszej
+    :param limit: maksymalna liczba gier na stronie
+    :return: lista krotek (id, word, mistakes, won)
+    """
+    if before_id is None:
+        before_id = 2 ** 63 - 1
+    flush_writes()
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(HISTORY_SQL, (user_id, before_id, limit))
+        return cursor.fetchall()
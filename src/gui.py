@@ -1,59 +1,143 @@
 import tkinter as tk
 from tkinter import messagebox, ttk
-from game import get_random_word, save_game, get_categories
-import sqlite3
-import hashlib
-
-DB_NAME = "hangman.db"
+from alphabet import DEFAULT_ALPHABET
+from animation import FPS, FrameScheduler, ease_out
+from engine import HangmanGame, MAX_MISTAKES
+from background import TkExecutor
+from metrics import timed
+from session import Marathon, restore_game
 
 SZARY = "#333333"
 BIALY = "#FFFFFF"
 CZERWONY = "#FF5555"
 KOLPRZYCISKU = "#555555"
 
+HISTORY_PAGE_SIZE = 100
+HISTORY_PRELOAD = 0.9
+LEADERBOARD_SIZE = 20
+WSZYSTKIE_KATEGORIE = "Wszystkie kategorie"
+
+CZAS_ANIMACJI = 0.3
+# Części wisielca w kolejności błędów: (rodzaj, współrzędne końcowe).
+CZESCI_WISIELCA = (
+    ("oval", (115, 50, 145, 80)),
+    ("line", (130, 80, 130, 150)),
+    ("line", (130, 90, 100, 120)),
+    ("line", (130, 90, 160, 120)),
+    ("line", (130, 150, 100, 200)),
+    ("line", (130, 150, 160, 200)),
+)
+STRZALA_START = 20
+STRZALA_KROK = 20
+
 class HangmanApp:
     """
     Główna klasa aplikacji gry w wisielca.
 
     Zarządza interfejsem graficznym, logiką gry oraz komunikacją z bazą danych.
     """
-    def __init__(self, root):
+    def __init__(self, root, api=None, fps=FPS):
         """
         Inicjalizuje aplikację gry w wisielca.
 
         Args:
             root: Główne okno aplikacji Tkinter.
-        """
+            api: Dostęp do danych gry: api.LocalApi (domyślnie, lokalna baza)
+                albo client.GameClient (serwer gry).
+            fps: Docelowa liczba klatek na sekundę animacji planszy.
+        """
+        if api is None:
+            from api import LocalApi
+            api = LocalApi()
+        self.api = api
         self.root = root
         self.root.title("Gra w Wisielca")
         self.root.geometry("400x600")
         self.root.configure(bg=SZARY)
-        self.word = ""
-        self.guessed = []
-        self.mistakes = 0
-        self.max_mistakes = 6
+        self.game = None
+        self.max_mistakes = MAX_MISTAKES
         self.user_id = None
         self.category = None
         self.canvas = None
+        self.animacje = FrameScheduler(root, fps)
+        self.czesci = []
+        self.strzala_x = STRZALA_START
         self.letters_buttons = {}
+        self.klawiatury = {}
+        self.klawiatura = None
+        self.maraton = None
         self.game_mode = "classic"
+        self.executor = TkExecutor(root)
+        self.ekran_nr = 0
+        self.ekrany = {}
+        self.aktualny_ekran = None
+        self.baza_gotowa = True
+        self.po_inicjalizacji = None
 
         self.style = ttk.Style()
         self.style.configure('TCombobox', fieldbackground=SZARY, background=SZARY, foreground=BIALY)
         self.style.map('TCombobox', fieldbackground=[('readonly', SZARY)])
         self.style.map('TCombobox', selectbackground=[('readonly', KOLPRZYCISKU)])
         self.style.map('TCombobox', selectforeground=[('readonly', BIALY)])
+        self.style.configure('Historia.Treeview', background=SZARY, fieldbackground=SZARY, foreground=BIALY)
+        self.style.configure('Historia.Treeview.Heading', background=KOLPRZYCISKU, foreground=BIALY,
+                             font=("Arial", 10, "bold"))
 
         self.ekran_logowania()
 
+    def inicjalizuj(self, init, on_ready=None):
+        """
+        Przygotowuje bazę danych w tle, gdy okno logowania jest już widoczne.
+        Logowanie lub rejestracja zlecone w tym czasie są wykonywane po zakończeniu.
+
+        Args:
+            init: Funkcja inicjalizująca bazę (np. database.init_db).
+            on_ready: Funkcja wywoływana w wątku Tk po zakończeniu inicjalizacji.
+        """
+        self.baza_gotowa = False
+
+        def gotowe(result):
+            self.baza_gotowa = True
+            akcja, self.po_inicjalizacji = self.po_inicjalizacji, None
+            if akcja is not None:
+                akcja()
+            if on_ready is not None:
+                on_ready()
+
+        self.executor.submit(init, on_done=gotowe)
+
+    def czekaj_na_baze(self, akcja):
+        """
+        Jeśli baza nie jest jeszcze gotowa, odkłada akcję do jej przygotowania.
+
+        Args:
+            akcja: Metoda do wywołania po inicjalizacji bazy.
+
+        Returns:
+            bool: True, jeśli akcja została odłożona.
+        """
+        if self.baza_gotowa:
+            return False
+        self.status_label.config(text="Przygotowywanie bazy danych...")
+        self.po_inicjalizacji = akcja
+        return True
+
+    @timed("gui.ekran_logowania")
     def ekran_logowania(self):
         """
-        Tworzy i wyświetla ekran logowania z polami na nazwę użytkownika i hasło.
+        Wyświetla ekran logowania z polami na nazwę użytkownika i hasło.
         """
-        self.reset_okienka()
-        frame = tk.Frame(self.root, bg=SZARY)
-        frame.pack(expand=True, pady=50)
+        self.pokaz_ekran("logowanie", self.zbuduj_logowanie, expand=True, pady=50)
+        self.password_entry.delete(0, tk.END)
+        self.status_label.config(text="")
 
+    def zbuduj_logowanie(self, frame):
+        """
+        Tworzy widżety ekranu logowania (jednorazowo).
+
+        Args:
+            frame: Ramka ekranu.
+        """
         tk.Label(frame, text="Nazwa użytkownika:", bg=SZARY, fg=BIALY, font=("Arial", 12)).pack(pady=(0, 5))
         self.username_entry = tk.Entry(frame, bg=SZARY, fg=BIALY, insertbackground=BIALY)
         self.username_entry.pack(pady=(0, 15))
@@ -73,56 +157,67 @@ class HangmanApp:
                                  bg=KOLPRZYCISKU, fg=BIALY, activebackground=SZARY, activeforeground=BIALY)
         register_btn.pack(side=tk.LEFT, padx=10)
 
-    def encrypt(self, password):
-        """
-        Szyfruje hasło użytkownika za pomocą algorytmu SHA-256.
-
-        Args:
-            password: Hasło w formie tekstowej.
-
-        Returns:
-            str: Zaszyfrowane hasło w postaci heksadecymalnej.
-        """
-        return hashlib.sha256(password.encode()).hexdigest()
+        self.status_label = tk.Label(frame, text="", bg=SZARY, fg=BIALY, font=("Arial", 10))
+        self.status_label.pack(pady=5)
 
     def login(self):
         """
         Obsługuje proces logowania użytkownika.
 
-        Weryfikuje dane logowania z bazą danych i przechodzi do wyboru trybu gry,
-        jeśli dane są poprawne. W przeciwnym razie wyświetla komunikat o błędzie.
+        Weryfikuje w tle dane logowania (moduł auth, lokalnie lub na serwerze gry)
+        i przechodzi do wyboru trybu gry, jeśli dane są poprawne. W przeciwnym razie wyświetla komunikat o błędzie.
+        Jeśli użytkownik ma niedokończoną grę (np. po awarii), jest ona od razu wznawiana.
         """
+        if self.czekaj_na_baze(self.login):
+            return
         username = self.username_entry.get()
-        password = self.encrypt(self.password_entry.get())
-        conn = sqlite3.connect(DB_NAME)
-        cursor = conn.cursor()
-        cursor.execute("SELECT id FROM users WHERE username=? AND password=?", (username, password))
-        user = cursor.fetchone()
-        conn.close()
-        if user:
-            self.user_id = user[0]
-            self.wybierz_tryb()
-        else:
-            messagebox.showerror("Błąd", "Nieprawidłowe dane logowania")
+        password = self.password_entry.get()
+        self.status_label.config(text="Logowanie...")
+
+        def zaloguj():
+            user_id = self.api.login(username, password)
+            if user_id is None:
+                return None, None, None
+            progress = self.api.get_progress(user_id)
+            alphabet = self.api.get_alphabet(progress["category"]) if progress is not None else None
+            return user_id, progress, alphabet
+
+        def zalogowano(wynik):
+            user_id, progress, alphabet = wynik
+            self.status_label.config(text="")
+            if user_id is None:
+                messagebox.showerror("Błąd", "Nieprawidłowe dane logowania")
+                return
+            self.user_id = user_id
+            if progress is not None:
+                self.wznow_gre(progress, alphabet)
+            else:
+                self.wybierz_tryb()
+
+        self.w_tle(zaloguj, on_done=zalogowano)
 
     def register(self):
         """
         Obsługuje proces rejestracji nowego użytkownika.
 
-        Tworzy nowego użytkownika w bazie danych, jeśli nazwa użytkownika nie jest zajęta.
+        Tworzy w tle nowego użytkownika z solonym skrótem hasła (moduł auth),
+        jeśli nazwa użytkownika nie jest zajęta.
         W przeciwnym razie wyświetla komunikat o błędzie.
         """
+        if self.czekaj_na_baze(self.register):
+            return
         username = self.username_entry.get()
-        password = self.encrypt(self.password_entry.get())
-        conn = sqlite3.connect(DB_NAME)
-        cursor = conn.cursor()
-        try:
-            cursor.execute("INSERT INTO users (username, password) VALUES (?, ?)", (username, password))
-            conn.commit()
-            messagebox.showinfo("Sukces", "Rejestracja zakończona pomyślnie")
-        except sqlite3.IntegrityError:
-            messagebox.showerror("Błąd", "Nazwa użytkownika już istnieje")
-        conn.close()
+        password = self.password_entry.get()
+        self.status_label.config(text="Rejestracja...")
+
+        def zarejestrowano(added):
+            self.status_label.config(text="")
+            if added:
+                messagebox.showinfo("Sukces", "Rejestracja zakończona pomyślnie")
+            else:
+                messagebox.showerror("Błąd", "Nazwa użytkownika już istnieje")
+
+        self.w_tle(self.api.register, username, password, on_done=zarejestrowano)
 
     def wybierz_tryb(self):
         """
@@ -130,11 +225,15 @@ class HangmanApp:
 
         Pozwala użytkownikowi wybrać między trybem klasycznym a "Uratuj wisielca".
         """
-        self.reset_okienka()
+        self.pokaz_ekran("tryb", self.zbuduj_tryb, fill=tk.BOTH, expand=True, pady=40)
 
-        frame = tk.Frame(self.root, bg=SZARY)
-        frame.pack(fill=tk.BOTH, expand=True, pady=40)
+    def zbuduj_tryb(self, frame):
+        """
+        Tworzy widżety ekranu wyboru trybu gry (jednorazowo).
 
+        Args:
+            frame: Ramka ekranu.
+        """
         tk.Label(frame, text="Wybierz tryb gry", font=("Arial", 18, "bold"),
                  bg=SZARY, fg=BIALY).pack(pady=20)
 
@@ -169,34 +268,51 @@ class HangmanApp:
         self.game_mode = mode
         self.wybierz_kategorie()
 
+    @timed("gui.wybierz_kategorie")
     def wybierz_kategorie(self):
         """
         Wyświetla ekran wyboru kategorii słów.
 
         Pozwala użytkownikowi wybrać kategorię słów do odgadywania
-        z dostępnych kategorii w bazie danych.
+        z dostępnych kategorii w bazie danych. Kategorie są trzymane w pamięci,
+        a z bazy (w tle) wczytywane tylko za pierwszym razem.
         """
-        self.reset_okienka()
-
-        frame = tk.Frame(self.root, bg=SZARY)
-        frame.pack(pady=20)
+        self.pokaz_ekran("kategorie", self.zbuduj_kategorie, pady=20)
+        self.maraton = None
 
         mode_text = "Klasyczny Wisielec" if self.game_mode == "classic" else "Uratuj wisielca"
-        tk.Label(frame, text=f"Tryb gry: {mode_text}",
-                 font=("Arial", 12), bg=SZARY, fg=BIALY).pack()
+        self.mode_label.config(text=f"Tryb gry: {mode_text}")
+        self.error_label.pack_forget()
+
+        def wczytano(categories):
+            self.category_dropdown.config(values=categories, state="readonly")
+
+        categories = self.api.cached_categories()
+        if categories is not None:
+            wczytano(categories)
+        else:
+            self.category_dropdown.config(state="disabled")
+            self.w_tle(self.api.get_categories, on_done=wczytano)
+
+    def zbuduj_kategorie(self, frame):
+        """
+        Tworzy widżety ekranu wyboru kategorii (jednorazowo).
+
+        Args:
+            frame: Ramka ekranu.
+        """
+        self.mode_label = tk.Label(frame, font=("Arial", 12), bg=SZARY, fg=BIALY)
+        self.mode_label.pack()
         tk.Label(frame, text="Wybierz kategorię:",
                  font=("Arial", 14), bg=SZARY, fg=BIALY).pack(pady=10)
 
-        categories = get_categories()
-
         self.category_var = tk.StringVar(value="")
-        category_dropdown = ttk.Combobox(frame, textvariable=self.category_var, values=categories,
-                                         state="readonly", width=30)
-        category_dropdown.pack(pady=5)
+        self.category_dropdown = ttk.Combobox(frame, textvariable=self.category_var, values=[],
+                                              state="disabled", width=30)
+        self.category_dropdown.pack(pady=5)
 
         self.error_label = tk.Label(frame, text="Wybierz kategorię, aby rozpocząć grę!",
                                     fg=CZERWONY, bg=SZARY, font=("Arial", 10))
-        self.error_label.pack_forget()
 
         btn_frame = tk.Frame(frame, bg=SZARY)
         btn_frame.pack(pady=10)
@@ -209,66 +325,227 @@ class HangmanApp:
                   bg=KOLPRZYCISKU, fg=BIALY, activebackground=SZARY,
                   activeforeground=BIALY).pack(side=tk.LEFT, padx=10)
 
+        tk.Button(frame, text="Maraton (gra ciągła)", command=self.start_maratonu,
+                  bg=KOLPRZYCISKU, fg=BIALY, activebackground=SZARY,
+                  activeforeground=BIALY).pack(pady=(10, 0))
+
+        tk.Button(frame, text="Ranking graczy", command=self.ranking,
+                  bg=KOLPRZYCISKU, fg=BIALY, activebackground=SZARY,
+                  activeforeground=BIALY).pack(pady=(10, 0))
+
         tk.Button(frame, text="Zmień tryb gry", command=self.wybierz_tryb,
                   bg=KOLPRZYCISKU, fg=BIALY, activebackground=SZARY,
                   activeforeground=BIALY).pack(pady=10)
 
+    @timed("gui.start_game")
     def start_game(self):
         """
         Rozpoczyna nową grę w wisielca po wybraniu kategorii.
 
-        Inicjalizuje interfejs gry, losuje słowo z wybranej kategorii
-        i przygotowuje planszę do odgadywania oraz wirtualną klawiaturę.
+        Losuje w tle słowo z wybranej kategorii, a po jego otrzymaniu
+        przygotowuje planszę do odgadywania oraz wirtualną klawiaturę.
         Jeśli kategoria nie została wybrana, wyświetla komunikat o błędzie.
         """
         selected_category = self.category_var.get() if hasattr(self, 'category_var') else None
 
         if not selected_category:
+            self.error_label.config(text="Wybierz kategorię, aby rozpocząć grę!", fg=CZERWONY)
             self.error_label.pack(pady=5)
             return
 
-        self.reset_okienka()
-        self.word = get_random_word(selected_category)
-        self.guessed = ["_"] * len(self.word)
-        self.mistakes = 0
-        self.used_letters = set()
+        self.error_label.config(text="Losowanie słowa...", fg=BIALY)
+        self.error_label.pack(pady=5)
+
+        def losuj():
+            return self.api.get_random_word(selected_category), self.api.get_alphabet(selected_category)
+
+        self.w_tle(losuj, on_done=lambda wynik: self.plansza(selected_category, *wynik))
+
+    @timed("gui.start_maratonu")
+    def start_maratonu(self):
+        """
+        Rozpoczyna maraton: serię rund w wybranej kategorii bez wracania do menu.
+
+        W tle pobierane są jednym żądaniem wszystkie słowa kategorii i zakładana jest
+        sesja w bazie. Kolejne słowa są brane z kolejki w pamięci (session.WordQueue),
+        bez powtórzeń do wyczerpania kategorii, więc następna runda zaczyna się od razu.
+        """
+        selected_category = self.category_var.get() if hasattr(self, 'category_var') else None
+
+        if not selected_category:
+            self.error_label.config(text="Wybierz kategorię, aby rozpocząć grę!", fg=CZERWONY)
+            self.error_label.pack(pady=5)
+            return
+
+        self.error_label.config(text="Przygotowywanie maratonu...", fg=BIALY)
+        self.error_label.pack(pady=5)
+        mode = self.game_mode
+
+        def przygotuj():
+            words = self.api.get_words(selected_category)
+            session_id = self.api.start_session(self.user_id, selected_category, mode)
+            return Marathon(session_id, selected_category, words, self.api.get_alphabet(selected_category))
+
+        def gotowe(maraton):
+            if not maraton.queue.words:
+                self.error_label.config(text="Brak słów w tej kategorii", fg=CZERWONY)
+                return
+            self.plansza(maraton.category, maraton.queue.next(), maraton.alphabet)
+            self.maraton = maraton
+            self.marathon_label.config(text="Maraton - runda 1")
+
+        self.w_tle(przygotuj, on_done=gotowe)
+
+    @timed("gui.plansza")
+    def plansza(self, selected_category, word, alphabet=DEFAULT_ALPHABET):
+        """
+        Pokazuje planszę gry dla wylosowanego słowa.
+
+        Plansza jest budowana tylko raz; przy kolejnej rundzie resetowane są jedynie
+        przyciski liter, tekst słowa i ruchome elementy rysunku. Klawiatura jest
+        budowana raz dla każdego alfabetu kategorii i potem tylko podmieniana.
+
+        Args:
+            selected_category: Wybrana kategoria.
+            word: Słowo do odgadnięcia.
+            alphabet: Alfabet kategorii (alphabet.Alphabet).
+        """
+        self.pokaz_ekran("gra", self.zbuduj_plansze, fill=tk.BOTH, expand=True)
+        self.maraton = None
+        self.marathon_label.config(text="")
+        self.nowa_runda(selected_category, HangmanGame(word, self.max_mistakes, alphabet), alphabet)
+
+    @timed("gui.nowa_runda")
+    def nowa_runda(self, selected_category, game, alphabet=DEFAULT_ALPHABET):
+        """
+        Przygotowuje widoczną planszę do nowej rundy (bez przełączania ekranu).
+
+        Stan gry jest od tej chwili zapisywany w tle (game.start_progress i save_guess),
+        żeby po awarii można było ją wznowić. Gra wznowiona nie jest zaczynana od nowa.
+
+        Args:
+            selected_category: Wybrana kategoria.
+            game: Nowa albo wznowiona gra (HangmanGame).
+            alphabet: Alfabet kategorii (alphabet.Alphabet).
+        """
+        self.game = game
+        self.alphabet = alphabet
+        self.maska = alphabet.mask(game.used_letters)
+        self.category = selected_category
+        if not game.used_letters:
+            self.api.start_progress(self.user_id, game.word, selected_category, self.game_mode, alphabet.letters)
+        self.pokaz_klawiature(alphabet.letters)
+        for letter in game.used_letters:
+            self.letters_buttons[letter].config(state=tk.DISABLED)
+
+        self.category_label.config(text=f"Kategoria: {selected_category}")
+        self.word_label.config(text=" ".join(game.guessed))
+
+        self.animacje.cancel()
+        classic = self.game_mode == "classic"
+        self.canvas.itemconfigure("szubienica", state=tk.NORMAL if classic else tk.HIDDEN)
+        self.canvas.itemconfigure("ludzik", state=tk.HIDDEN if classic else tk.NORMAL)
+        if classic:
+            self.canvas.itemconfigure("trafienie", state=tk.HIDDEN)
+            self.wisielec(animuj=False)
+        else:
+            self.canvas.itemconfigure("czesc", state=tk.HIDDEN)
+            self.strzala(animuj=False)
+
+    def wznow_gre(self, progress, alphabet):
+        """
+        Wznawia niedokończoną grę zapisaną w bazie (patrz game.get_progress).
+
+        Args:
+            progress: Zapisany stan gry.
+            alphabet: Bieżący alfabet kategorii gry.
+        """
+        game, alphabet = restore_game(progress, alphabet, self.max_mistakes)
+        if game.finished:
+            # Awaria po ostatnim ruchu, a przed zapisem wyniku - zapisujemy go teraz.
+            self.api.finish_game(self.user_id, game.word, game.mistakes, game.won, progress["category"])
+            self.wybierz_tryb()
+            return
+        self.game_mode = progress["mode"]
+        self.pokaz_ekran("gra", self.zbuduj_plansze, fill=tk.BOTH, expand=True)
+        self.maraton = None
+        self.marathon_label.config(text="Wznowiono niedokończoną grę")
+        self.nowa_runda(progress["category"], game, alphabet)
 
-        main_frame = tk.Frame(self.root, bg=SZARY)
-        main_frame.pack(fill=tk.BOTH, expand=True)
+    def zbuduj_plansze(self, frame):
+        """
+        Tworzy widżety planszy gry (jednorazowo): płótno ze wszystkimi elementami
+        rysunku obu trybów, etykietę słowa i miejsce na klawiaturę (patrz pokaz_klawiature).
 
-        top_frame = tk.Frame(main_frame, bg=SZARY)
+        Args:
+            frame: Ramka ekranu.
+        """
+        top_frame = tk.Frame(frame, bg=SZARY)
         top_frame.pack(side=tk.TOP, fill=tk.X, expand=False, padx=10, pady=10)
 
-        tk.Label(top_frame, text=f"Kategoria: {selected_category}",
-                 font=("Arial", 12), bg=SZARY, fg=BIALY).pack(pady=(0, 10))
+        self.category_label = tk.Label(top_frame, font=("Arial", 12), bg=SZARY, fg=BIALY)
+        self.category_label.pack(pady=(0, 10))
+
+        self.marathon_label = tk.Label(top_frame, font=("Arial", 10), bg=SZARY, fg=BIALY)
+        self.marathon_label.pack()
 
         self.canvas = tk.Canvas(top_frame, width=280, height=220, bg="white")
         self.canvas.pack(pady=5)
 
-        if self.game_mode == "classic":
-            self.szubienica()
-        else:
-            self.scena_strzaly()
+        self.szubienica()
+        self.scena_strzaly()
 
-        middle_frame = tk.Frame(main_frame, bg=SZARY)
+        middle_frame = tk.Frame(frame, bg=SZARY)
         middle_frame.pack(side=tk.TOP, fill=tk.X, expand=False, padx=10)
 
-        self.word_label = tk.Label(middle_frame, text=" ".join(self.guessed),
-                                   font=("Arial", 24), bg=SZARY, fg=BIALY)
+        self.word_label = tk.Label(middle_frame, font=("Arial", 24), bg=SZARY, fg=BIALY)
         self.word_label.pack(pady=15)
 
-        bottom_frame = tk.Frame(main_frame, bg=SZARY)
+        bottom_frame = tk.Frame(frame, bg=SZARY)
         bottom_frame.pack(side=tk.BOTTOM, fill=tk.X, expand=False, padx=10, pady=10)
 
-        letters_frame = tk.Frame(bottom_frame, bg=SZARY)
-        letters_frame.pack(fill=tk.X)
+        self.letters_frame = tk.Frame(bottom_frame, bg=SZARY)
+        self.letters_frame.pack(fill=tk.X)
+        self.klawiatury = {}
+        self.klawiatura = None
 
-        self.letters_buttons = {}
-        all_letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+        tk.Button(bottom_frame, text="Powrót", command=self.wybierz_kategorie,
+                  font=("Arial", 10), bg=KOLPRZYCISKU, fg=BIALY,
+                  activebackground=SZARY, activeforeground=BIALY).pack(pady=(15, 0))
+
+    def pokaz_klawiature(self, letters):
+        """
+        Pokazuje klawiaturę z podanymi literami, budując ją przy pierwszym użyciu
+        i włączając wszystkie jej przyciski.
+
+        Args:
+            letters: Litery klawiatury (alphabet.Alphabet.letters).
+        """
+        if self.klawiatura != letters:
+            if self.klawiatura is not None:
+                self.klawiatury[self.klawiatura][0].pack_forget()
+            if letters not in self.klawiatury:
+                self.klawiatury[letters] = self.zbuduj_klawiature(letters)
+            self.klawiatury[letters][0].pack(expand=True, fill=tk.X)
+            self.klawiatura = letters
+        self.letters_buttons = self.klawiatury[letters][1]
+        for btn in self.letters_buttons.values():
+            btn.config(state=tk.NORMAL)
+
+    def zbuduj_klawiature(self, all_letters):
+        """
+        Tworzy wirtualną klawiaturę (jednorazowo dla każdego alfabetu).
+
+        Args:
+            all_letters: Litery klawiatury.
+
+        Returns:
+            tuple: Ramka klawiatury i dict {litera: przycisk}.
+        """
+        buttons = {}
         row_length = 9
 
-        keyboard_container = tk.Frame(letters_frame, bg=SZARY)
-        keyboard_container.pack(expand=True, fill=tk.X)
+        keyboard_container = tk.Frame(self.letters_frame, bg=SZARY)
 
         for row_idx in range((len(all_letters) + row_length - 1) // row_length):
             row_frame = tk.Frame(keyboard_container, bg=SZARY)
@@ -288,240 +565,406 @@ class HangmanApp:
                                 font=("Arial", 12), bg=KOLPRZYCISKU, fg=BIALY,
                                 activebackground=SZARY, activeforeground=BIALY)
                 btn.pack(side=tk.LEFT, padx=2, pady=2)
-                self.letters_buttons[letter] = btn
-
-        tk.Button(bottom_frame, text="Powrót", command=self.wybierz_kategorie,
-                  font=("Arial", 10), bg=KOLPRZYCISKU, fg=BIALY,
-                  activebackground=SZARY, activeforeground=BIALY).pack(pady=(15, 0))
+                buttons[letter] = btn
+        return keyboard_container, buttons
 
     def szubienica(self):
         """
         Rysuje szubienicę w trybie klasycznym.
 
-        Tworzy początkowy rysunek szubienicy na płótnie Canvas.
+        Tworzy rysunek szubienicy (tag "szubienica") i ukryte części wisielca (tag "czesc"),
+        które wisielec() potem tylko pokazuje i przesuwa - płótno ma zawsze te same elementy.
         """
-        self.canvas.create_line(20, 230, 180, 230, width=3)
-        self.canvas.create_line(60, 230, 60, 30, width=3)
-        self.canvas.create_line(60, 30, 130, 30, width=3)
-        self.canvas.create_line(130, 30, 130, 50, width=3)
+        self.canvas.create_line(20, 230, 180, 230, width=3, tags="szubienica")
+        self.canvas.create_line(60, 230, 60, 30, width=3, tags="szubienica")
+        self.canvas.create_line(60, 30, 130, 30, width=3, tags="szubienica")
+        self.canvas.create_line(130, 30, 130, 50, width=3, tags="szubienica")
+        create = {"oval": self.canvas.create_oval, "line": self.canvas.create_line}
+        self.czesci = [create[kind](*coords, width=2, state=tk.HIDDEN, tags="czesc")
+                       for kind, coords in CZESCI_WISIELCA]
 
-    def wisielec(self):
+    def wisielec(self, animuj=True):
         """
         Rysuje elementy ciała wisielca w zależności od liczby popełnionych błędów.
 
-        Dodaje kolejne części ciała postaci wisielca na szubienicy po każdym błędzie.
-        """
-        if self.mistakes >= 1:
-            self.canvas.create_oval(115, 50, 145, 80, width=2)
-        if self.mistakes >= 2:
-            self.canvas.create_line(130, 80, 130, 150, width=2)
-        if self.mistakes >= 3:
-            self.canvas.create_line(130, 90, 100, 120, width=2)
-        if self.mistakes >= 4:
-            self.canvas.create_line(130, 90, 160, 120, width=2)
-        if self.mistakes >= 5:
-            self.canvas.create_line(130, 150, 100, 200, width=2)
-        if self.mistakes >= 6:
-            self.canvas.create_line(130, 150, 160, 200, width=2)
+        Pokazuje części ciała do bieżącej liczby błędów, a pozostałe ukrywa. Ostatnia
+        część jest (przy animuj=True) rysowana stopniowo: linia rośnie od punktu
+        zaczepienia, a głowa od środka.
+
+        Args:
+            animuj: Czy animować ostatnią część (False - od razu stan końcowy, np. na początku rundy).
+        """
+        self.animacje.finish("wisielec")
+        mistakes = min(self.game.mistakes, len(self.czesci))
+        for i, item in enumerate(self.czesci):
+            if i < mistakes:
+                self.canvas.coords(item, *CZESCI_WISIELCA[i][1])
+            self.canvas.itemconfigure(item, state=tk.NORMAL if i < mistakes else tk.HIDDEN)
+        if mistakes == 0 or not animuj:
+            return
+
+        item = self.czesci[mistakes - 1]
+        kind, (x0, y0, x1, y1) = CZESCI_WISIELCA[mistakes - 1]
+        if kind == "oval":
+            cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+
+            def krok(progress):
+                scale = ease_out(progress)
+                self.canvas.coords(item, cx + (x0 - cx) * scale, cy + (y0 - cy) * scale,
+                                   cx + (x1 - cx) * scale, cy + (y1 - cy) * scale)
+        else:
+            def krok(progress):
+                scale = ease_out(progress)
+                self.canvas.coords(item, x0, y0, x0 + (x1 - x0) * scale, y0 + (y1 - y0) * scale)
+
+        self.animacje.animate("wisielec", krok, CZAS_ANIMACJI)
 
     def scena_strzaly(self):
         """
         Rysuje scenę w trybie "Uratuj wisielca".
 
-        Tworzy postać ludzika oraz ustawia początkową pozycję strzały.
+        Tworzy postać ludzika (tag "ludzik"), strzałę (tagi "ludzik" i "strzala")
+        oraz ukryte trafienie i napis końca gry (tag "trafienie"). Strzała jest
+        potem tylko przesuwana przez strzala().
         """
+        self.canvas.create_oval(130, 50, 170, 90, width=2, tags="ludzik")
+        self.canvas.create_line(150, 90, 150, 160, width=2, tags="ludzik")
+        self.canvas.create_line(150, 110, 130, 140, width=2, tags="ludzik")
+        self.canvas.create_line(150, 110, 170, 140, width=2, tags="ludzik")
+        self.canvas.create_line(150, 160, 130, 200, width=2, tags="ludzik")
+        self.canvas.create_line(150, 160, 170, 200, width=2, tags="ludzik")
 
-        self.canvas.create_oval(130, 50, 170, 90, width=2)
-        self.canvas.create_line(150, 90, 150, 160, width=2)
-        self.canvas.create_line(150, 110, 130, 140, width=2)
-        self.canvas.create_line(150, 110, 170, 140, width=2)
-        self.canvas.create_line(150, 160, 130, 200, width=2)
-        self.canvas.create_line(150, 160, 170, 200, width=2)
-
-        self.arrow_x = 20
-        self.arrow_y = 125
-        self.strzala()
+        x = STRZALA_START
+        self.canvas.create_line(x, 125, x + 30, 125, width=2, tags=("ludzik", "strzala"))
+        self.canvas.create_line(x + 25, 120, x + 30, 125, width=2, tags=("ludzik", "strzala"))
+        self.canvas.create_line(x + 25, 130, x + 30, 125, width=2, tags=("ludzik", "strzala"))
+        self.strzala_x = x
+        self.canvas.create_line(150, 125, 170, 125, width=3, fill="red", state=tk.HIDDEN, tags="trafienie")
+        self.canvas.create_text(150, 190, text="KONIEC GRY!", fill="red", font=("Arial", 14, "bold"),
+                                state=tk.HIDDEN, tags="trafienie")
 
-    def strzala(self):
+    def strzala(self, animuj=True):
         """
         Rysuje strzałę w trybie "Uratuj wisielca".
 
         Aktualizuje pozycję strzały w zależności od liczby popełnionych błędów.
-        Im więcej błędów, tym bliżej ludzika znajduje się strzała.
-        """
-        self.canvas.delete("arrow")
-
-        arrow_position = 20 + (self.mistakes * 20)
-
-        self.canvas.create_line(arrow_position, 125, arrow_position + 30, 125, width=2, tags="arrow")
-        self.canvas.create_line(arrow_position + 25, 120, arrow_position + 30, 125, width=2, tags="arrow")
-        self.canvas.create_line(arrow_position + 25, 130, arrow_position + 30, 125, width=2, tags="arrow")
-
-        if self.mistakes == 0:
-            self.canvas.create_line(120, 125, 120, 125, width=1, tags="arrow")
-
-        if self.mistakes >= 4:
-            self.canvas.itemconfig("arrow", fill="red")
-
-        if self.mistakes >= self.max_mistakes:
-            self.canvas.create_line(150, 125, 170, 125, width=3, fill="red", tags="arrow")
-            self.canvas.create_text(150, 190, text="KONIEC GRY!", fill="red", font=("Arial", 14, "bold"), tags="arrow")
+        Im więcej błędów, tym bliżej ludzika znajduje się strzała. Strzała jest
+        przesuwana (canvas.move) płynnie do nowej pozycji, a trafienie pokazywane
+        po dotarciu strzały do ludzika.
 
+        Args:
+            animuj: Czy animować ruch strzały (False - od razu stan końcowy, np. na początku rundy).
+        """
+        self.animacje.finish("strzala")
+        start = self.strzala_x
+        target = STRZALA_START + self.game.mistakes * STRZALA_KROK
+        hit = self.game.mistakes >= self.max_mistakes
+        self.canvas.itemconfigure("strzala", fill="red" if self.game.mistakes >= 4 else "black")
+        if not hit:
+            self.canvas.itemconfigure("trafienie", state=tk.HIDDEN)
+
+        def krok(progress):
+            x = start + (target - start) * ease_out(progress)
+            self.canvas.move("strzala", x - self.strzala_x, 0)
+            self.strzala_x = x
+            if progress >= 1.0 and hit:
+                self.canvas.itemconfigure("trafienie", state=tk.NORMAL)
+
+        self.animacje.animate("strzala", krok, CZAS_ANIMACJI if animuj else 0)
+
+    @timed("gui.zgadnij_litere")
     def zgadnij_litere(self, letter):
         """
         Obsługuje naciśnięcie przycisku z literą podczas gry.
 
-        Sprawdza, czy wybrana litera występuje w haśle do odgadywania.
+        Przekazuje literę do silnika gry (HangmanGame).
         Aktualizuje stan gry, rysunki i sprawdza warunki końcowe (wygrana/przegrana).
 
         Args:
             letter: Wybrana litera.
         """
-        if letter in self.used_letters:
+        result = self.game.guess(letter)
+        if result is None:
             return
 
-        self.used_letters.add(letter)
         self.letters_buttons[letter].config(state=tk.DISABLED)
+        self.maska |= self.alphabet.bits[letter]
+        self.api.save_guess(self.user_id, len(self.game.used_letters), letter, self.maska)
 
-        if letter in self.word:
-            for i, l in enumerate(self.word):
-                if l == letter:
-                    self.guessed[i] = letter
-            self.word_label.config(text=" ".join(self.guessed))
+        if result:
+            self.word_label.config(text=" ".join(self.game.guessed))
 
-            if "_" not in self.guessed:
-                save_game(self.user_id, self.word, self.mistakes, True)
+            if self.game.won:
+                self.api.finish_game(self.user_id, self.game.word, self.game.mistakes, True, self.category)
+                if self.maraton is not None:
+                    self.nastepna_runda()
+                    return
                 messagebox.showinfo("Wygrana", "Odgadłeś słowo!")
                 self.wybierz_kategorie()
         else:
-            self.mistakes += 1
-
             if self.game_mode == "classic":
                 self.wisielec()
             else:
                 self.strzala()
 
-            if self.mistakes >= self.max_mistakes:
-                save_game(self.user_id, self.word, self.mistakes, False)
-                messagebox.showinfo("Przegrana", f"Przegrałeś! Słowo to: {self.word}")
+            if self.game.lost:
+                self.api.finish_game(self.user_id, self.game.word, self.game.mistakes, False, self.category)
+                if self.maraton is not None:
+                    self.nastepna_runda()
+                    return
+                messagebox.showinfo("Przegrana", f"Przegrałeś! Słowo to: {self.game.word}")
                 self.wybierz_kategorie()
 
+    def nastepna_runda(self):
+        """
+        Kończy rundę maratonu: dolicza jej wynik do sesji, zapisuje podsumowanie sesji
+        w tle i od razu rozpoczyna kolejną rundę słowem z kolejki (bez okna komunikatu).
+        """
+        maraton = self.maraton
+        won = self.game.won
+        maraton.record(won, self.game.mistakes)
+        summary = maraton.summary()
+        self.executor.submit(self.api.update_session, self.user_id, maraton.session_id, summary["rounds"],
+                             summary["wins"], summary["mistakes"], summary["best_streak"])
+
+        result = "wygrana" if won else "przegrana"
+        self.marathon_label.config(text=f"Maraton - runda {maraton.rounds + 1}   "
+                                        f"wygrane: {maraton.wins}/{maraton.rounds}   seria: {maraton.streak}\n"
+                                        f"Poprzednie słowo: {self.game.word} ({result})")
+        self.nowa_runda(maraton.category, HangmanGame(maraton.queue.next(), self.max_mistakes, maraton.alphabet),
+                        maraton.alphabet)
+
+    @timed("gui.statystyki")
     def statystyki(self):
         """
         Wyświetla statystyki użytkownika.
 
         Pokazuje informacje o rozegranych grach, wygranych, procentowym wskaźniku
         zwycięstw oraz szczegółową historię gier z możliwością przewijania.
+        Historia jest wyświetlana w tabeli ttk.Treeview i doczytywana stronami.
         """
-        self.reset_okienka()
-
-        stats_frame = tk.Frame(self.root, bg=SZARY)
-        stats_frame.pack(fill=tk.BOTH, expand=True, padx=15, pady=15)
+        self.pokaz_ekran("statystyki", self.zbuduj_statystyki, fill=tk.BOTH, expand=True, padx=15, pady=15)
+        self.summary_label.config(text="Ładowanie...")
+        self.history_tree.delete(*self.history_tree.get_children())
 
-        tk.Label(stats_frame, text="Twoje statystyki gry",
-                 font=("Arial", 16, "bold"), bg=SZARY, fg=BIALY).pack(pady=10)
-
-        conn = sqlite3.connect(DB_NAME)
-        cursor = conn.cursor()
+        def wczytano(stats):
+            self.summary_label.config(text=f"Łącznie gier: {stats['games']}\n"
+                                           f"Wygranych: {stats['wins']}\n"
+                                           f"Procent wygranych: {stats['win_percentage']:.1f}%\n"
+                                           f"Średnia błędów: {stats['avg_mistakes']:.1f}")
 
-        cursor.execute("SELECT COUNT(*) FROM games WHERE user_id=?", (self.user_id,))
-        total_games = cursor.fetchone()[0]
+        self.w_tle(self.api.get_user_stats, self.user_id, on_done=wczytano)
 
-        cursor.execute("SELECT COUNT(*) FROM games WHERE user_id=? AND won=1", (self.user_id,))
-        total_wins = cursor.fetchone()[0]
+        self.history_last_id = None
+        self.history_done = False
+        self.history_loading = False
+        self.wczytaj_historie()
 
-        cursor.execute("SELECT AVG(mistakes) FROM games WHERE user_id=?", (self.user_id,))
-        avg_mistakes = cursor.fetchone()[0]
+    def zbuduj_statystyki(self, frame):
+        """
+        Tworzy widżety ekranu statystyk (jednorazowo).
 
-        win_percentage = (total_wins / total_games * 100) if total_games > 0 else 0
+        Args:
+            frame: Ramka ekranu.
+        """
+        tk.Label(frame, text="Twoje statystyki gry",
+                 font=("Arial", 16, "bold"), bg=SZARY, fg=BIALY).pack(pady=10)
 
-        summary_frame = tk.Frame(stats_frame, bg=SZARY)
+        summary_frame = tk.Frame(frame, bg=SZARY)
         summary_frame.pack(pady=5, fill=tk.X)
 
-        tk.Label(summary_frame, text=f"Łącznie gier: {total_games}",
-                 font=("Arial", 11), bg=SZARY, fg=BIALY).pack(anchor="w")
-        tk.Label(summary_frame, text=f"Wygranych: {total_wins}",
-                 font=("Arial", 11), bg=SZARY, fg=BIALY).pack(anchor="w")
-        tk.Label(summary_frame, text=f"Procent wygranych: {win_percentage:.1f}%",
-                 font=("Arial", 11), bg=SZARY, fg=BIALY).pack(anchor="w")
-        tk.Label(summary_frame, text=f"Średnia błędów: {avg_mistakes:.1f}" if avg_mistakes else "Średnia błędów: 0.0",
-                 font=("Arial", 11), bg=SZARY, fg=BIALY).pack(anchor="w")
+        self.summary_label = tk.Label(summary_frame, justify=tk.LEFT,
+                                      font=("Arial", 11), bg=SZARY, fg=BIALY)
+        self.summary_label.pack(anchor="w")
 
-        tk.Label(stats_frame, text="Ostatnie gry:",
+        tk.Label(frame, text="Ostatnie gry:",
                  font=("Arial", 14), bg=SZARY, fg=BIALY).pack(pady=(10, 5))
 
-        col_widths = [10, 5, 8]
+        table_frame = tk.Frame(frame, bg=SZARY)
+        table_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
 
-        table_container = tk.Frame(stats_frame, bg=SZARY)
-        table_container.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.history_tree = ttk.Treeview(table_frame, columns=("word", "mistakes", "result"),
+                                         show="headings", style="Historia.Treeview")
+        for column, header, width in (("word", "Słowo", 140), ("mistakes", "Błędy", 60),
+                                      ("result", "Wynik", 100)):
+            self.history_tree.heading(column, text=header)
+            self.history_tree.column(column, width=width, anchor="center")
+        self.history_tree.tag_configure("won", foreground="lightgreen")
+        self.history_tree.tag_configure("lost", foreground=CZERWONY)
 
-        headers_frame = tk.Frame(table_container, bg=SZARY)
-        headers_frame.pack(fill=tk.X)
+        scrollbar = tk.Scrollbar(table_frame, orient="vertical", command=self.history_tree.yview)
 
-        headers = ["Słowo", "Błędy", "Wynik"]
-        for i, header in enumerate(headers):
-            tk.Label(headers_frame, text=header, font=("Arial", 10, "bold"),
-                     width=col_widths[i], borderwidth=1, relief="solid",
-                     bg=KOLPRZYCISKU, fg=BIALY).grid(row=0, column=i, padx=1)
+        def przewijanie(first, last):
+            scrollbar.set(first, last)
+            if float(last) >= HISTORY_PRELOAD:
+                self.wczytaj_historie()
 
-        canvas_frame = tk.Frame(table_container, bg=SZARY)
-        canvas_frame.pack(fill=tk.BOTH, expand=True)
+        self.history_tree.configure(yscrollcommand=przewijanie)
+        scrollbar.pack(side="right", fill="y")
+        self.history_tree.pack(side="left", fill="both", expand=True)
 
-        canvas = tk.Canvas(canvas_frame, borderwidth=0, highlightthickness=0,
-                           bg=SZARY)
-        scrollbar = tk.Scrollbar(canvas_frame, orient="vertical", command=canvas.yview)
+        tk.Button(frame, text="Powrót do kategorii", command=self.wybierz_kategorie,
+                  bg=KOLPRZYCISKU, fg=BIALY, activebackground=SZARY,
+                  activeforeground=BIALY).pack(pady=10)
 
-        data_frame = tk.Frame(canvas, bg=SZARY)
+    def wczytaj_historie(self):
+        """
+        Dołącza do tabeli historii kolejną stronę gier użytkownika.
 
-        scrollbar.pack(side="right", fill="y")
-        canvas.pack(side="left", fill="both", expand=True)
-        canvas.configure(yscrollcommand=scrollbar.set)
+        Strony są pobierane stronicowaniem po kluczu (id ostatniej wczytanej gry),
+        dopiero gdy użytkownik przewinie tabelę blisko jej końca. Zapytanie wykonuje się w tle.
+        """
+        if self.history_done or self.history_loading:
+            return
+        self.history_loading = True
 
-        canvas_window = canvas.create_window((0, 0), window=data_frame, anchor="nw", tags="data_frame")
+        def wczytano(page):
+            self.history_loading = False
+            if len(page) < HISTORY_PAGE_SIZE:
+                self.history_done = True
+            for game_id, word, mistakes, won in page:
+                self.history_tree.insert("", tk.END, values=(word, mistakes, "Wygrana" if won else "Przegrana"),
+                                         tags=("won" if won else "lost",))
+                self.history_last_id = game_id
 
-        def config_canvas(event):
-            canvas.itemconfig("data_frame", width=canvas.winfo_width())
+        self.w_tle(self.api.get_game_history, self.user_id, self.history_last_id, HISTORY_PAGE_SIZE,
+                   on_done=wczytano)
 
-        canvas.bind("<Configure>", config_canvas)
+    @timed("gui.ranking")
+    def ranking(self):
+        """
+        Wyświetla ranking graczy: czołówkę (łączną albo wybranej kategorii)
+        i miejsce zalogowanego użytkownika.
 
-        def scroll_config(event):
-            canvas.configure(scrollregion=canvas.bbox("all"))
+        Ranking jest czytany z przeliczanej na bieżąco tabeli, więc otwarcie ekranu
+        to dwa krótkie zapytania wykonywane w tle.
+        """
+        self.pokaz_ekran("ranking", self.zbuduj_ranking, fill=tk.BOTH, expand=True, padx=15, pady=15)
+        categories = self.api.cached_categories() or []
+        self.ranking_dropdown.config(values=[WSZYSTKIE_KATEGORIE] + categories)
+        if self.ranking_var.get() not in categories:
+            self.ranking_var.set(WSZYSTKIE_KATEGORIE)
+        self.wczytaj_ranking()
 
-        data_frame.bind("<Configure>", scroll_config)
+    def zbuduj_ranking(self, frame):
+        """
+        Tworzy widżety ekranu rankingu (jednorazowo).
 
-        cursor.execute("""
-            SELECT word, mistakes, won FROM games
-            WHERE user_id=?
-            ORDER BY id DESC
-        """, (self.user_id,))
-        games = cursor.fetchall()
+        Args:
+            frame: Ramka ekranu.
+        """
+        tk.Label(frame, text="Ranking graczy",
+                 font=("Arial", 16, "bold"), bg=SZARY, fg=BIALY).pack(pady=10)
 
-        for i, game in enumerate(games):
-            word, mistakes, won = game
-            tk.Label(data_frame, text=word, width=col_widths[0], borderwidth=1, relief="solid",
-                     bg=SZARY, fg=BIALY).grid(row=i, column=0, padx=1, pady=1)
-            tk.Label(data_frame, text=str(mistakes), width=col_widths[1], borderwidth=1, relief="solid",
-                     bg=SZARY, fg=BIALY).grid(row=i, column=1, padx=1, pady=1)
-            tk.Label(data_frame, text="Wygrana" if won else "Przegrana", width=col_widths[2],
-                     borderwidth=1, relief="solid", bg=SZARY,
-                     fg="lightgreen" if won else CZERWONY).grid(row=i, column=2, padx=1, pady=1)
+        self.ranking_var = tk.StringVar(value=WSZYSTKIE_KATEGORIE)
+        self.ranking_dropdown = ttk.Combobox(frame, textvariable=self.ranking_var, values=[],
+                                             state="readonly", width=30)
+        self.ranking_dropdown.bind("<<ComboboxSelected>>", lambda event: self.wczytaj_ranking())
+        self.ranking_dropdown.pack(pady=5)
 
-        conn.close()
+        self.rank_label = tk.Label(frame, font=("Arial", 11), bg=SZARY, fg=BIALY)
+        self.rank_label.pack(pady=5)
 
-        def scroll(event):
-            canvas.yview_scroll(int(-1*(event.delta/120)), "units")
+        table_frame = tk.Frame(frame, bg=SZARY)
+        table_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
 
-        canvas.bind_all("<MouseWheel>", scroll)
+        self.ranking_tree = ttk.Treeview(table_frame, columns=("place", "user", "wins", "percent", "mistakes"),
+                                         show="headings", style="Historia.Treeview")
+        for column, header, width in (("place", "#", 35), ("user", "Gracz", 110), ("wins", "Wygrane", 65),
+                                      ("percent", "% wygranych", 80), ("mistakes", "Śr. błędów", 70)):
+            self.ranking_tree.heading(column, text=header)
+            self.ranking_tree.column(column, width=width, anchor="center")
+        self.ranking_tree.tag_configure("me", foreground="lightgreen")
+        self.ranking_tree.pack(side="left", fill="both", expand=True)
 
-        tk.Button(stats_frame, text="Powrót do kategorii", command=self.wybierz_kategorie,
+        tk.Button(frame, text="Powrót do kategorii", command=self.wybierz_kategorie,
                   bg=KOLPRZYCISKU, fg=BIALY, activebackground=SZARY,
                   activeforeground=BIALY).pack(pady=10)
 
+    def wczytaj_ranking(self):
+        """
+        Wczytuje w tle czołówkę rankingu wybranej kategorii i miejsce użytkownika.
+        """
+        wybrana = self.ranking_var.get()
+        category = None if wybrana == WSZYSTKIE_KATEGORIE else wybrana
+        self.rank_label.config(text="Ładowanie...")
+        self.ranking_tree.delete(*self.ranking_tree.get_children())
+
+        def wczytano_miejsce(rank):
+            if self.ranking_var.get() != wybrana:
+                return
+            if rank is None:
+                self.rank_label.config(text="Nie masz jeszcze gier w tym rankingu")
+                return
+            self.rank_label.config(text=f"Twoje miejsce: {rank['rank']} "
+                                        f"(wygranych: {rank['wins']}, {rank['win_percentage']:.1f}%)")
+            for item in self.ranking_tree.get_children():
+                if self.ranking_tree.set(item, "place") == str(rank["rank"]):
+                    self.ranking_tree.item(item, tags=("me",))
+
+        def wczytano(rows):
+            if self.ranking_var.get() != wybrana:
+                return
+            for place, username, games, wins, win_percentage, avg_mistakes in rows:
+                self.ranking_tree.insert("", tk.END, values=(place, username, wins, f"{win_percentage:.1f}%",
+                                                             f"{avg_mistakes:.1f}"))
+            self.w_tle(self.api.get_rank, self.user_id, category, on_done=wczytano_miejsce)
+
+        self.w_tle(self.api.get_leaderboard, category, LEADERBOARD_SIZE, on_done=wczytano)
+
+    def w_tle(self, fn, *args, on_done=None):
+        """
+        Wykonuje funkcję (zapytanie do bazy) w tle, nie blokując okna.
+
+        Wynik jest przekazywany do on_done w wątku Tk, ale tylko wtedy,
+        gdy w międzyczasie nie zmieniono ekranu.
+
+        Args:
+            fn: Funkcja do wykonania w tle.
+            *args: Argumenty funkcji.
+            on_done: Funkcja wywoływana z wynikiem.
+        """
+        ekran = self.ekran_nr
+
+        def gotowe(result):
+            if ekran == self.ekran_nr and on_done is not None:
+                on_done(result)
+
+        self.executor.submit(fn, *args, on_done=gotowe)
+
+    def pokaz_ekran(self, nazwa, budowanie, **pack_options):
+        """
+        Pokazuje ekran o podanej nazwie, budując go przy pierwszym użyciu.
+
+        Zbudowane ekrany są przechowywane i przy kolejnych wyświetleniach
+        tylko ponownie pakowane, zamiast tworzyć wszystkie widżety od nowa.
+
+        Args:
+            nazwa: Nazwa ekranu.
+            budowanie: Metoda tworząca widżety ekranu w podanej ramce.
+            **pack_options: Opcje pack() dla ramki ekranu.
+
+        Returns:
+            tk.Frame: Ramka ekranu.
+        """
+        self.reset_okienka()
+        frame = self.ekrany.get(nazwa)
+        if frame is None:
+            frame = tk.Frame(self.root, bg=SZARY)
+            budowanie(frame)
+            self.ekrany[nazwa] = frame
+        frame.pack(**pack_options)
+        self.aktualny_ekran = frame
+        return frame
+
     def reset_okienka(self):
         """
-        Czyści wszystkie widżety z głównego okna aplikacji.
+        Ukrywa bieżący ekran w głównym oknie aplikacji.
 
         Służy do przygotowania ekranu na wyświetlenie nowego widoku.
+        Wyniki zapytań zleconych dla poprzedniego ekranu są od tej pory ignorowane.
         """
-        for widget in self.root.winfo_children():
-            widget.destroy()
+        self.ekran_nr += 1
+        if self.aktualny_ekran is not None:
+            self.aktualny_ekran.pack_forget()
+            self.aktualny_ekran = None
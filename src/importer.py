@@ -0,0 +1,213 @@
+import csv
+import json
+import os
+import time
+
+import database
+from alphabet import normalize
+from defaults import BATCH_SIZE, FORMATS
+
+CHUNK_SIZE = 1 << 16
+EXTENSIONS = {
+    ".json": "json",
+    ".jsonl": "ndjson",
+    ".ndjson": "ndjson",
+    ".csv": "csv",
+    ".txt": "txt",
+}
+
+class _JsonStream:
+    """
+    Minimalny przyrostowy parser pliku JSON w formacie {"kategoria": ["słowo", ...], ...}.
+
+    Czyta plik porcjami, więc zużycie pamięci nie zależy od rozmiaru słownika.
+    """
+    def __init__(self, f):
+        self.f = f
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _read_more(self):
+        """
+        Dokleja do bufora kolejną porcję pliku, odrzucając już przetworzoną część.
+        :return: False, jeśli plik się skończył
+        """
+        chunk = self.f.read(CHUNK_SIZE)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """
+        Pomija białe znaki i zwraca następny znak (bez przesuwania pozycji).
+        :return: znak albo '' na końcu pliku
+        """
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos].isspace():
+                self.pos += 1
+            if self.pos < len(self.buf) or not self._read_more():
+                return self.buf[self.pos:self.pos + 1]
+
+    def expect(self, char):
+        """
+        Sprawdza, że następnym znakiem jest 'char' i przechodzi za niego.
+        :param char: oczekiwany znak
+        """
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Niepoprawny plik JSON: oczekiwano '{char}', znaleziono '{found}'")
+        self.pos += 1
+
+    def string(self):
+        """
+        Odczytuje napis JSON, doczytując plik, jeśli napis jest przecięty granicą porcji.
+        :return: odczytany napis
+        """
+        if self.peek() != '"':
+            raise ValueError("Niepoprawny plik JSON: oczekiwano napisu")
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self._read_more():
+                    raise
+                continue
+            self.pos = end
+            return value
+
+    def words(self):
+        """
+        Generator par (słowo, kategoria) z całego pliku.
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            return
+        while True:
+            category = self.string()
+            self.expect(":")
+            self.expect("[")
+            if self.peek() != "]":
+                while True:
+                    yield self.string(), category
+                    if self.peek() != ",":
+                        break
+                    self.pos += 1
+            self.expect("]")
+            if self.peek() != ",":
+                break
+            self.pos += 1
+        self.expect("}")
+
+def detect_format(path):
+    """
+    Rozpoznaje format pliku ze słowami po rozszerzeniu.
+    :param path: ścieżka do pliku
+    :return: jeden z FORMATS
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in EXTENSIONS:
+        raise ValueError(f"Nieznany format pliku: {path}")
+    return EXTENSIONS[ext]
+
+def iter_words(path, fmt=None, category=None):
+    """
+    Strumieniowo czyta plik ze słowami i zwraca kolejne słowa z kategoriami.
+
+    Obsługiwane formaty:
+    json - {"kategoria": ["słowo", ...]} (jak words.json),
+    ndjson - w każdej linii {"word": _, "category": _},
+    csv - kolumny word,category (nagłówek opcjonalny),
+    txt - jedno słowo w linii, kategoria podana w parametrze.
+    Słowa są sprowadzane do postaci NFC (litery z ogonkami jako pojedyncze znaki).
+    :param path: ścieżka do pliku
+    :param fmt: format pliku; domyślnie rozpoznawany po rozszerzeniu
+    :param category: kategoria dla formatu txt albo kategoria domyślna dla pozostałych
+    :return: generator dict {'word': _, 'category': _}
+    """
+    fmt = fmt or detect_format(path)
+    if fmt not in FORMATS:
+        raise ValueError(f"Nieznany format: {fmt}")
+    if fmt == "txt" and not category:
+        raise ValueError("Dla plików tekstowych trzeba podać kategorię")
+
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if fmt == "json":
+            pairs = _JsonStream(f).words()
+        elif fmt == "ndjson":
+            pairs = ((row["word"], row.get("category", category))
+                     for row in (json.loads(line) for line in f if line.strip()))
+        elif fmt == "csv":
+            pairs = ((row[0], row[1] if len(row) > 1 and row[1] else category)
+                     for row in csv.reader(f) if row and row[:2] != ["word", "category"])
+        else:
+            pairs = ((line, category) for line in f)
+
+        for word, word_category in pairs:
+            word = normalize(word.strip())
+            if word and word_category:
+                yield {"word": word, "category": word_category}
+
+def _batches(rows, size):
+    """
+    Dzieli strumień wierszy na listy o długości co najwyżej 'size'.
+    """
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def import_words(path, fmt=None, category=None, batch_size=BATCH_SIZE):
+    """
+    Importuje słowa z pliku do tabeli 'words' w jednej transakcji, partiami (executemany).
+    Duplikaty (to samo słowo w tej samej kategorii) są pomijane przez unikalny indeks,
+    a liczba dodanych słów pochodzi z rowcount wstawień. W tym samym przejściu zbierane
+    są litery słów; liczby słów i alfabety kategorii (patrz alphabet.Alphabet) są
+    przeliczane w tej samej transakcji, więc gra nie widzi słów bez kategorii.
+    :param path: ścieżka do pliku
+    :param fmt: format pliku (patrz iter_words)
+    :param category: kategoria dla formatu txt
+    :param batch_size: liczba słów w jednej partii
+    :return: dict z liczbą przeczytanych i dodanych słów, czasem i przepustowością
+    """
+    from sqlalchemy import insert
+    from models import Word, get_engine
+
+    start = time.perf_counter()
+    statement = insert(Word.__table__).prefix_with("OR IGNORE", dialect="sqlite")
+    read = added = 0
+    letters = {}
+
+    with get_engine().begin() as conn:
+        for batch in _batches(iter_words(path, fmt, category), batch_size):
+            added += conn.execute(statement, batch).rowcount
+            read += len(batch)
+            for row in batch:
+                category_letters = letters.get(row["category"])
+                if category_letters is None:
+                    category_letters = letters[row["category"]] = set()
+                category_letters.update(row["word"].upper())
+        # Surowy kursor tego samego połączenia sqlite3, więc w tej samej transakcji
+        cursor = conn.connection.cursor()
+        database.rebuild_categories(cursor)
+        database.update_alphabets(cursor, letters)
+
+    from game import words_changed
+    words_changed()
+
+    seconds = time.perf_counter() - start
+    return {
+        "read": read,
+        "added": added,
+        "duplicates": read - added,
+        "seconds": seconds,
+        "words_per_second": read / seconds if seconds > 0 else 0.0,
+    }
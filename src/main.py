@@ -1,9 +1,349 @@
-from tkinter import Tk
-from database import init_db
-from gui import HangmanApp
+import time
 
-if __name__ == "__main__":
+STARTED = time.perf_counter()
+
+import argparse
+import sys
+
+def startup_report(phases):
+    """
+    Wypisuje czasy kolejnych etapów startu (liczone od uruchomienia modułu main).
+    :param phases: lista (nazwa etapu, czas w sekundach od startu)
+    """
+    for name, seconds in phases:
+        print(f"{name:24} {seconds * 1000:8.1f} ms", file=sys.stderr)
+    loaded = "tak" if "sqlalchemy" in sys.modules else "nie"
+    print(f"{'SQLAlchemy załadowana':24} {loaded:>8}", file=sys.stderr)
+
+def since_start():
+    """
+    Zwraca czas w sekundach od uruchomienia modułu main.
+    """
+    return time.perf_counter() - STARTED
+
+def connect_api(args):
+    """
+    Wybiera źródło danych gry: magazyn danych z konfiguracji (--storage, --db)
+    albo serwer gry (--server HOST:PORT).
+    :return: krotka (api, funkcja przygotowująca dane, funkcja zamykająca)
+    """
+    if args.server:
+        from client import GameClient, HOST
+
+        host, _, port = args.server.rpartition(":")
+        client = GameClient(host or HOST, int(port))
+        return client, client.connect, client.close
+
+    from storage import open_storage
+
+    return open_storage(args.storage, args.db)
+
+def init_sqlite(args):
+    """
+    Przygotowuje lokalną bazę SQLite (plik z --db) dla poleceń, które działają tylko na niej.
+    """
+    from database import configure_db, init_db
+
+    if args.storage != "sqlite":
+        sys.exit("To polecenie działa tylko z magazynem danych sqlite")
+    if args.db:
+        configure_db(args.db)
     init_db()
+
+def run_gui(args):
+    """
+    Uruchamia graficzną wersję gry. Okno logowania jest pokazywane od razu,
+    a baza danych (albo połączenie z serwerem) jest przygotowywana w tle.
+    """
+    from tkinter import Tk
+    from gui import HangmanApp
+
+    api, init, close = connect_api(args)
     root = Tk()
-    app = HangmanApp(root)
-    root.mainloop()
\ No newline at end of file
+    app = HangmanApp(root, api, args.fps)
+    phases = [("import i okno", since_start())]
+    if args.overlay:
+        import metrics
+        metrics.show_overlay(root)
+
+    def baza_gotowa():
+        if args.startup_time:
+            phases.append(("baza gotowa", since_start()))
+            startup_report(phases)
+            root.destroy()
+
+    if args.startup_time:
+        root.update_idletasks()
+        phases.append(("pierwsze rysowanie", since_start()))
+    app.inicjalizuj(init, on_ready=baza_gotowa)
+    root.mainloop()
+    app.executor.shutdown()
+    close()
+
+def run_terminal(args):
+    """
+    Uruchamia tekstową wersję gry (bez Tk), np. na terminalu bez środowiska graficznego.
+    """
+    from cli import TerminalApp
+
+    api, init, close = connect_api(args)
+    init()
+    app = TerminalApp(api)
+    if args.startup_time:
+        startup_report([("baza gotowa", since_start())])
+    else:
+        app.run()
+    close()
+
+def run_game(args):
+    """
+    Uruchamia grę w wersji graficznej albo tekstowej (--terminal).
+    """
+    if args.terminal:
+        run_terminal(args)
+    else:
+        run_gui(args)
+
+def run_import(args):
+    """
+    Importuje słownik z pliku i wypisuje podsumowanie importu.
+    """
+    from importer import import_words
+
+    init_sqlite(args)
+    result = import_words(args.file, args.format, args.category, args.batch_size)
+    print(f"Przeczytano: {result['read']}, dodano: {result['added']}, "
+          f"pominięto duplikatów: {result['duplicates']}")
+    print(f"Czas: {result['seconds']:.2f} s ({result['words_per_second']:.0f} słów/s)")
+
+def run_simulation(args):
+    """
+    Rozgrywa gry bez interfejsu i wypisuje wyniki symulacji.
+    Gry używają klawiatury z liter alfabetów wybranych kategorii.
+    """
+    from alphabet import Alphabet
+    from simulation import simulate
+    from storage import open_storage
+
+    api, init, close = open_storage(args.storage, args.db)
+    init()
+    categories = [args.category] if args.category else api.get_categories()
+    words = [word for category in categories for word in api.get_words(category)]
+    letters = set().union(*(api.get_alphabet(category).used_letters() for category in categories))
+    close()
+    result = simulate(words, args.games, args.strategy, args.seed, alphabet=Alphabet.derive(letters))
+    print(f"Gier: {result['games']}, wygranych: {result['wins']} ({result['win_percentage']:.1f}%), "
+          f"średnia błędów: {result['avg_mistakes']:.2f}")
+    print(f"Czas: {result['seconds']:.2f} s ({result['games_per_second']:.0f} gier/s)")
+
+def run_solver(args):
+    """
+    Ocenia strategie zgadywania w puli procesów, wypisuje i zapisuje wyniki w bazie.
+    """
+    from solver import solve, save_results
+    from storage import open_storage
+
+    api, init, close = open_storage(args.storage, args.db)
+    init()
+    categories = [args.category] if args.category else api.get_categories()
+    words = {category: api.get_words(category) for category in categories}
+    alphabets = {category: api.get_alphabet(category) for category in categories}
+    close()
+    if not any(words.values()):
+        print("Brak słów w wybranych kategoriach")
+        return
+    results = solve(words, args.games, args.strategies, args.workers, args.seed, alphabets=alphabets)
+    if not results:
+        print("Brak wyników - nie rozegrano żadnej gry")
+        return
+    for r in sorted(results, key=lambda r: (r["strategy"], r["category"] or "")):
+        print(f"{r['strategy']:10} {r['category'] or '(wszystkie)':16} gier: {r['games']:9}  "
+              f"wygrane: {r['win_percentage']:5.1f}%  średnia błędów: {r['avg_mistakes']:.2f}")
+    seconds = results[0]["seconds"]
+    games = sum(r["games"] for r in results if r["category"] is None)
+    print(f"Czas: {seconds:.2f} s ({games / seconds:.0f} gier/s)")
+    if not args.no_save:
+        if args.storage != "sqlite":
+            print("Wyniki są zapisywane tylko w bazie SQLite (pomiń --storage albo użyj --no-save)")
+        else:
+            save_results(results)
+
+def run_difficulty(args):
+    """
+    Przelicza trudność słów na podstawie rozegranych gier i cech słów.
+    """
+    from difficulty import update_difficulty
+
+    init_sqlite(args)
+    result = update_difficulty(args.full)
+    print(f"Nowych słów: {result['new_words']}, nowych gier: {result['games']}, "
+          f"przeliczonych kategorii: {result['categories']}")
+    print(f"Czas: {result['seconds']:.2f} s")
+
+def run_maintenance(args):
+    """
+    Przenosi stare gry do archiwum (z dziennymi podsumowaniami), zwalnia miejsce
+    w pliku bazy i odświeża statystyki zapytań - partiami, przy działającej grze.
+    """
+    from difficulty import update_difficulty
+    import maintenance
+
+    init_sqlite(args)
+    update_difficulty()
+    archive = None if args.no_archive else args.archive
+    result = maintenance.archive_games(args.days, archive, args.chunk, args.pause)
+    print(f"Zarchiwizowano gier: {result['games']} w {result['chunks']} partiach ({result['seconds']:.2f} s)")
+    if args.full_vacuum:
+        maintenance.full_vacuum()
+        print("Baza przebudowana (VACUUM), auto_vacuum=INCREMENTAL włączone")
+    freed = maintenance.vacuum(args.vacuum_pages, args.pause)
+    if freed is None:
+        print("Baza nie ma włączonego auto_vacuum - uruchom raz z --full-vacuum (bez działającej gry)")
+    else:
+        print(f"Zwolniono stron: {freed}")
+    maintenance.analyze()
+
+def run_auth_benchmark(args):
+    """
+    Mierzy przepustowość logowania (weryfikacji haseł) przy różnych kosztach scrypt.
+    """
+    import auth
+
+    auth.HASH_WORKERS = args.workers
+    for result in auth.benchmark(args.costs, args.logins):
+        print(f"n={result['n']:>7}: {result['logins_per_second']:8.1f} logowań/s "
+              f"({result['logins']} logowań w {result['seconds']:.2f} s)")
+
+def run_server(args):
+    """
+    Uruchamia serwer gry, do którego należy magazyn danych (domyślnie lokalna baza).
+    """
+    import asyncio
+    from server import GameServer
+    from storage import open_storage
+
+    api, init, close = open_storage(args.storage, args.db)
+    init()
+    server = GameServer(args.host, args.port, args.workers, api)
+    print(f"Serwer gry nasłuchuje na {args.host}:{args.port} (Ctrl+C kończy)")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        close()
+
+def positive_int(value):
+    """
+    Typ argumentu argparse: liczba całkowita większa od zera.
+    """
+    number = int(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"wymagana liczba większa od zera: {value}")
+    return number
+
+def parse_args(argv=None):
+    """
+    Parsuje argumenty wiersza poleceń.
+    :param argv: lista argumentów (domyślnie sys.argv)
+    :return: argparse.Namespace
+    """
+    from defaults import (ARCHIVE_FILE, BACKENDS, BATCH_SIZE, CHUNK_ROWS, FORMATS, FPS, HOST, PAUSE, PORT,
+                          RETENTION_DAYS, SERVER_WORKERS, SIMULATION_STRATEGIES, SOLVER_STRATEGIES,
+                          SOLVER_WORKERS, VACUUM_PAGES)
+
+    parser = argparse.ArgumentParser(description="Gra w wisielca")
+    parser.add_argument("--metrics", metavar="PLIK",
+                        help="zbieraj pomiary czasu i zapytań; po wyjściu zapisz je do pliku (.json lub .prom)")
+    parser.add_argument("--overlay", action="store_true", help="pokaż okno z bieżącymi pomiarami")
+    parser.add_argument("--fps", type=positive_int, default=FPS, help="docelowa liczba klatek na sekundę animacji planszy")
+    parser.add_argument("--terminal", action="store_true", help="gra w terminalu, bez okna Tk")
+    parser.add_argument("--server", metavar="HOST:PORT",
+                        help="graj przez serwer gry zamiast na lokalnej bazie")
+    parser.add_argument("--storage", choices=BACKENDS, default="sqlite",
+                        help="magazyn danych: sqlite (domyślny), memory (tylko w pamięci), "
+                             "sqlalchemy (np. PostgreSQL, adres w --db)")
+    parser.add_argument("--db", metavar="ŚCIEŻKA|ADRES",
+                        help="plik bazy SQLite albo adres bazy SQLAlchemy (np. postgresql://user@host/hangman)")
+    parser.add_argument("--startup-time", action="store_true",
+                        help="zmierz czas startu (do gotowości okna i bazy), wypisz go i zakończ")
+    parser.set_defaults(func=run_game)
+    subparsers = parser.add_subparsers(title="polecenia")
+
+    import_parser = subparsers.add_parser("import", help="import słownika z pliku json/ndjson/csv/txt")
+    import_parser.add_argument("file", help="plik ze słowami")
+    import_parser.add_argument("--format", choices=FORMATS, help="format pliku (domyślnie z rozszerzenia)")
+    import_parser.add_argument("--category", help="kategoria słów (wymagana dla plików txt)")
+    import_parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="liczba słów w jednej partii")
+    import_parser.set_defaults(func=run_import)
+
+    simulate_parser = subparsers.add_parser("simulate", help="symulacja gier bez interfejsu")
+    simulate_parser.add_argument("--games", type=positive_int, default=100000, help="liczba gier")
+    simulate_parser.add_argument("--category", help="kategoria słów (domyślnie wszystkie)")
+    simulate_parser.add_argument("--strategy", choices=SIMULATION_STRATEGIES, default="frequency",
+                                 help="kolejność zgadywania liter")
+    simulate_parser.add_argument("--seed", type=int, help="ziarno generatora liczb losowych")
+    simulate_parser.set_defaults(func=run_simulation)
+
+    solver_parser = subparsers.add_parser("solve", help="ocena strategii zgadywania (wiele procesów)")
+    solver_parser.add_argument("--games", type=positive_int, default=1000000, help="liczba gier na strategię")
+    solver_parser.add_argument("--strategies", nargs="+", choices=SOLVER_STRATEGIES, default=list(SOLVER_STRATEGIES),
+                               help="oceniane strategie")
+    solver_parser.add_argument("--category", help="kategoria słów (domyślnie wszystkie)")
+    solver_parser.add_argument("--workers", type=int, default=SOLVER_WORKERS, help="liczba procesów (0 - bez puli)")
+    solver_parser.add_argument("--seed", type=int, help="ziarno generatora liczb losowych")
+    solver_parser.add_argument("--no-save", action="store_true", help="nie zapisuj wyników w bazie")
+    solver_parser.set_defaults(func=run_solver)
+
+    difficulty_parser = subparsers.add_parser("difficulty", help="przeliczenie trudności słów")
+    difficulty_parser.add_argument("--full", action="store_true", help="przelicz wszystko od początku")
+    difficulty_parser.set_defaults(func=run_difficulty)
+
+    maintenance_parser = subparsers.add_parser("maintenance", help="archiwizacja starych gier i porządki w bazie")
+    maintenance_parser.add_argument("--days", type=int, default=RETENTION_DAYS,
+                                    help="ile dni gry zostają w tabeli 'games'")
+    maintenance_parser.add_argument("--archive", default=ARCHIVE_FILE,
+                                    help="plik archiwum: baza SQLite albo eksport NDJSON (.gz)")
+    maintenance_parser.add_argument("--no-archive", action="store_true",
+                                    help="nie zachowuj starych gier (tylko dzienne podsumowania)")
+    maintenance_parser.add_argument("--chunk", type=int, default=CHUNK_ROWS, help="liczba gier w jednej partii")
+    maintenance_parser.add_argument("--pause", type=float, default=PAUSE, help="przerwa między partiami (s)")
+    maintenance_parser.add_argument("--vacuum-pages", type=int, default=VACUUM_PAGES,
+                                    help="liczba stron zwalnianych w jednej partii")
+    maintenance_parser.add_argument("--full-vacuum", action="store_true",
+                                    help="jednorazowa przebudowa bazy włączająca auto_vacuum (blokuje bazę)")
+    maintenance_parser.set_defaults(func=run_maintenance)
+
+    auth_parser = subparsers.add_parser("auth-bench", help="pomiar liczby logowań na sekundę")
+    auth_parser.add_argument("--costs", type=int, nargs="+", default=[2 ** 12, 2 ** 14, 2 ** 15],
+                             help="sprawdzane wartości parametru n scrypt")
+    auth_parser.add_argument("--logins", type=int, default=32, help="liczba logowań na każdy koszt")
+    auth_parser.add_argument("--workers", type=int, default=2, help="liczba procesów liczących skróty")
+    auth_parser.set_defaults(func=run_auth_benchmark)
+
+    server_parser = subparsers.add_parser("serve", help="serwer gry dla wielu klientów (--server)")
+    server_parser.add_argument("--host", default=HOST, help="adres nasłuchiwania")
+    server_parser.add_argument("--port", type=int, default=PORT, help="port nasłuchiwania")
+    server_parser.add_argument("--workers", type=int, default=SERVER_WORKERS, help="liczba wątków obsługujących bazę")
+    server_parser.set_defaults(func=run_server)
+
+    return parser.parse_args(argv)
+
+def enable_metrics(path):
+    """
+    Włącza pomiary i rejestruje zapis wyników przy wyjściu z programu.
+    Musi być wywołane przed zaimportowaniem modułów game i gui.
+    """
+    import atexit
+    import metrics
+
+    metrics.enable()
+    if path:
+        atexit.register(metrics.dump, path)
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.metrics or args.overlay:
+        enable_metrics(args.metrics)
+    args.func(args)
@@ -0,0 +1,162 @@
+import gzip
+import json
+import time
+
+import database
+from defaults import ARCHIVE_FILE, CHUNK_ROWS, PAUSE, RETENTION_DAYS, VACUUM_PAGES
+from difficulty import JOB_NAME as DIFFICULTY_JOB
+
+ANALYSIS_LIMIT = 1000   # liczba wierszy indeksu czytanych przez ANALYZE (PRAGMA analysis_limit)
+
+GAME_COLUMNS = ("id", "user_id", "word", "mistakes", "won", "category", "guesses", "played_at")
+ARCHIVE_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS archive.games (
+        id INTEGER PRIMARY KEY, user_id INTEGER, word VARCHAR NOT NULL, mistakes INTEGER,
+        won BOOLEAN, category VARCHAR, guesses VARCHAR, played_at VARCHAR
+    )
+"""
+# Gry od najstarszych, ale tylko już doliczone do trudności słów (patrz difficulty.update_difficulty).
+CANDIDATES_SQL = """
+    SELECT id, played_at < datetime('now', ?) OR played_at IS NULL FROM games
+    WHERE id > ? AND id <= (SELECT COALESCE(MAX(last_id), 0) FROM job_progress WHERE name=?)
+    ORDER BY id LIMIT ?
+"""
+CHUNK_SQL = f"SELECT {', '.join(GAME_COLUMNS)} FROM games WHERE id > ? AND id <= ? ORDER BY id"
+ARCHIVE_SQL = f"""
+    INSERT INTO archive.games ({', '.join(GAME_COLUMNS)})
+    SELECT {', '.join(GAME_COLUMNS)} FROM main.games WHERE id > ? AND id <= ?
+"""
+ROLLUP_SQL = """
+    INSERT INTO games_daily (day, user_id, category, word, games, wins, mistakes)
+    SELECT COALESCE(date(played_at), ''), COALESCE(user_id, 0), COALESCE(category, ''), word,
+           COUNT(*), SUM(won), SUM(mistakes)
+    FROM games WHERE id > ? AND id <= ?
+    GROUP BY 1, 2, 3, 4
+    ON CONFLICT(day, user_id, category, word) DO UPDATE SET
+        games = games + excluded.games,
+        wins = wins + excluded.wins,
+        mistakes = mistakes + excluded.mistakes
+"""
+DELETE_SQL = "DELETE FROM games WHERE id > ? AND id <= ?"
+ARCHIVE_MAX_ID_SQL = "SELECT COALESCE(MAX(id), 0) FROM archive.games"
+
+def archive_games(days=RETENTION_DAYS, archive=ARCHIVE_FILE, chunk=CHUNK_ROWS, pause=PAUSE):
+    """
+    Przenosi gry starsze niż 'days' dni z tabeli 'games' do archiwum i dolicza je
+    do dziennych podsumowań w tabeli 'games_daily'. Gry są przenoszone partiami
+    po 'chunk' wierszy (od najstarszych), każda partia w osobnej krótkiej transakcji,
+    więc polecenie może działać przy uruchomionej grze. Przenoszone są tylko gry już
+    doliczone do trudności słów, a gry bez daty są traktowane jak najstarsze.
+
+    Archiwum to plik SQLite z tabelą 'games' albo, dla nazwy kończącej się na '.gz',
+    dopisywany plik NDJSON skompresowany gzip. W pliku SQLite kopia, podsumowanie
+    i usunięcie partii są jedną transakcją, a gra o id już obecnym w archiwum przerywa
+    partię błędem (sqlite3.IntegrityError), zamiast zostać usunięta bez kopii.
+    W pliku .gz po przerwaniu w złym momencie partia może trafić do archiwum drugi raz.
+    :param days: liczba dni, przez które gry zostają w tabeli 'games'
+    :param archive: ścieżka pliku archiwum (None - bez archiwum, tylko podsumowania)
+    :param chunk: liczba gier w jednej partii
+    :param pause: przerwa między partiami (s)
+    :return: dict z liczbą przeniesionych gier, partii i czasem
+    """
+    start = time.perf_counter()
+    export = archive is not None and archive.endswith(".gz")
+    conn = database.pool.open()
+    out = None
+    games = chunks = 0
+    try:
+        if export:
+            out = gzip.open(archive, "at", encoding="utf-8")
+        elif archive is not None:
+            conn.execute("ATTACH DATABASE ? AS archive", (archive,))
+            conn.execute(ARCHIVE_TABLE_SQL)
+            archived = conn.execute(ARCHIVE_MAX_ID_SQL).fetchone()[0]
+            for statement in database.GAMES_SEQUENCE_SQL:
+                conn.execute(statement, (archived,))
+            conn.commit()
+        last_id = 0
+        while True:
+            cursor = conn.cursor()
+            rows = cursor.execute(CANDIDATES_SQL, (f"-{int(days)} days", last_id, DIFFICULTY_JOB, chunk)).fetchall()
+            old = 0
+            for _, is_old in rows:
+                if not is_old:
+                    break
+                old += 1
+            if old == 0:
+                break
+            first_id, last_id = last_id, rows[old - 1][0]
+            if export:
+                for row in cursor.execute(CHUNK_SQL, (first_id, last_id)):
+                    out.write(json.dumps(dict(zip(GAME_COLUMNS, row)), ensure_ascii=False) + "\n")
+                out.flush()
+            elif archive is not None:
+                cursor.execute(ARCHIVE_SQL, (first_id, last_id))
+            cursor.execute(ROLLUP_SQL, (first_id, last_id))
+            cursor.execute(DELETE_SQL, (first_id, last_id))
+            conn.commit()
+            games += old
+            chunks += 1
+            if old < len(rows) or len(rows) < chunk:
+                break
+            time.sleep(pause)
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        if out is not None:
+            out.close()
+        conn.close()
+    return {"games": games, "chunks": chunks, "seconds": time.perf_counter() - start}
+
+def vacuum(pages=VACUUM_PAGES, pause=PAUSE):
+    """
+    Oddaje systemowi wolne strony pliku bazy (PRAGMA incremental_vacuum) partiami
+    po 'pages' stron, każda partia w osobnej transakcji.
+    Wymaga bazy w trybie auto_vacuum=INCREMENTAL (nowe bazy; istniejące - po full_vacuum).
+    :param pages: liczba stron zwalnianych w jednej partii
+    :param pause: przerwa między partiami (s)
+    :return: liczba zwolnionych stron albo None, jeśli baza nie ma włączonego auto_vacuum
+    """
+    with database.get_connection() as conn:
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            return None
+    freed = 0
+    while True:
+        with database.get_connection() as conn:
+            before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            if before == 0:
+                return freed
+            conn.execute(f"PRAGMA incremental_vacuum({int(pages)})").fetchall()
+            after = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        freed += before - after
+        if after == 0 or after >= before:
+            return freed
+        time.sleep(pause)
+
+def full_vacuum():
+    """
+    Przebudowuje cały plik bazy (VACUUM) i włącza w nim auto_vacuum=INCREMENTAL.
+    Potrzebne raz dla baz utworzonych przed włączeniem auto_vacuum; blokuje bazę
+    na czas przebudowy, więc nie należy go uruchamiać przy działającej grze.
+    """
+    conn = database.pool.open()
+    try:
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+    # Połączenia otwarte przed przebudową nadal widzą poprzedni tryb auto_vacuum.
+    database.pool.dispose()
+
+def analyze(tables=("games", "games_daily"), limit=ANALYSIS_LIMIT):
+    """
+    Odświeża statystyki planisty zapytań dla podanych tabel, czytając co najwyżej
+    'limit' wierszy każdego indeksu (PRAGMA analysis_limit), każda tabela osobno.
+    :param tables: nazwy tabel
+    :param limit: limit wierszy indeksu (0 - bez limitu)
+    """
+    for table in tables:
+        with database.get_connection() as conn:
+            conn.execute(f"PRAGMA analysis_limit={int(limit)}")
+            conn.execute(f"ANALYZE {table}")
@@ -0,0 +1,179 @@
+import bisect
+import functools
+import json
+import threading
+import time
+
+BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+OVERLAY_INTERVAL = 500
+OVERLAY_ROWS = 10
+
+ENABLED = False
+
+_lock = threading.Lock()
+_timers = {}
+_queries = 0
+
+class Histogram:
+    """
+    Histogram czasów wywołań o stałych przedziałach (BUCKETS, w sekundach).
+    """
+    __slots__ = ("count", "total", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)
+
+    def add(self, seconds):
+        """
+        Dodaje jeden pomiar.
+        :param seconds: czas wywołania w sekundach
+        """
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.buckets[bisect.bisect_left(BUCKETS, seconds)] += 1
+
+    def percentile(self, q):
+        """
+        Szacuje percentyl jako górną granicę przedziału, w którym wypada.
+        :param q: kwantyl z przedziału (0, 1]
+        :return: czas w sekundach
+        """
+        target = q * self.count
+        seen = 0
+        for bound, count in zip(BUCKETS, self.buckets):
+            seen += count
+            if seen >= target:
+                return bound
+        return self.max
+
+def enable():
+    """
+    Włącza zbieranie pomiarów. Trzeba wywołać przed zaimportowaniem mierzonych modułów
+    (game, gui), bo dekorator timed() decyduje o opakowaniu funkcji przy imporcie.
+    """
+    global ENABLED
+    ENABLED = True
+
+def record(name, seconds):
+    """
+    Zapisuje czas wywołania.
+    :param name: nazwa mierzonego miejsca
+    :param seconds: czas w sekundach
+    """
+    with _lock:
+        histogram = _timers.get(name)
+        if histogram is None:
+            histogram = _timers[name] = Histogram()
+        histogram.add(seconds)
+
+def timed(name):
+    """
+    Dekorator mierzący czas wywołań funkcji. Przy wyłączonych pomiarach zwraca
+    funkcję bez zmian, więc nie dodaje żadnego narzutu.
+    :param name: nazwa mierzonego miejsca
+    """
+    def decorator(fn):
+        if not ENABLED:
+            return fn
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - start)
+
+        return wrapper
+    return decorator
+
+def count_query(statement):
+    """
+    Zlicza zapytanie SQL; podpinane jako sqlite3 trace callback do połączeń z puli.
+    :param statement: tekst zapytania (nieużywany)
+    """
+    global _queries
+    with _lock:
+        _queries += 1
+
+def snapshot():
+    """
+    Zwraca bieżące pomiary.
+    :return: dict z liczbą zapytań i statystykami każdego mierzonego miejsca
+    """
+    with _lock:
+        timers = {
+            name: {
+                "calls": h.count,
+                "total_ms": h.total * 1000,
+                "mean_ms": h.total / h.count * 1000,
+                "p50_ms": h.percentile(0.5) * 1000,
+                "p99_ms": h.percentile(0.99) * 1000,
+                "max_ms": h.max * 1000,
+                "buckets": dict(zip([str(b) for b in BUCKETS] + ["+Inf"], h.buckets)),
+            }
+            for name, h in _timers.items()
+        }
+    return {"queries": _queries, "timers": timers}
+
+def prometheus():
+    """
+    Zwraca pomiary w tekstowym formacie Prometheusa.
+    :return: napis
+    """
+    lines = [
+        "# TYPE hangman_db_queries_total counter",
+        f"hangman_db_queries_total {_queries}",
+        "# TYPE hangman_call_duration_seconds histogram",
+    ]
+    with _lock:
+        for name, h in sorted(_timers.items()):
+            cumulative = 0
+            for bound, count in zip([str(b) for b in BUCKETS] + ["+Inf"], h.buckets):
+                cumulative += count
+                lines.append(f'hangman_call_duration_seconds_bucket{{name="{name}",le="{bound}"}} {cumulative}')
+            lines.append(f'hangman_call_duration_seconds_sum{{name="{name}"}} {h.total}')
+            lines.append(f'hangman_call_duration_seconds_count{{name="{name}"}} {h.count}')
+    return "\n".join(lines) + "\n"
+
+def dump(path):
+    """
+    Zapisuje pomiary do pliku: JSON, a dla rozszerzenia .prom lub .txt - format Prometheusa.
+    :param path: ścieżka pliku
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        if path.endswith((".prom", ".txt")):
+            f.write(prometheus())
+        else:
+            json.dump(snapshot(), f, indent=2)
+
+def show_overlay(root):
+    """
+    Otwiera małe okno z bieżącymi pomiarami, odświeżane co OVERLAY_INTERVAL ms.
+
+    Args:
+        root: Główne okno aplikacji Tkinter.
+    """
+    import tkinter as tk
+
+    window = tk.Toplevel(root)
+    window.title("Pomiary")
+    window.attributes("-topmost", True)
+    label = tk.Label(window, font=("Courier", 9), justify=tk.LEFT, anchor="w", bg="black", fg="lightgreen")
+    label.pack(fill=tk.BOTH, expand=True)
+
+    def odswiez():
+        data = snapshot()
+        rows = sorted(data["timers"].items(), key=lambda item: -item[1]["total_ms"])[:OVERLAY_ROWS]
+        lines = [f"zapytania SQL: {data['queries']}"]
+        lines += [f"{name[:28]:28} {t['calls']:6} {t['mean_ms']:8.2f} ms  max {t['max_ms']:8.2f}"
+                  for name, t in rows]
+        label.config(text="\n".join(lines))
+        window.after(OVERLAY_INTERVAL, odswiez)
+
+    odswiez()
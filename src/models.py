@@ -0,0 +1,292 @@
+from sqlalchemy import create_engine, inspect, text, Column, Integer, String, ForeignKey, Boolean, Float, Index
+from sqlalchemy.orm import declarative_base, relationship
+from sqlalchemy.pool import QueuePool
+
+import database
+
+Base = declarative_base()
+
+_engine = None
+_engine_pool = None
+
+def get_engine():
+    """
+    Zwraca silnik SQLAlchemy dla bieżącej bazy (database.pool). Połączenia są
+    otwierane przez pulę modułu database (z tymi samymi parametrami SQLite).
+    Silnik służy tylko do migracji i importu, więc moduł
+    models (i SQLAlchemy) nie jest importowany przy zwykłym starcie gry.
+    :return: silnik SQLAlchemy
+    """
+    global _engine, _engine_pool
+    if _engine is None or _engine_pool is not database.pool:
+        if _engine is not None:
+            _engine.dispose()
+        _engine = create_engine("sqlite://", creator=database.pool.open, poolclass=QueuePool, pool_size=1)
+        _engine_pool = database.pool
+    return _engine
+
+class User(Base):
+    """
+    Tabela użytkowników.
+    Przechowuje dane użytkowników, takie jak
+    nazwa użytkownika i hasło.
+    """
+    __tablename__ = "users"
+    id = Column(Integer, primary_key=True)
+    username = Column(String, unique=True, nullable=False)
+    password = Column(String, nullable=False)
+    games = relationship("Game", back_populates="user")
+
+class Game(Base):
+    """
+    Tabela informacji o grach.
+    Przechowuje informacje takie jak: słowo do odgadnięcia, jego kategoria, liczba błędów,
+    oraz czy gra została wygrana i klucz obcy do użytkownika. Dla gier zapisywanych
+    w trakcie (ActiveGame) kolumna guesses to zgadywane litery w kolejności. Kolumna
+    played_at (czas UTC zapisu) jest pusta dla gier sprzed jej dodania. Stare gry są
+    przenoszone do archiwum i podsumowywane w tabeli 'games_daily' (moduł maintenance),
+    więc id jest AUTOINCREMENT - id usuniętych gier nie są używane ponownie.
+    """
+    __tablename__ = "games"
+    __table_args__ = (Index("ix_games_user_id_id", "user_id", "id"), {"sqlite_autoincrement": True})
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"))
+    word = Column(String, nullable=False)
+    mistakes = Column(Integer, default=0)
+    won = Column(Boolean, default=False)
+    category = Column(String)
+    guesses = Column(String)
+    played_at = Column(String)
+    user = relationship("User", back_populates="games")
+
+class GameDaily(Base):
+    """
+    Tabela dziennych podsumowań zarchiwizowanych gier.
+
+    Przechowuje liczbę gier, wygranych i sumę błędów dla każdego dnia, gracza, kategorii
+    i słowa. Gry bez daty (sprzed dodania kolumny played_at) mają pusty dzień, gry bez
+    zalogowanego gracza - user_id 0, a gry bez kategorii - pustą kategorię.
+    """
+    __tablename__ = "games_daily"
+    day = Column(String, primary_key=True)
+    user_id = Column(Integer, primary_key=True)
+    category = Column(String, primary_key=True)
+    word = Column(String, primary_key=True)
+    games = Column(Integer, nullable=False, default=0)
+    wins = Column(Integer, nullable=False, default=0)
+    mistakes = Column(Integer, nullable=False, default=0)
+
+class UserStats(Base):
+    """
+    Tabela podsumowań statystyk użytkowników.
+
+    Przechowuje liczbę gier, wygranych i sumę błędów każdego użytkownika.
+    Jest aktualizowana przyrostowo przy zapisie każdej gry (save_game).
+    """
+    __tablename__ = "user_stats"
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    games = Column(Integer, nullable=False, default=0)
+    wins = Column(Integer, nullable=False, default=0)
+    mistakes = Column(Integer, nullable=False, default=0)
+
+class Leaderboard(Base):
+    """
+    Tabela rankingu graczy.
+
+    Przechowuje wyniki każdego gracza w każdej kategorii i łącznie (category '*'):
+    liczbę gier, wygranych, sumę błędów oraz wyliczone z nich procent wygranych
+    i średnią błędów. Jest aktualizowana przyrostowo przy zapisie każdej gry,
+    a indeks ix_leaderboard_rank jest ułożony w kolejności rankingu.
+    """
+    __tablename__ = "leaderboard"
+    category = Column(String, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    games = Column(Integer, nullable=False, default=0)
+    wins = Column(Integer, nullable=False, default=0)
+    mistakes = Column(Integer, nullable=False, default=0)
+    win_rate = Column(Float, nullable=False, default=0.0)
+    avg_mistakes = Column(Float, nullable=False, default=0.0)
+
+Index("ix_leaderboard_rank", Leaderboard.category, Leaderboard.wins.desc(), Leaderboard.win_rate.desc(),
+      Leaderboard.avg_mistakes, Leaderboard.user_id)
+
+class Session(Base):
+    """
+    Tabela sesji gry ciągłej (maratonu).
+
+    Przechowuje podsumowanie sesji: kategorię, tryb, czas rozpoczęcia i ostatniej
+    rundy, liczbę rund, wygranych, sumę błędów i najdłuższą serię wygranych.
+    Wiersz jest tworzony na początku sesji i aktualizowany po każdej rundzie.
+    """
+    __tablename__ = "sessions"
+    __table_args__ = (Index("ix_sessions_user_id_id", "user_id", "id"),)
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    category = Column(String, nullable=False)
+    mode = Column(String, nullable=False)
+    started_at = Column(String, nullable=False)
+    updated_at = Column(String, nullable=False)
+    rounds = Column(Integer, nullable=False, default=0)
+    wins = Column(Integer, nullable=False, default=0)
+    mistakes = Column(Integer, nullable=False, default=0)
+    best_streak = Column(Integer, nullable=False, default=0)
+
+class ActiveGame(Base):
+    """
+    Tabela gier w toku (co najwyżej jedna na użytkownika).
+
+    Przechowuje słowo, kategorię, tryb gry i litery klawiatury z chwili rozpoczęcia
+    gry (kolejność liter wyznacza bity maski w GuessLog). Wiersz jest usuwany,
+    gdy gra kończy się zapisem do tabeli 'games'.
+    """
+    __tablename__ = "active_games"
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    word = Column(String, nullable=False)
+    category = Column(String)
+    mode = Column(String, nullable=False)
+    letters = Column(String, nullable=False)
+
+class GuessLog(Base):
+    """
+    Dziennik ruchów gier w toku (tylko dopisywanie).
+
+    Każdy wiersz to jedna zgadnięta litera i maska wszystkich dotychczas użytych liter
+    (bit i - i-ta litera klawiatury gry), więc stan gry odtwarza się z ostatniego wiersza.
+    """
+    __tablename__ = "guess_log"
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    seq = Column(Integer, primary_key=True)
+    letter = Column(String, nullable=False)
+    mask = Column(Integer, nullable=False)
+
+class Word(Base):
+    """
+    Tabela słów używanych w grze.
+
+    Przechowuje słowa wraz z ich kategorią.
+    """
+    __tablename__ = "words"
+    __table_args__ = (Index("ix_words_category_word", "category", "word", unique=True),)
+    id = Column(Integer, primary_key=True)
+    word = Column(String, nullable=False)
+    category = Column(String, nullable=False)
+
+class Category(Base):
+    """
+    Tabela kategorii słów.
+
+    Przechowuje nazwę kategorii, liczbę słów w niej i alfabet kategorii (litery klawiatury
+    oraz mapę sprowadzania pozostałych liter, patrz alphabet.Alphabet). Jest przebudowywana
+    po każdej zmianie tabeli 'words' (import słownika).
+    """
+    __tablename__ = "categories"
+    name = Column(String, primary_key=True)
+    word_count = Column(Integer, nullable=False, default=0)
+    alphabet = Column(String)
+    folding = Column(String)
+
+class WordDifficulty(Base):
+    """
+    Tabela trudności słów.
+
+    Przechowuje ocenę trudności słowa na podstawie jego cech (lexical) i rozegranych
+    gier (games, wins, mistakes) oraz przedział trudności (band: 0 - łatwe, 1 - średnie,
+    2 - trudne) w obrębie kategorii. Wypełniana przez zadanie difficulty.update_difficulty.
+    """
+    __tablename__ = "word_difficulty"
+    __table_args__ = (Index("ix_word_difficulty_band", "band", "word_id"),)
+    word_id = Column(Integer, ForeignKey("words.id"), primary_key=True)
+    lexical = Column(Float, nullable=False)
+    games = Column(Integer, nullable=False, default=0)
+    wins = Column(Integer, nullable=False, default=0)
+    mistakes = Column(Integer, nullable=False, default=0)
+    score = Column(Float, nullable=False)
+    band = Column(Integer, nullable=False)
+
+class SolverResult(Base):
+    """
+    Tabela wyników oceny strategii zgadywania (moduł solver).
+
+    Każde uruchomienie zapisuje wiersz dla każdej pary strategia-kategoria
+    oraz podsumowanie strategii (category NULL).
+    """
+    __tablename__ = "solver_results"
+    __table_args__ = (Index("ix_solver_results_run_at", "run_at", "strategy"),)
+    id = Column(Integer, primary_key=True)
+    run_at = Column(String, nullable=False)
+    strategy = Column(String, nullable=False)
+    category = Column(String)
+    games = Column(Integer, nullable=False)
+    wins = Column(Integer, nullable=False)
+    mistakes = Column(Integer, nullable=False)
+    max_mistakes = Column(Integer, nullable=False)
+    seconds = Column(Float, nullable=False)
+
+class JobProgress(Base):
+    """
+    Tabela postępu zadań przyrostowych.
+
+    Przechowuje id ostatniego przetworzonego wiersza dla każdego zadania,
+    dzięki czemu kolejne uruchomienie zaczyna od nowych danych.
+    """
+    __tablename__ = "job_progress"
+    name = Column(String, primary_key=True)
+    last_id = Column(Integer, nullable=False, default=0)
+
+def create_indexes(engine):
+    """
+    Tworzy indeksy zdefiniowane w modelach, których brakuje w istniejącej bazie
+    (create_all tworzy je tylko razem z nową tabelą).
+    :param engine: silnik SQLAlchemy
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+
+def add_columns(engine):
+    """
+    Dodaje do istniejących tabel kolumny zdefiniowane w modelach, których w nich brakuje
+    (create_all nie zmienia istniejących tabel). Nowe kolumny przyjmują wartość NULL.
+    :param engine: silnik SQLAlchemy
+    """
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    column_type = column.type.compile(engine.dialect)
+                    conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+
+def autoincrement_games(engine):
+    """
+    Przebudowuje tabelę 'games' utworzoną bez AUTOINCREMENT (SQLite nadawał wtedy
+    nowym grom id gier usuniętych przy archiwizacji). Licznik id zaczyna się za
+    największym id w tabeli i za postępem zadań przyrostowych (job_progress).
+    :param engine: silnik SQLAlchemy
+    """
+    table = Game.__table__
+    with engine.begin() as conn:
+        sql = conn.execute(text("SELECT sql FROM sqlite_master WHERE type='table' AND name='games'")).scalar()
+        if sql is None or "AUTOINCREMENT" in sql.upper():
+            return
+        for index in table.indexes:
+            conn.execute(text(f"DROP INDEX IF EXISTS {index.name}"))
+        conn.execute(text("ALTER TABLE games RENAME TO games_old"))
+        table.create(conn)
+        columns = ", ".join(column.name for column in table.columns)
+        conn.execute(text(f"INSERT INTO games ({columns}) SELECT {columns} FROM games_old"))
+        conn.execute(text("DROP TABLE games_old"))
+        last_id = conn.execute(text("SELECT COALESCE(MAX(last_id), 0) FROM job_progress")).scalar()
+        for statement in database.GAMES_SEQUENCE_SQL:
+            conn.exec_driver_sql(statement, (last_id,))
+
+def migrate():
+    """
+    Tworzy brakujące tabele, kolumny i indeksy.
+    """
+    engine = get_engine()
+    Base.metadata.create_all(engine)
+    add_columns(engine)
+    autoincrement_games(engine)
+    create_indexes(engine)
@@ -0,0 +1,133 @@
+from abc import ABC, abstractmethod
+
+class Repository(ABC):
+    """
+    Interfejs magazynu danych gry: słowa, użytkownicy, gry (zakończone i w toku),
+    statystyki, ranking i sesje.
+
+    Implementują go api.LocalApi (SQLite), storage.MemoryApi i storage.SqlAlchemyApi;
+    klasa bez którejś z metod nie da się utworzyć (TypeError). Znaczenie argumentów
+    i wyników opisują odpowiadające metodom funkcje modułów auth i game.
+    """
+
+    # Słowa
+
+    @abstractmethod
+    def get_random_word(self, category=None, difficulty=None):
+        """
+        Losuje słowo z kategorii (opcjonalnie z przedziału trudności); None, jeśli brak słów.
+        """
+
+    @abstractmethod
+    def get_words(self, category):
+        """
+        Zwraca listę słów kategorii (wielkimi literami).
+        """
+
+    @abstractmethod
+    def get_categories(self):
+        """
+        Zwraca listę nazw kategorii (alfabetycznie).
+        """
+
+    @abstractmethod
+    def cached_categories(self):
+        """
+        Zwraca kategorie, jeśli są już w pamięci, bez dostępu do bazy; inaczej None.
+        """
+
+    @abstractmethod
+    def get_alphabet(self, category):
+        """
+        Zwraca alfabet kategorii (alphabet.Alphabet).
+        """
+
+    # Użytkownicy
+
+    @abstractmethod
+    def login(self, username, password):
+        """
+        Zwraca id użytkownika albo None, jeśli dane są nieprawidłowe.
+        """
+
+    @abstractmethod
+    def register(self, username, password):
+        """
+        Dodaje użytkownika; False, jeśli nazwa jest zajęta.
+        """
+
+    # Gry
+
+    @abstractmethod
+    def save_game(self, user_id, word, mistakes, won, category=None):
+        """
+        Zapisuje zakończoną grę (może trafić do bazy z opóźnieniem, patrz flush).
+        """
+
+    @abstractmethod
+    def start_progress(self, user_id, word, category, mode, letters):
+        """
+        Rozpoczyna zapisywanie gry w toku (zastępuje poprzednią grę użytkownika).
+        """
+
+    @abstractmethod
+    def save_guess(self, user_id, seq, letter, mask):
+        """
+        Dopisuje ruch do dziennika gry w toku.
+        """
+
+    @abstractmethod
+    def finish_game(self, user_id, word, mistakes, won, category=None):
+        """
+        Kończy grę w toku: zapisuje ją jak save_game i usuwa jej dziennik.
+        """
+
+    @abstractmethod
+    def get_progress(self, user_id):
+        """
+        Zwraca dict (word, category, mode, letters, mask) gry w toku albo None.
+        """
+
+    @abstractmethod
+    def flush(self):
+        """
+        Czeka, aż zaległe zapisy trafią do magazynu.
+        """
+
+    # Statystyki, ranking i sesje
+
+    @abstractmethod
+    def get_user_stats(self, user_id):
+        """
+        Zwraca dict (games, wins, mistakes, win_percentage, avg_mistakes).
+        """
+
+    @abstractmethod
+    def get_game_history(self, user_id, before_id=None, limit=100):
+        """
+        Zwraca stronę historii gier (id, word, mistakes, won) od najnowszych, starszych niż before_id.
+        """
+
+    @abstractmethod
+    def get_leaderboard(self, category=None, limit=10):
+        """
+        Zwraca czołówkę rankingu: krotki (miejsce, nazwa, gry, wygrane, % wygranych, średnia błędów).
+        """
+
+    @abstractmethod
+    def get_rank(self, user_id, category=None):
+        """
+        Zwraca dict z miejscem i wynikami gracza w rankingu albo None, jeśli nie grał.
+        """
+
+    @abstractmethod
+    def start_session(self, user_id, category, mode):
+        """
+        Rozpoczyna sesję gry ciągłej; zwraca jej id.
+        """
+
+    @abstractmethod
+    def update_session(self, user_id, session_id, rounds, wins, mistakes, best_streak):
+        """
+        Zapisuje podsumowanie sesji po rundzie.
+        """
@@ -0,0 +1,259 @@
+import asyncio
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from api import LocalApi
+from defaults import HOST, PORT, SERVER_WORKERS as WORKERS
+
+MAX_LINE = 64 * 1024
+MAX_HISTORY = 1000
+MAX_LEADERBOARD = 100
+
+log = logging.getLogger(__name__)
+
+class ProtocolError(Exception):
+    """
+    Błędne żądanie klienta (nieznana operacja, brak logowania, złe argumenty).
+    """
+
+class Session:
+    """
+    Stan jednego połączenia: zalogowany użytkownik.
+    """
+    __slots__ = ("user_id",)
+
+    def __init__(self):
+        self.user_id = None
+
+    def require_user(self):
+        """
+        Zwraca id zalogowanego użytkownika albo zgłasza ProtocolError.
+        """
+        if self.user_id is None:
+            raise ProtocolError("Wymagane logowanie")
+        return self.user_id
+
+class GameServer:
+    """
+    Serwer gry, do którego należy baza danych.
+
+    Protokół: każda linia to jeden obiekt JSON {"id": n, "op": nazwa, "args": {...}},
+    a odpowiedź to linia {"id": n, "ok": true, "result": ...} albo
+    {"id": n, "ok": false, "error": opis}. Żądania bez "id" nie dostają odpowiedzi
+    (np. zapis gry). Każde połączenie jest obsługiwane przez osobną korutynę,
+    a zapytania blokujące (baza, skróty haseł) trafiają do puli wątków.
+    Dane obsługuje magazyn danych (api.LocalApi albo magazyn z modułu storage).
+    Zapisy gier i ruchów gier w toku ze wszystkich połączeń idą przez jego wspólne
+    kolejki (np. game.game_writer i game.progress_writer), więc są zapisywane partiami.
+    """
+    OPS = ("login", "register", "random_word", "words", "categories", "alphabet", "save_game", "stats", "history",
+           "leaderboard", "rank", "start_session", "update_session", "start_progress", "save_guess",
+           "finish_game", "progress")
+
+    def __init__(self, host=HOST, port=PORT, workers=WORKERS, api=None):
+        """
+        Args:
+            host: Adres nasłuchiwania.
+            port: Port nasłuchiwania (0 - dowolny wolny).
+            workers: Liczba wątków wykonujących zapytania blokujące.
+            api: Magazyn danych (przygotowany); domyślnie lokalna baza SQLite (api.LocalApi).
+        """
+        self.api = api or LocalApi()
+        self.host = host
+        self.port = port
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hangman-server")
+        self.sessions = 0
+        self.server = None
+
+    async def start(self):
+        """
+        Wczytuje indeks słów i zaczyna nasłuchiwać. Po starcie self.port to faktyczny port.
+        """
+        await self.blocking(self.api.get_categories)
+        await self.blocking(self.api.get_random_word)
+        self.server = await asyncio.start_server(self.handle, self.host, self.port, limit=MAX_LINE)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        """
+        Uruchamia serwer i obsługuje połączenia do przerwania.
+        """
+        await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    def close(self):
+        """
+        Zamyka serwer, pulę wątków i zapisuje zaległe gry.
+        """
+        if self.server is not None:
+            self.server.close()
+        self.executor.shutdown(wait=True)
+        self.api.flush()
+
+    async def blocking(self, fn, *args):
+        """
+        Wykonuje funkcję blokującą w puli wątków.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(fn, *args))
+
+    async def handle(self, reader, writer):
+        """
+        Obsługuje jedno połączenie: czyta żądania linia po linii i odpowiada w tej samej kolejności.
+        """
+        session = Session()
+        self.sessions += 1
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+                    break
+                if not line:
+                    break
+                response = await self.process(session, line)
+                if response is not None:
+                    writer.write(json.dumps(response, ensure_ascii=False).encode() + b"\n")
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.sessions -= 1
+            writer.close()
+
+    async def process(self, session, line):
+        """
+        Wykonuje jedno żądanie.
+        :return: odpowiedź (dict) albo None dla żądań bez "id"
+        """
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            op = request.get("op")
+            if op not in self.OPS:
+                raise ProtocolError(f"Nieznana operacja: {op}")
+            result = await getattr(self, f"op_{op}")(session, **request.get("args", {}))
+            response = {"id": request_id, "ok": True, "result": result}
+        except (ProtocolError, TypeError, ValueError, AttributeError) as error:
+            response = {"id": request_id, "ok": False, "error": str(error)}
+        except Exception as error:
+            log.exception("Błąd obsługi żądania")
+            response = {"id": request_id, "ok": False, "error": f"Błąd serwera: {error}"}
+        if request_id is None:
+            if not response["ok"]:
+                log.warning("Żądanie bez odpowiedzi nie powiodło się: %s", response["error"])
+            return None
+        return response
+
+    async def op_login(self, session, username, password):
+        """
+        Loguje użytkownika i wiąże go z połączeniem.
+        """
+        session.user_id = await self.blocking(self.api.login, username, password)
+        return session.user_id
+
+    async def op_register(self, session, username, password):
+        """
+        Rejestruje nowego użytkownika.
+        """
+        return await self.blocking(self.api.register, username, password)
+
+    async def op_random_word(self, session, category=None, difficulty=None):
+        """
+        Losuje słowo z indeksu w pamięci (bez wątku i bez zapytania).
+        """
+        return self.api.get_random_word(category, difficulty)
+
+    async def op_words(self, session, category):
+        """
+        Zwraca wszystkie słowa kategorii (z indeksu w pamięci).
+        """
+        return await self.blocking(self.api.get_words, category)
+
+    async def op_categories(self, session):
+        """
+        Zwraca nazwy kategorii (z pamięci podręcznej, jeśli są).
+        """
+        categories = self.api.cached_categories()
+        if categories is None:
+            categories = await self.blocking(self.api.get_categories)
+        return categories
+
+    async def op_alphabet(self, session, category):
+        """
+        Zwraca alfabet kategorii jako [litery klawiatury, mapa sprowadzania liter].
+        """
+        alphabet = await self.blocking(self.api.get_alphabet, category)
+        return [alphabet.letters, alphabet.folding]
+
+    async def op_save_game(self, session, word, mistakes, won, category=None):
+        """
+        Dodaje grę zalogowanego użytkownika do kolejki zapisu partiami.
+        """
+        self.api.save_game(session.require_user(), word, mistakes, won, category)
+
+    async def op_stats(self, session):
+        """
+        Zwraca statystyki zalogowanego użytkownika.
+        """
+        return await self.blocking(self.api.get_user_stats, session.require_user())
+
+    async def op_history(self, session, before_id=None, limit=100):
+        """
+        Zwraca stronę historii gier zalogowanego użytkownika (co najwyżej MAX_HISTORY).
+        """
+        return await self.blocking(self.api.get_game_history, session.require_user(), before_id,
+                                   min(int(limit), MAX_HISTORY))
+
+    async def op_leaderboard(self, session, category=None, limit=10):
+        """
+        Zwraca czołówkę rankingu (co najwyżej MAX_LEADERBOARD graczy).
+        """
+        return await self.blocking(self.api.get_leaderboard, category, min(int(limit), MAX_LEADERBOARD))
+
+    async def op_rank(self, session, category=None):
+        """
+        Zwraca miejsce zalogowanego użytkownika w rankingu.
+        """
+        return await self.blocking(self.api.get_rank, session.require_user(), category)
+
+    async def op_start_session(self, session, category, mode):
+        """
+        Zakłada sesję gry ciągłej zalogowanego użytkownika.
+        """
+        return await self.blocking(self.api.start_session, session.require_user(), category, mode)
+
+    async def op_update_session(self, session, session_id, rounds, wins, mistakes, best_streak):
+        """
+        Zapisuje podsumowanie sesji gry ciągłej zalogowanego użytkownika.
+        """
+        await self.blocking(self.api.update_session, session.require_user(), session_id, rounds, wins, mistakes,
+                            best_streak)
+
+    async def op_start_progress(self, session, word, category, mode, letters):
+        """
+        Rozpoczyna zapisywanie gry w toku zalogowanego użytkownika (kolejka zapisu partiami).
+        """
+        self.api.start_progress(session.require_user(), word, category, mode, letters)
+
+    async def op_save_guess(self, session, seq, letter, mask):
+        """
+        Dopisuje ruch do dziennika gry w toku zalogowanego użytkownika.
+        """
+        self.api.save_guess(session.require_user(), seq, letter, mask)
+
+    async def op_finish_game(self, session, word, mistakes, won, category=None):
+        """
+        Kończy grę w toku zalogowanego użytkownika i zapisuje ją w historii.
+        """
+        self.api.finish_game(session.require_user(), word, mistakes, won, category)
+
+    async def op_progress(self, session):
+        """
+        Zwraca niedokończoną grę zalogowanego użytkownika albo None.
+        """
+        return await self.blocking(self.api.get_progress, session.require_user())
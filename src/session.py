@@ -0,0 +1,127 @@
+import random
+
+from alphabet import Alphabet
+from engine import HangmanGame, MAX_MISTAKES
+
+def restore_game(progress, alphabet=None, max_mistakes=MAX_MISTAKES):
+    """
+    Odtwarza niedokończoną grę z zapisanego stanu (patrz game.get_progress): litery
+    z maski użytych liter są zgadywane ponownie, w kolejności klawiatury.
+    :param progress: dict z kluczami word, letters, mask
+    :param alphabet: bieżący alfabet kategorii (dla mapy sprowadzania liter)
+    :param max_mistakes: dozwolona liczba błędów
+    :return: krotka (HangmanGame, Alphabet gry)
+    """
+    folding = alphabet.folding if alphabet is not None else ""
+    alphabet = Alphabet(progress["letters"], folding)
+    game = HangmanGame(progress["word"], max_mistakes, alphabet)
+    for letter in alphabet.unmask(progress["mask"]):
+        game.guess(letter)
+    return game, alphabet
+
+class WordQueue:
+    """
+    Słowa kategorii w losowej kolejności, bez powtórzeń do wyczerpania kategorii.
+
+    Kolejność jest wyznaczana leniwie (tasowanie Fishera-Yatesa wykonywane po jednym
+    kroku przy każdym losowaniu), a przestawione pozycje są trzymane w słowniku,
+    więc utworzenie kolejki nie kopiuje ani nie tasuje listy słów, a losowanie
+    działa w czasie O(1) niezależnie od wielkości kategorii. Po wyczerpaniu
+    kategorii zaczyna się nowa kolejność.
+    """
+    __slots__ = ("words", "rng", "_swaps", "_remaining", "_last")
+
+    def __init__(self, words, rng=None):
+        """
+        Args:
+            words: Lista słów kategorii (nie jest modyfikowana).
+            rng: Generator liczb losowych (random.Random); domyślnie nowy.
+        """
+        self.words = words
+        self.rng = rng or random.Random()
+        self._swaps = {}
+        self._remaining = len(words)
+        self._last = None
+
+    def __len__(self):
+        """
+        Liczba słów, które zostały do końca bieżącej kolejności.
+        """
+        return self._remaining
+
+    def next(self):
+        """
+        Zwraca kolejne słowo; None, jeśli kategoria jest pusta.
+        """
+        if not self.words:
+            return None
+        if self._remaining == 0:
+            self._swaps.clear()
+            self._remaining = len(self.words)
+        last = self._remaining - 1
+        i = self.rng.randrange(self._remaining)
+        # Nowa kolejność nie zaczyna się od słowa, które właśnie było.
+        if self._last is not None and last > 0 and self._swaps.get(i, i) == self._last:
+            i = last if i != last else self.rng.randrange(last)
+        chosen = self._swaps.get(i, i)
+        if i != last:
+            self._swaps[i] = self._swaps.pop(last, last)
+        else:
+            self._swaps.pop(last, None)
+        self._remaining = last
+        self._last = chosen
+        return self.words[chosen]
+
+class Marathon:
+    """
+    Sesja gry ciągłej (maraton): kolejka słów kategorii i wyniki sesji.
+
+    Podsumowanie sesji (rundy, wygrane, błędy, najdłuższa seria wygranych)
+    jest zapisywane w tabeli 'sessions' po każdej rundzie.
+    """
+    def __init__(self, session_id, category, words, alphabet=None, rng=None):
+        """
+        Args:
+            session_id: Id sesji w tabeli 'sessions'.
+            category: Nazwa kategorii.
+            words: Lista słów kategorii.
+            alphabet: Alfabet kategorii (alphabet.Alphabet).
+            rng: Generator liczb losowych kolejki słów.
+        """
+        self.session_id = session_id
+        self.category = category
+        self.alphabet = alphabet
+        self.queue = WordQueue(words, rng)
+        self.rounds = 0
+        self.wins = 0
+        self.mistakes = 0
+        self.streak = 0
+        self.best_streak = 0
+
+    def record(self, won, mistakes):
+        """
+        Dolicza wynik zakończonej rundy.
+
+        Args:
+            won: Czy runda została wygrana.
+            mistakes: Liczba błędów w rundzie.
+        """
+        self.rounds += 1
+        self.wins += bool(won)
+        self.mistakes += mistakes
+        self.streak = self.streak + 1 if won else 0
+        self.best_streak = max(self.best_streak, self.streak)
+
+    def summary(self):
+        """
+        Zwraca wyniki sesji w postaci zapisywanej w bazie.
+
+        Returns:
+            dict: rounds, wins, mistakes, best_streak.
+        """
+        return {
+            "rounds": self.rounds,
+            "wins": self.wins,
+            "mistakes": self.mistakes,
+            "best_streak": self.best_streak,
+        }
@@ -0,0 +1,90 @@
+import random
+import time
+from collections import Counter
+
+from alphabet import Alphabet
+from defaults import SIMULATION_STRATEGIES as STRATEGIES
+from engine import HangmanGame, MAX_MISTAKES
+
+def words_alphabet(words):
+    """
+    Wyznacza alfabet z liter użytych w słowach (jak alfabet kategorii przy imporcie).
+    :param words: lista słów (wielkimi literami)
+    :return: alphabet.Alphabet
+    """
+    return Alphabet.derive(set().union(*words))
+
+def letter_order(words, alphabet):
+    """
+    Zwraca litery klawiatury posortowane od najczęściej występujących w słowach
+    (litera liczona raz na słowo). Litery alfabetu, których nie ma w słowach, są na końcu.
+    :param words: lista słów
+    :param alphabet: alfabet słów (alphabet.Alphabet); litery są liczone po sprowadzeniu do klawiszy
+    :return: napis z literami w kolejności zgadywania
+    """
+    keys = set(alphabet.letters)
+    counts = Counter()
+    for word in words:
+        counts.update(keys.intersection(alphabet.fold(word)))
+    order = [letter for letter, _ in counts.most_common()]
+    return "".join(order) + "".join(letter for letter in alphabet.letters if letter not in counts)
+
+def play(word, order, max_mistakes=MAX_MISTAKES, alphabet=None):
+    """
+    Rozgrywa jedną grę, zgadując litery w podanej kolejności.
+    :param word: słowo do odgadnięcia
+    :param order: kolejność zgadywanych liter
+    :param alphabet: alfabet słowa (alphabet.Alphabet); None - litery porównywane wprost
+    :return: zakończona gra (HangmanGame)
+    """
+    game = HangmanGame(word, max_mistakes, alphabet)
+    guess = game.guess
+    for letter in order:
+        guess(letter)
+        if game.hidden == 0 or game.mistakes >= max_mistakes:
+            break
+    return game
+
+def simulate(words, games, strategy="frequency", seed=None, max_mistakes=MAX_MISTAKES, alphabet=None):
+    """
+    Rozgrywa wiele gier bez interfejsu na słowach losowanych z listy.
+    :param words: lista słów (wielkimi literami)
+    :param games: liczba gier
+    :param strategy: 'frequency' - litery od najczęstszych, 'random' - losowa kolejność w każdej grze
+    :param seed: ziarno generatora liczb losowych
+    :param max_mistakes: dozwolona liczba błędów
+    :param alphabet: alfabet słów (alphabet.Alphabet); None - wyznaczony z liter słów
+    :return: dict z liczbą gier, wygranych, sumą błędów, czasem i liczbą gier na sekundę
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Nieznana strategia: {strategy}")
+    if not words:
+        raise ValueError("Brak słów do symulacji")
+
+    if alphabet is None:
+        alphabet = words_alphabet(words)
+    rng = random.Random(seed)
+    order = letter_order(words, alphabet)
+    letters = list(alphabet.letters)
+    wins = 0
+    mistakes = 0
+
+    start = time.perf_counter()
+    for word in rng.choices(words, k=games):
+        if strategy == "random":
+            rng.shuffle(letters)
+            order = letters
+        game = play(word, order, max_mistakes, alphabet)
+        wins += game.hidden == 0
+        mistakes += game.mistakes
+    seconds = time.perf_counter() - start
+
+    return {
+        "games": games,
+        "wins": wins,
+        "mistakes": mistakes,
+        "win_percentage": wins / games * 100 if games else 0.0,
+        "avg_mistakes": mistakes / games if games else 0.0,
+        "seconds": seconds,
+        "games_per_second": games / seconds if seconds > 0 else 0.0,
+    }
@@ -0,0 +1,307 @@
+import math
+import random
+import time
+from collections import Counter
+
+from alphabet import Alphabet
+from database import ALL_CATEGORIES, get_connection
+from defaults import SOLVER_STRATEGIES as STRATEGIES, SOLVER_WORKERS as WORKERS
+from engine import MAX_MISTAKES
+from simulation import words_alphabet
+
+CHUNK_GAMES = 20000
+BEST_CACHE_SIZE = 200000    # limit zapamiętanych stanów na słownik (klucze to duże maski)
+
+SAVE_RESULT_SQL = """
+    INSERT INTO solver_results (run_at, strategy, category, games, wins, mistakes, max_mistakes, seconds)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+def _bitset(indices, size):
+    """
+    Buduje liczbę całkowitą z ustawionymi bitami o podanych numerach (w czasie O(size)).
+    """
+    data = bytearray((size + 7) // 8)
+    for i in indices:
+        data[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(data, "little")
+
+def _indices(bits):
+    """
+    Zwraca numery ustawionych bitów liczby (od najmłodszego).
+    """
+    indices = []
+    while bits:
+        low = bits & -bits
+        indices.append(low.bit_length() - 1)
+        bits ^= low
+    return indices
+
+def _shape(word):
+    """
+    Zwraca układ słowa widoczny na początku gry: litery jako '_', pozostałe znaki
+    (spacja, myślnik) bez zmian, jak odsłania je engine.HangmanGame.
+    """
+    return "".join("_" if letter.isalpha() else letter for letter in word)
+
+class Dictionary:
+    """
+    Słowa jednego układu (długość i pozycje znaków niebędących literami) zapisane
+    jako maski bitowe.
+
+    Litery słów są sprowadzane do klawiszy alfabetu (alphabet.Alphabet.fold), a znaki
+    niebędące literami są pomijane, bo gra odsłania je od początku.
+
+    Bit i odpowiada i-temu słowu. Dla każdej litery i układu jej pozycji w słowie
+    (maska pozycji, 0 - brak litery) przechowywany jest zbiór pasujących słów, więc
+    zawężenie kandydatów po odpowiedzi to jedno AND na dużych liczbach, a liczenie
+    kandydatów - int.bit_count(). Najlepsze litery dla danego stanu są zapamiętywane.
+    """
+    __slots__ = ("words", "index", "full", "letters", "letter_bits", "letter_masks", "patterns",
+                 "word_patterns", "_best")
+
+    def __init__(self, words, alphabet):
+        """
+        Args:
+            words: Lista różnych słów tego samego układu (wielkimi literami).
+            alphabet: Alfabet słów (alphabet.Alphabet); jego litery to zgadywane klawisze.
+        """
+        self.words = words
+        self.index = {word: i for i, word in enumerate(words)}
+        self.full = (1 << len(words)) - 1
+        folded = [alphabet.fold(word) for word in words]
+        self.letters = list(alphabet.letters)
+        self.letters += sorted({letter for word in folded for letter in word
+                                if letter.isalpha() and letter not in alphabet.bits})
+        self.letter_bits = {letter: 1 << i for i, letter in enumerate(self.letters)}
+
+        positions = {letter: {} for letter in self.letters}
+        self.word_patterns = []
+        for i, word in enumerate(folded):
+            pattern = {}
+            for j, letter in enumerate(word):
+                if letter.isalpha():
+                    pattern[letter] = pattern.get(letter, 0) | (1 << j)
+            for letter, mask in pattern.items():
+                positions[letter].setdefault(mask, []).append(i)
+            self.word_patterns.append(pattern)
+
+        self.patterns = {}
+        self.letter_masks = {}
+        for letter, masks in positions.items():
+            sets = {mask: _bitset(indices, len(words)) for mask, indices in masks.items()}
+            present = 0
+            for bits in sets.values():
+                present |= bits
+            sets[0] = self.full & ~present
+            self.patterns[letter] = sets
+            self.letter_masks[letter] = present
+        self._best = {}
+
+    def best_letters(self, strategy, candidates, guessed):
+        """
+        Zwraca najlepsze (równie dobre) litery do zgadnięcia w danym stanie.
+        :param strategy: 'frequency' albo 'entropy'
+        :param candidates: maska słów zgodnych z dotychczasowymi odpowiedziami
+        :param guessed: maska już zgadywanych liter (bit i - self.letters[i])
+        :return: krotka liter
+        """
+        cache = self._best.setdefault(strategy, {})
+        best = cache.get((candidates, guessed))
+        if best is None:
+            total = candidates.bit_count()
+            indices = None
+            scores = {}
+            for i, letter in enumerate(self.letters):
+                if guessed >> i & 1:
+                    continue
+                count = (candidates & self.letter_masks[letter]).bit_count()
+                if strategy == "entropy":
+                    # Rozkład odpowiedzi: przy małej liczbie kandydatów taniej policzyć go
+                    # po słowach niż przez AND z maską każdego układu pozycji litery.
+                    sets = self.patterns[letter]
+                    if count == 0:
+                        parts = ()
+                    elif total <= len(sets):
+                        if indices is None:
+                            indices = _indices(candidates)
+                        parts = Counter(self.word_patterns[j].get(letter, 0) for j in indices).values()
+                    else:
+                        parts = [(candidates & bits).bit_count() for bits in sets.values()]
+                    entropy = 0.0
+                    for part in parts:
+                        if part:
+                            entropy -= part / total * math.log2(part / total)
+                    scores[letter] = (round(entropy, 9), count)
+                else:
+                    scores[letter] = count
+            top = max(scores.values())
+            if len(cache) >= BEST_CACHE_SIZE:
+                cache.clear()
+            best = cache[candidates, guessed] = tuple(letter for letter, score in scores.items() if score == top)
+        return best
+
+    def play(self, word, strategy, rng, max_mistakes=MAX_MISTAKES):
+        """
+        Rozgrywa jedną grę na zasadach HangmanApp.zgadnij_litere (max_mistakes błędów).
+        Remisy między literami są rozstrzygane losowo.
+        :param word: słowo do odgadnięcia (ze słownika)
+        :return: krotka (czy wygrana, liczba błędów)
+        """
+        pattern = self.word_patterns[self.index[word]]
+        cache = self._best.setdefault(strategy, {})
+        bits = self.letter_bits
+        patterns = self.patterns
+        random_ = rng.random
+        candidates = self.full
+        guessed = 0
+        hidden = len(pattern)
+        mistakes = 0
+        while True:
+            options = cache.get((candidates, guessed))
+            if options is None:
+                options = self.best_letters(strategy, candidates, guessed)
+            letter = options[0] if len(options) == 1 else options[int(random_() * len(options))]
+            guessed |= bits[letter]
+            mask = pattern.get(letter, 0)
+            candidates &= patterns[letter][mask]
+            if mask:
+                hidden -= 1
+                if hidden == 0:
+                    return True, mistakes
+            else:
+                mistakes += 1
+                if mistakes >= max_mistakes:
+                    return False, mistakes
+
+_words = {}
+_alphabets = {}
+_dictionaries = {}
+
+def _init_worker(words_by_category, alphabets):
+    """
+    Zapamiętuje słowa i alfabety w procesie roboczym; słowniki masek są budowane
+    przy pierwszym użyciu.
+    """
+    global _words, _alphabets
+    _words = words_by_category
+    _alphabets = alphabets
+    _dictionaries.clear()
+
+def _dictionary(scope, shape):
+    """
+    Zwraca słownik masek słów danego układu z kategorii (albo ze wszystkich kategorii).
+    """
+    key = (scope, shape)
+    dictionary = _dictionaries.get(key)
+    if dictionary is None:
+        if scope == ALL_CATEGORIES:
+            words = {word for category_words in _words.values() for word in category_words if _shape(word) == shape}
+        else:
+            words = {word for word in _words[scope] if _shape(word) == shape}
+        dictionary = _dictionaries[key] = Dictionary(sorted(words), _alphabets[scope])
+    return dictionary
+
+def _run_batch(strategy, category, games, seed, max_mistakes):
+    """
+    Rozgrywa 'games' gier na słowach losowanych z kategorii. Wywoływane w procesie roboczym.
+    Strategie 'frequency' i 'entropy' nie znają kategorii (słownik i alfabet całej bazy),
+    a 'category' zgaduje częstymi literami ze słownika i alfabetu kategorii.
+    :return: krotka (gry, wygrane, suma błędów)
+    """
+    rng = random.Random(seed)
+    words = _words[category]
+    scope = category if strategy == "category" else ALL_CATEGORIES
+    letter_strategy = "frequency" if strategy == "category" else strategy
+    wins = 0
+    mistakes = 0
+    for word in rng.choices(words, k=games):
+        won, game_mistakes = _dictionary(scope, _shape(word)).play(word, letter_strategy, rng, max_mistakes)
+        wins += won
+        mistakes += game_mistakes
+    return games, wins, mistakes
+
+def solve(words_by_category, games, strategies=STRATEGIES, workers=WORKERS, seed=None,
+          max_mistakes=MAX_MISTAKES, chunk=CHUNK_GAMES, alphabets=None):
+    """
+    Ocenia strategie zgadywania metodą Monte Carlo w puli procesów. Gry każdej strategii
+    są dzielone po równo między kategorie i na partie po 'chunk' gier.
+    :param words_by_category: dict {kategoria: lista słów wielkimi literami}
+    :param games: liczba gier na strategię
+    :param strategies: oceniane strategie (patrz STRATEGIES)
+    :param workers: liczba procesów; 0 - wszystko w bieżącym procesie
+    :param seed: ziarno generatora liczb losowych
+    :param alphabets: dict {kategoria: alphabet.Alphabet}; brakujące są wyznaczane z liter słów
+    :return: lista dict (strategy, category, games, wins, mistakes, win_percentage,
+        avg_mistakes, seconds); category None oznacza podsumowanie strategii
+    """
+    for strategy in strategies:
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Nieznana strategia: {strategy}")
+    categories = [category for category, words in words_by_category.items() if words]
+    if not categories:
+        raise ValueError("Brak słów do symulacji")
+    alphabets = dict(alphabets or {})
+    for category in categories:
+        if category not in alphabets:
+            alphabets[category] = words_alphabet(words_by_category[category])
+    alphabets[ALL_CATEGORIES] = Alphabet.derive(set().union(*(alphabets[c].used_letters() for c in categories)))
+
+    rng = random.Random(seed)
+    tasks = []
+    for strategy in strategies:
+        for i, category in enumerate(categories):
+            category_games = games // len(categories) + (i < games % len(categories))
+            for start in range(0, category_games, chunk):
+                tasks.append((strategy, category, min(chunk, category_games - start), rng.getrandbits(64)))
+
+    start = time.perf_counter()
+    if workers > 0:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                                 initializer=_init_worker, initargs=(words_by_category, alphabets)) as pool:
+            futures = [pool.submit(_run_batch, *task, max_mistakes) for task in tasks]
+            outcomes = [future.result() for future in futures]
+    else:
+        _init_worker(words_by_category, alphabets)
+        outcomes = [_run_batch(*task, max_mistakes) for task in tasks]
+    seconds = time.perf_counter() - start
+
+    totals = {}
+    for (strategy, category, _, _), outcome in zip(tasks, outcomes):
+        for key in ((strategy, category), (strategy, None)):
+            total = totals.setdefault(key, [0, 0, 0])
+            for j, value in enumerate(outcome):
+                total[j] += value
+
+    return [
+        {
+            "strategy": strategy,
+            "category": category,
+            "games": played,
+            "wins": wins,
+            "mistakes": mistakes,
+            "win_percentage": wins / played * 100 if played else 0.0,
+            "avg_mistakes": mistakes / played if played else 0.0,
+            "max_mistakes": max_mistakes,
+            "seconds": seconds,
+        }
+        for (strategy, category), (played, wins, mistakes) in totals.items()
+    ]
+
+def save_results(results):
+    """
+    Zapisuje wyniki jednego uruchomienia w jednej transakcji (executemany).
+    :param results: lista dict zwrócona przez solve()
+    :return: znacznik czasu uruchomienia (run_at)
+    """
+    from datetime import datetime, timezone
+
+    run_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    rows = [(run_at, r["strategy"], r["category"], r["games"], r["wins"], r["mistakes"],
+             r["max_mistakes"], r["seconds"]) for r in results]
+    with get_connection() as conn:
+        conn.cursor().executemany(SAVE_RESULT_SQL, rows)
+    return run_at
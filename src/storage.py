@@ -0,0 +1,790 @@
+import base64
+import bisect
+import hashlib
+import heapq
+import hmac
+import os
+import random
+import threading
+import time
+
+import auth
+from alphabet import Alphabet, DEFAULT_ALPHABET
+from database import ALL_CATEGORIES, DB_NAME, WORDS_FILE
+from defaults import BACKENDS
+from repository import Repository
+from word_index import DIFFICULTIES, DEFAULT_BAND
+from writer import GameWriter
+
+DEFAULT_URL = f"sqlite:///{DB_NAME}"
+IMPORT_BATCH = 10000
+
+def open_storage(backend="sqlite", db=None):
+    """
+    Tworzy magazyn danych gry wybrany w konfiguracji. Każdy magazyn implementuje
+    repository.Repository (słowa, użytkownicy, gry, gry w toku, statystyki i ranking).
+    :param backend: 'sqlite' - baza SQLite przez pulę połączeń (api.LocalApi),
+        'memory' - dane tylko w pamięci procesu (MemoryApi),
+        'sqlalchemy' - dowolna baza obsługiwana przez SQLAlchemy, np. PostgreSQL (SqlAlchemyApi)
+    :param db: dla 'sqlite' ścieżka pliku bazy, dla 'sqlalchemy' adres bazy
+        (np. postgresql://user@host/hangman); None - domyślna baza
+    :return: krotka (api, funkcja przygotowująca dane, funkcja zamykająca)
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Nieznany magazyn danych: {backend}")
+    if backend == "sqlite":
+        import database
+        from api import LocalApi
+        from game import close_writers
+
+        if db:
+            database.configure_db(db)
+        return LocalApi(), database.init_db, close_writers
+    if backend == "memory":
+        api = MemoryApi()
+    else:
+        api = SqlAlchemyApi(db or DEFAULT_URL)
+    return api, api.init, api.close
+
+def _stats(games, wins, mistakes):
+    """
+    Buduje podsumowanie statystyk gracza w postaci zwracanej przez game.get_user_stats.
+    """
+    return {
+        "games": games,
+        "wins": wins,
+        "mistakes": mistakes,
+        "win_percentage": wins / games * 100 if games else 0.0,
+        "avg_mistakes": mistakes / games if games else 0.0,
+    }
+
+class FastHasher:
+    """
+    Tani solony skrót haseł (SHA-256) liczony w bieżącym wątku, z tymi samymi metodami
+    co moduł auth (hash_password, verify_password).
+
+    Dla magazynów, których dane istnieją tylko do końca programu (MemoryApi w symulacjach
+    i testach): scrypt w puli procesów kosztowałby przy każdym logowaniu start procesu
+    i wyliczenie klucza. Nie nadaje się do haseł zapisywanych na stałe.
+    """
+    SCHEME = "sha256"
+
+    def hash_password(self, password):
+        """
+        Patrz auth.hash_password.
+        """
+        salt = os.urandom(auth.SALT_SIZE)
+        digest = hashlib.sha256(salt + password.encode()).digest()
+        return f"{self.SCHEME}${base64.b64encode(salt).decode('ascii')}${base64.b64encode(digest).decode('ascii')}"
+
+    def verify_password(self, password, stored):
+        """
+        Patrz auth.verify_password; skrót nigdy nie wymaga przeliczenia.
+        """
+        scheme, salt, digest = stored.split("$")
+        if scheme != self.SCHEME:
+            raise ValueError(f"Nieznany format skrótu hasła: {scheme}")
+        computed = hashlib.sha256(base64.b64decode(salt) + password.encode()).digest()
+        return hmac.compare_digest(computed, base64.b64decode(digest)), False
+
+def _now():
+    """
+    Zwraca bieżący czas UTC w formacie datetime('now') z SQLite.
+    """
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
+
+class _WordCache:
+    """
+    Słowa, przedziały trudności i alfabety kategorii trzymane w pamięci
+    (jak word_index.WordIndex, ale wypełniane przez magazyn danych).
+    """
+    def __init__(self):
+        self._words = None
+        self._bands = {}
+        self._alphabets = {}
+        self._words_lock = threading.Lock()
+
+    def _set_words(self, rows, alphabets=None):
+        """
+        Zapamiętuje słowa kategorii. Alfabety kategorii, których nie podano,
+        są wyznaczane z liter słów.
+        :param rows: krotki (word, category, band) w kolejności id; band None - bez oceny
+        :param alphabets: dict {kategoria: Alphabet} zapisany w bazie
+        """
+        words = {}
+        bands = {}
+        letters = {}
+        for word, category, band in rows:
+            word = word.upper()
+            words.setdefault(category, []).append(word)
+            category_bands = bands.get(category)
+            if category_bands is None:
+                category_bands = bands[category] = [[] for _ in DIFFICULTIES]
+            category_bands[DEFAULT_BAND if band is None else band].append(word)
+            letters.setdefault(category, set()).update(word)
+        alphabets = dict(alphabets or {})
+        for category, category_letters in letters.items():
+            if category not in alphabets:
+                alphabets[category] = Alphabet.derive(category_letters)
+        with self._words_lock:
+            self._words = dict(sorted(words.items()))
+            self._bands = bands
+            self._alphabets = alphabets
+
+    def _loaded_words(self):
+        """
+        Zwraca słowa kategorii; zgłasza błąd, jeśli magazyn nie został przygotowany (init).
+        """
+        words = self._words
+        if words is None:
+            raise RuntimeError("Magazyn danych nie jest przygotowany (brak wywołania init)")
+        return words
+
+    def get_random_word(self, category=None, difficulty=None):
+        """
+        Patrz game.get_random_word.
+        """
+        words = None
+        if difficulty is not None:
+            if difficulty not in DIFFICULTIES:
+                raise ValueError(f"Nieznany poziom trudności: {difficulty}")
+            bands = self._bands.get(category)
+            words = bands[DIFFICULTIES.index(difficulty)] if bands is not None else None
+        if not words:
+            words = self._loaded_words().get(category)
+        return random.choice(words) if words else None
+
+    def get_words(self, category):
+        """
+        Patrz game.get_words.
+        """
+        return self._loaded_words().get(category, [])
+
+    def get_categories(self):
+        """
+        Patrz game.get_categories.
+        """
+        return list(self._loaded_words())
+
+    def cached_categories(self):
+        """
+        Patrz game.cached_categories.
+        """
+        words = self._words
+        return list(words) if words is not None else None
+
+    def get_alphabet(self, category):
+        """
+        Patrz game.get_alphabet.
+        """
+        return self._alphabets.get(category, DEFAULT_ALPHABET)
+
+class MemoryApi(_WordCache, Repository):
+    """
+    Magazyn danych gry w pamięci procesu (bez bazy danych).
+
+    Słowa są wczytywane z pliku słownika, a użytkownicy, gry, gry w toku, sesje
+    i ranking istnieją tylko do końca działania programu. Zapisy są natychmiastowe
+    (bez kolejki i transakcji), a hasła domyślnie mają tani skrót (FastHasher),
+    więc magazyn nadaje się do symulacji i testów. Gry bez zalogowanego gracza
+    nie są zapamiętywane. Słowa nie mają ocen trudności - wszystkie należą
+    do przedziału średniego.
+    """
+    def __init__(self, words_file=WORDS_FILE, hasher=None):
+        """
+        Args:
+            words_file: Plik słownika wczytywany przez init (format jak w importer.iter_words).
+            hasher: Obiekt z metodami hash_password i verify_password (jak moduł auth);
+                domyślnie FastHasher.
+        """
+        super().__init__()
+        self.words_file = words_file
+        self.hasher = hasher or FastHasher()
+        self._lock = threading.Lock()
+        self._users = {}        # username -> [id, skrót hasła]
+        self._usernames = {}    # id -> username
+        self._next_game_id = 1
+        self._history = {}      # user_id -> lista (id, word, mistakes, won) rosnąco po id
+        self._stats = {}        # user_id -> [games, wins, mistakes]
+        self._ranking = {}      # kategoria -> {user_id: [games, wins, mistakes]}
+        self._active = {}       # user_id -> dict jak w get_progress (bez maski)
+        self._log = {}          # user_id -> {seq: (letter, mask)}
+        self._sessions = {}     # id -> dict z user_id i podsumowaniem sesji
+
+    def init(self):
+        """
+        Wczytuje słowa z pliku słownika (duplikaty w kategorii są pomijane).
+        """
+        from importer import iter_words
+
+        seen = set()
+        rows = []
+        for row in iter_words(self.words_file):
+            key = (row["category"], row["word"])
+            if key not in seen:
+                seen.add(key)
+                rows.append((row["word"], row["category"], None))
+        self._set_words(rows)
+
+    def flush(self):
+        """
+        Zapisy są natychmiastowe - nic do zrobienia.
+        """
+
+    def close(self):
+        """
+        Dane nie są nigdzie zapisywane - nic do zrobienia.
+        """
+
+    def login(self, username, password):
+        """
+        Patrz auth.login.
+        """
+        with self._lock:
+            user = self._users.get(username)
+        if user is None:
+            return None
+        ok, needs_rehash = self.hasher.verify_password(password, user[1])
+        if not ok:
+            return None
+        if needs_rehash:
+            user[1] = self.hasher.hash_password(password)
+        return user[0]
+
+    def register(self, username, password):
+        """
+        Patrz auth.register.
+        """
+        password_hash = self.hasher.hash_password(password)
+        with self._lock:
+            if username in self._users:
+                return False
+            user_id = len(self._users) + 1
+            self._users[username] = [user_id, password_hash]
+            self._usernames[user_id] = username
+        return True
+
+    def _record(self, user_id, word, mistakes, won, category, guesses=None):
+        """
+        Dopisuje grę do historii i podsumowań (gry bez zalogowanego gracza są pomijane,
+        jak w game._update_summaries). Wywoływane z założoną blokadą.
+        """
+        game_id = self._next_game_id
+        self._next_game_id += 1
+        if user_id is None:
+            return
+        self._history.setdefault(user_id, []).append((game_id, word, mistakes, int(won)))
+        keys = [(self._stats, user_id), (self._ranking.setdefault(ALL_CATEGORIES, {}), user_id)]
+        if category is not None:
+            keys.append((self._ranking.setdefault(category, {}), user_id))
+        for table, key in keys:
+            totals = table.get(key)
+            if totals is None:
+                totals = table[key] = [0, 0, 0]
+            totals[0] += 1
+            totals[1] += bool(won)
+            totals[2] += mistakes
+
+    def save_game(self, user_id, word, mistakes, won, category=None):
+        """
+        Patrz game.save_game.
+        """
+        with self._lock:
+            self._record(user_id, word, mistakes, won, category)
+
+    def start_progress(self, user_id, word, category, mode, letters):
+        """
+        Patrz game.start_progress.
+        """
+        with self._lock:
+            self._active[user_id] = {"word": word, "category": category, "mode": mode, "letters": letters}
+            self._log[user_id] = {}
+
+    def save_guess(self, user_id, seq, letter, mask):
+        """
+        Patrz game.save_guess.
+        """
+        with self._lock:
+            self._log.setdefault(user_id, {}).setdefault(seq, (letter, mask))
+
+    def finish_game(self, user_id, word, mistakes, won, category=None):
+        """
+        Patrz game.finish_game.
+        """
+        with self._lock:
+            log = self._log.pop(user_id, {})
+            self._active.pop(user_id, None)
+            guesses = "".join(log[seq][0] for seq in sorted(log))
+            self._record(user_id, word, mistakes, won, category, guesses)
+
+    def get_progress(self, user_id):
+        """
+        Patrz game.get_progress.
+        """
+        with self._lock:
+            active = self._active.get(user_id)
+            if active is None:
+                return None
+            log = self._log.get(user_id)
+            mask = log[max(log)][1] if log else 0
+            return dict(active, mask=mask)
+
+    def get_user_stats(self, user_id):
+        """
+        Patrz game.get_user_stats.
+        """
+        with self._lock:
+            return _stats(*self._stats.get(user_id, (0, 0, 0)))
+
+    def get_game_history(self, user_id, before_id=None, limit=100):
+        """
+        Patrz game.get_game_history.
+        """
+        with self._lock:
+            games = self._history.get(user_id, [])
+            end = len(games) if before_id is None else bisect.bisect_left(games, (before_id,))
+            return games[max(end - limit, 0):end][::-1]
+
+    @staticmethod
+    def _rank_key(item):
+        """
+        Klucz kolejności rankingu (jak indeks ix_leaderboard_rank).
+        """
+        user_id, (games, wins, mistakes) = item
+        return -wins, -wins / games, mistakes / games, user_id
+
+    def get_leaderboard(self, category=None, limit=10):
+        """
+        Patrz game.get_leaderboard.
+        """
+        with self._lock:
+            ranking = self._ranking.get(category or ALL_CATEGORIES, {})
+            top = heapq.nsmallest(limit, ranking.items(), key=self._rank_key)
+            return [(place, self._usernames.get(user_id), games, wins, wins / games * 100, mistakes / games)
+                    for place, (user_id, (games, wins, mistakes)) in enumerate(top, 1)]
+
+    def get_rank(self, user_id, category=None):
+        """
+        Patrz game.get_rank.
+        """
+        with self._lock:
+            ranking = self._ranking.get(category or ALL_CATEGORIES, {})
+            totals = ranking.get(user_id)
+            if totals is None:
+                return None
+            key = self._rank_key((user_id, totals))
+            above = sum(1 for item in ranking.items() if self._rank_key(item) < key)
+        games, wins, mistakes = totals
+        return {
+            "rank": above + 1,
+            "games": games,
+            "wins": wins,
+            "win_percentage": wins / games * 100,
+            "avg_mistakes": mistakes / games,
+        }
+
+    def start_session(self, user_id, category, mode):
+        """
+        Patrz game.start_session.
+        """
+        with self._lock:
+            session_id = len(self._sessions) + 1
+            now = _now()
+            self._sessions[session_id] = {"user_id": user_id, "category": category, "mode": mode,
+                                          "started_at": now, "updated_at": now, "rounds": 0, "wins": 0,
+                                          "mistakes": 0, "best_streak": 0}
+        return session_id
+
+    def update_session(self, user_id, session_id, rounds, wins, mistakes, best_streak):
+        """
+        Patrz game.update_session.
+        """
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is not None and session["user_id"] == user_id:
+                session.update(updated_at=_now(), rounds=rounds, wins=wins, mistakes=mistakes,
+                               best_streak=best_streak)
+
+class SqlAlchemyApi(_WordCache, Repository):
+    """
+    Magazyn danych gry w dowolnej bazie obsługiwanej przez SQLAlchemy (np. PostgreSQL).
+
+    Używa tabel z modułu models i zapytań SQLAlchemy Core bez składni właściwej
+    dla SQLite (wstawienie albo aktualizacja to UPDATE, a po nim INSERT, jeśli nie
+    zmienił żadnego wiersza). Słowa są trzymane w pamięci jak w word_index, a zapisy
+    gier i gier w toku idą przez kolejki zapisu partiami (writer.GameWriter),
+    tak jak w game. SQLAlchemy jest importowana dopiero w init.
+    """
+    def __init__(self, url=DEFAULT_URL, words_file=WORDS_FILE, hasher=auth):
+        """
+        Args:
+            url: Adres bazy SQLAlchemy (np. postgresql://user@host/hangman albo sqlite:///plik.db).
+            words_file: Plik słownika importowany do pustej tabeli 'words'.
+            hasher: Obiekt z metodami hash_password i verify_password; domyślnie moduł auth (scrypt).
+        """
+        super().__init__()
+        self.url = url
+        self.words_file = words_file
+        self.hasher = hasher
+        self.engine = None
+        self.game_writer = GameWriter(self._save_games)
+        self.progress_writer = GameWriter(self._save_progress)
+
+    def init(self):
+        """
+        Łączy się z bazą, tworzy brakujące tabele, importuje słownik do pustej bazy
+        i wczytuje słowa z alfabetami kategorii do pamięci.
+        """
+        from sqlalchemy import create_engine, delete, func, insert, select
+        from models import Base, Category, Word, WordDifficulty
+
+        self.engine = create_engine(self.url, pool_pre_ping=True)
+        Base.metadata.create_all(self.engine)
+        words = Word.__table__
+        categories = Category.__table__
+        difficulty = WordDifficulty.__table__
+        with self.engine.begin() as conn:
+            if conn.execute(select(words.c.id).limit(1)).first() is None:
+                self._import_words(conn)
+            rows = conn.execute(select(words.c.word, words.c.category, difficulty.c.band)
+                                .outerjoin(difficulty, difficulty.c.word_id == words.c.id)
+                                .order_by(words.c.id)).all()
+            stored = {name: Alphabet(letters, folding or "") for name, letters, folding
+                      in conn.execute(select(categories.c.name, categories.c.alphabet, categories.c.folding))
+                      if letters}
+            self._set_words(rows, stored)
+            counts = dict(conn.execute(select(words.c.category, func.count()).group_by(words.c.category)).all())
+            if set(stored) != set(counts):
+                conn.execute(delete(categories))
+                conn.execute(insert(categories), [
+                    {"name": name, "word_count": count, "alphabet": self._alphabets[name].letters,
+                     "folding": self._alphabets[name].folding}
+                    for name, count in counts.items()
+                ])
+
+    def _import_words(self, conn):
+        """
+        Importuje słownik partiami (duplikaty w kategorii są pomijane przed zapisem).
+        :param conn: połączenie SQLAlchemy w otwartej transakcji
+        """
+        from sqlalchemy import insert
+        from importer import iter_words
+        from models import Word
+
+        statement = insert(Word.__table__)
+        seen = set()
+        batch = []
+        for row in iter_words(self.words_file):
+            key = (row["category"], row["word"])
+            if key in seen:
+                continue
+            seen.add(key)
+            batch.append(row)
+            if len(batch) >= IMPORT_BATCH:
+                conn.execute(statement, batch)
+                batch = []
+        if batch:
+            conn.execute(statement, batch)
+
+    def flush(self):
+        """
+        Czeka, aż zaległe zapisy gier i gier w toku trafią do bazy.
+        """
+        self.progress_writer.flush()
+        self.game_writer.flush()
+
+    def close(self):
+        """
+        Zapisuje zaległe gry, zatrzymuje wątki zapisujące i zamyka połączenia.
+        """
+        self.progress_writer.close()
+        self.game_writer.close()
+        if self.engine is not None:
+            self.engine.dispose()
+
+    def login(self, username, password):
+        """
+        Patrz auth.login.
+        """
+        from sqlalchemy import select, update
+        from models import User
+
+        users = User.__table__
+        with self.engine.connect() as conn:
+            row = conn.execute(select(users.c.id, users.c.password).where(users.c.username == username)).first()
+        if row is None:
+            return None
+        user_id, stored = row
+        ok, needs_rehash = self.hasher.verify_password(password, stored)
+        if not ok:
+            return None
+        if needs_rehash:
+            new_hash = self.hasher.hash_password(password)
+            with self.engine.begin() as conn:
+                conn.execute(update(users).where(users.c.id == user_id).values(password=new_hash))
+        return user_id
+
+    def register(self, username, password):
+        """
+        Patrz auth.register.
+        """
+        from sqlalchemy import insert
+        from sqlalchemy.exc import IntegrityError
+        from models import User
+
+        password_hash = self.hasher.hash_password(password)
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(insert(User.__table__).values(username=username, password=password_hash))
+        except IntegrityError:
+            return False
+        return True
+
+    def _save_games(self, rows, synchronous=None):
+        """
+        Zapisuje partię gier w jednej transakcji razem z podsumowaniami (patrz game.save_games).
+        :param rows: lista krotek (user_id, word, mistakes, won, category)
+        :param synchronous: nieużywany (tryb zapisu SQLite)
+        """
+        from sqlalchemy import insert
+        from models import Game
+
+        played_at = _now()
+        with self.engine.begin() as conn:
+            conn.execute(insert(Game.__table__), [
+                {"user_id": user_id, "word": word, "mistakes": mistakes, "won": bool(won),
+                 "category": category, "played_at": played_at}
+                for user_id, word, mistakes, won, category in rows
+            ])
+            self._update_summaries(conn, rows)
+
+    @staticmethod
+    def _update_summaries(conn, rows):
+        """
+        Dolicza gry do tabel 'user_stats' i 'leaderboard', jednym zapytaniem na gracza
+        (i kategorię) w partii.
+        :param conn: połączenie SQLAlchemy w otwartej transakcji
+        :param rows: lista krotek (user_id, word, mistakes, won, category)
+        """
+        from sqlalchemy import Float, cast, insert, update
+        from models import Leaderboard, UserStats
+
+        stats = {}
+        ranking = {}
+        for user_id, _, mistakes, won, category in rows:
+            if user_id is None:
+                continue
+            keys = [(stats, user_id), (ranking, (ALL_CATEGORIES, user_id))]
+            if category is not None:
+                keys.append((ranking, (category, user_id)))
+            for totals, key in keys:
+                values = totals.setdefault(key, [0, 0, 0])
+                values[0] += 1
+                values[1] += bool(won)
+                values[2] += mistakes
+
+        table = UserStats.__table__
+        for user_id, (games, wins, mistakes) in stats.items():
+            result = conn.execute(update(table).where(table.c.user_id == user_id).values(
+                games=table.c.games + games, wins=table.c.wins + wins, mistakes=table.c.mistakes + mistakes))
+            if result.rowcount == 0:
+                conn.execute(insert(table).values(user_id=user_id, games=games, wins=wins, mistakes=mistakes))
+
+        table = Leaderboard.__table__
+        for (category, user_id), (games, wins, mistakes) in ranking.items():
+            result = conn.execute(update(table).where(table.c.category == category, table.c.user_id == user_id)
+                                  .values(games=table.c.games + games,
+                                          wins=table.c.wins + wins,
+                                          mistakes=table.c.mistakes + mistakes,
+                                          win_rate=cast(table.c.wins + wins, Float) / (table.c.games + games),
+                                          avg_mistakes=cast(table.c.mistakes + mistakes, Float)
+                                          / (table.c.games + games)))
+            if result.rowcount == 0:
+                conn.execute(insert(table).values(category=category, user_id=user_id, games=games, wins=wins,
+                                                  mistakes=mistakes, win_rate=wins / games,
+                                                  avg_mistakes=mistakes / games))
+
+    def _save_progress(self, rows, synchronous=None):
+        """
+        Zapisuje partię zmian gier w toku w jednej transakcji (patrz game.save_progress).
+        :param rows: krotki ('start' | 'guess' | 'finish', user_id, ...)
+        :param synchronous: nieużywany (tryb zapisu SQLite)
+        """
+        from sqlalchemy import delete, insert, select
+        from models import ActiveGame, Game, GuessLog
+
+        active = ActiveGame.__table__
+        log = GuessLog.__table__
+        with self.engine.begin() as conn:
+            for kind, user_id, *values in rows:
+                if kind == "guess":
+                    seq, letter, mask = values
+                    found = conn.execute(select(log.c.seq).where(log.c.user_id == user_id, log.c.seq == seq)).first()
+                    if found is None:
+                        conn.execute(insert(log).values(user_id=user_id, seq=seq, letter=letter, mask=mask))
+                elif kind == "start":
+                    word, category, mode, letters = values
+                    conn.execute(delete(log).where(log.c.user_id == user_id))
+                    conn.execute(delete(active).where(active.c.user_id == user_id))
+                    conn.execute(insert(active).values(user_id=user_id, word=word, category=category, mode=mode,
+                                                       letters=letters))
+                else:
+                    word, mistakes, won, category = values
+                    guesses = "".join(conn.execute(select(log.c.letter).where(log.c.user_id == user_id)
+                                                   .order_by(log.c.seq)).scalars())
+                    conn.execute(insert(Game.__table__).values(user_id=user_id, word=word, mistakes=mistakes,
+                                                               won=bool(won), category=category, guesses=guesses,
+                                                               played_at=_now()))
+                    self._update_summaries(conn, [(user_id, word, mistakes, won, category)])
+                    conn.execute(delete(log).where(log.c.user_id == user_id))
+                    conn.execute(delete(active).where(active.c.user_id == user_id))
+
+    def save_game(self, user_id, word, mistakes, won, category=None):
+        """
+        Patrz game.save_game.
+        """
+        self.game_writer.put((user_id, word, mistakes, int(won), category))
+
+    def start_progress(self, user_id, word, category, mode, letters):
+        """
+        Patrz game.start_progress.
+        """
+        self.progress_writer.put(("start", user_id, word, category, mode, letters))
+
+    def save_guess(self, user_id, seq, letter, mask):
+        """
+        Patrz game.save_guess.
+        """
+        self.progress_writer.put(("guess", user_id, seq, letter, mask))
+
+    def finish_game(self, user_id, word, mistakes, won, category=None):
+        """
+        Patrz game.finish_game.
+        """
+        self.progress_writer.put(("finish", user_id, word, mistakes, int(won), category))
+
+    def get_progress(self, user_id):
+        """
+        Patrz game.get_progress.
+        """
+        from sqlalchemy import select
+        from models import ActiveGame, GuessLog
+
+        active = ActiveGame.__table__
+        log = GuessLog.__table__
+        last_mask = (select(log.c.mask).where(log.c.user_id == user_id)
+                     .order_by(log.c.seq.desc()).limit(1).scalar_subquery())
+        self.progress_writer.flush()
+        with self.engine.connect() as conn:
+            row = conn.execute(select(active.c.word, active.c.category, active.c.mode, active.c.letters, last_mask)
+                               .where(active.c.user_id == user_id)).first()
+        if row is None:
+            return None
+        word, category, mode, letters, mask = row
+        return {"word": word, "category": category, "mode": mode, "letters": letters, "mask": mask or 0}
+
+    def get_user_stats(self, user_id):
+        """
+        Patrz game.get_user_stats.
+        """
+        from sqlalchemy import select
+        from models import UserStats
+
+        table = UserStats.__table__
+        self.flush()
+        with self.engine.connect() as conn:
+            row = conn.execute(select(table.c.games, table.c.wins, table.c.mistakes)
+                               .where(table.c.user_id == user_id)).first()
+        return _stats(*(row or (0, 0, 0)))
+
+    def get_game_history(self, user_id, before_id=None, limit=100):
+        """
+        Patrz game.get_game_history.
+        """
+        from sqlalchemy import select
+        from models import Game
+
+        games = Game.__table__
+        query = select(games.c.id, games.c.word, games.c.mistakes, games.c.won).where(games.c.user_id == user_id)
+        if before_id is not None:
+            query = query.where(games.c.id < before_id)
+        self.flush()
+        with self.engine.connect() as conn:
+            rows = conn.execute(query.order_by(games.c.id.desc()).limit(limit)).all()
+        return [(game_id, word, mistakes, int(won)) for game_id, word, mistakes, won in rows]
+
+    def get_leaderboard(self, category=None, limit=10):
+        """
+        Patrz game.get_leaderboard.
+        """
+        from sqlalchemy import select
+        from models import Leaderboard, User
+
+        table = Leaderboard.__table__
+        users = User.__table__
+        query = (select(users.c.username, table.c.games, table.c.wins, table.c.win_rate, table.c.avg_mistakes)
+                 .join(users, users.c.id == table.c.user_id)
+                 .where(table.c.category == (category or ALL_CATEGORIES))
+                 .order_by(table.c.wins.desc(), table.c.win_rate.desc(), table.c.avg_mistakes, table.c.user_id)
+                 .limit(limit))
+        self.flush()
+        with self.engine.connect() as conn:
+            rows = conn.execute(query).all()
+        return [(place, username, games, wins, win_rate * 100, avg_mistakes)
+                for place, (username, games, wins, win_rate, avg_mistakes) in enumerate(rows, 1)]
+
+    def get_rank(self, user_id, category=None):
+        """
+        Patrz game.get_rank.
+        """
+        from sqlalchemy import and_, func, or_, select
+        from models import Leaderboard
+
+        table = Leaderboard.__table__
+        category = category or ALL_CATEGORIES
+        self.flush()
+        with self.engine.connect() as conn:
+            row = conn.execute(select(table.c.games, table.c.wins, table.c.win_rate, table.c.avg_mistakes)
+                               .where(table.c.category == category, table.c.user_id == user_id)).first()
+            if row is None:
+                return None
+            games, wins, win_rate, avg_mistakes = row
+            above = conn.execute(select(func.count()).select_from(table).where(
+                table.c.category == category,
+                or_(table.c.wins > wins, and_(table.c.wins == wins, or_(
+                    table.c.win_rate > win_rate, and_(table.c.win_rate == win_rate, or_(
+                        table.c.avg_mistakes < avg_mistakes,
+                        and_(table.c.avg_mistakes == avg_mistakes, table.c.user_id < user_id)))))))).scalar()
+        return {
+            "rank": above + 1,
+            "games": games,
+            "wins": wins,
+            "win_percentage": win_rate * 100,
+            "avg_mistakes": avg_mistakes,
+        }
+
+    def start_session(self, user_id, category, mode):
+        """
+        Patrz game.start_session.
+        """
+        from sqlalchemy import insert
+        from models import Session
+
+        now = _now()
+        with self.engine.begin() as conn:
+            result = conn.execute(insert(Session.__table__).values(
+                user_id=user_id, category=category, mode=mode, started_at=now, updated_at=now,
+                rounds=0, wins=0, mistakes=0, best_streak=0))
+            return result.inserted_primary_key[0]
+
+    def update_session(self, user_id, session_id, rounds, wins, mistakes, best_streak):
+        """
+        Patrz game.update_session.
+        """
+        from sqlalchemy import update
+        from models import Session
+
+        table = Session.__table__
+        with self.engine.begin() as conn:
+            conn.execute(update(table).where(table.c.id == session_id, table.c.user_id == user_id).values(
+                updated_at=_now(), rounds=rounds, wins=wins, mistakes=mistakes, best_streak=best_streak))
@@ -0,0 +1,110 @@
+import random
+import threading
+
+from database import get_connection
+
+LOAD_WORDS_SQL = """
+    SELECT w.id, w.word, w.category, d.band FROM words w
+    LEFT JOIN word_difficulty d ON d.word_id = w.id
+    WHERE w.id>? ORDER BY w.id
+"""
+
+DIFFICULTIES = ("easy", "medium", "hard")
+DEFAULT_BAND = 1    # słowa jeszcze bez oceny trudności traktujemy jak średnie
+
+class WordIndex:
+    """
+    Indeks słów w pamięci.
+
+    Przy pierwszym użyciu wczytuje tabelę 'words' do list słów pogrupowanych
+    według kategorii, dzięki czemu losowanie słowa nie wymaga zapytania do bazy
+    i działa w czasie stałym. Nowe słowa są dociągane przyrostowo (po id).
+    Słowa każdej kategorii są też podzielone na przedziały trudności
+    (tabela 'word_difficulty'), z których losowanie również działa w czasie O(1).
+    """
+    def __init__(self):
+        self._words = {}
+        self._bands = {}
+        self._last_id = 0
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def _load_new(self):
+        """
+        Dociąga do indeksu słowa o id większym niż ostatnio wczytane.
+        Wywoływane z założoną blokadą.
+        """
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(LOAD_WORDS_SQL, (self._last_id,))
+            for word_id, word, category, band in cursor:
+                word = word.upper()
+                self._words.setdefault(category, []).append(word)
+                bands = self._bands.get(category)
+                if bands is None:
+                    bands = self._bands[category] = [[] for _ in DIFFICULTIES]
+                bands[DEFAULT_BAND if band is None else band].append(word)
+                self._last_id = word_id
+        self._loaded = True
+
+    def refresh(self):
+        """
+        Dodaje do indeksu słowa dopisane do bazy od ostatniego wczytania.
+        Jeśli indeks nie był jeszcze wczytany, nic nie robi (wczyta się przy pierwszym użyciu).
+        """
+        with self._lock:
+            if self._loaded:
+                self._load_new()
+
+    def invalidate(self):
+        """
+        Unieważnia cały indeks, np. po usunięciu słów z bazy albo przeliczeniu trudności.
+        Kolejne użycie wczyta go od nowa.
+        """
+        with self._lock:
+            self._words = {}
+            self._bands = {}
+            self._last_id = 0
+            self._loaded = False
+
+    def words(self, category):
+        """
+        Zwraca listę słów z danej kategorii (wielkimi literami).
+        :param category: nazwa kategorii
+        :return: lista słów; pusta, jeśli kategoria nie istnieje
+        """
+        with self._lock:
+            if not self._loaded:
+                self._load_new()
+            return self._words.get(category, [])
+
+    def band(self, category, difficulty):
+        """
+        Zwraca listę słów z danej kategorii i przedziału trudności.
+        :param category: nazwa kategorii
+        :param difficulty: 'easy', 'medium' albo 'hard'
+        :return: lista słów; pusta, jeśli w przedziale nie ma słów
+        """
+        if difficulty not in DIFFICULTIES:
+            raise ValueError(f"Nieznany poziom trudności: {difficulty}")
+        band = DIFFICULTIES.index(difficulty)
+        with self._lock:
+            if not self._loaded:
+                self._load_new()
+            bands = self._bands.get(category)
+            return bands[band] if bands is not None else []
+
+    def random_word(self, category, difficulty=None):
+        """
+        Losuje słowo z kategorii z rozkładem jednostajnym w czasie O(1).
+        :param category: nazwa kategorii
+        :param difficulty: przedział trudności ('easy', 'medium', 'hard') albo None - dowolny.
+            Jeśli w przedziale nie ma słów, losowane jest dowolne słowo z kategorii.
+        :return: słowo wielkimi literami albo None, jeśli kategoria jest pusta
+        """
+        words = self.band(category, difficulty) if difficulty is not None else None
+        if not words:
+            words = self.words(category)
+        return random.choice(words) if words else None
+
+word_index = WordIndex()
@@ -0,0 +1,125 @@
+import logging
+import queue
+import threading
+import time
+
+FLUSH_INTERVAL = 0.5
+BATCH_SIZE = 500
+DURABILITY = {
+    "off": "OFF",
+    "normal": "NORMAL",
+    "full": "FULL",
+}
+
+_FLUSH = object()
+_STOP = object()
+
+log = logging.getLogger(__name__)
+
+class GameWriter:
+    """
+    Kolejka zapisu w tle (write-behind).
+
+    Wiersze trafiają do kolejki, a osobny wątek zapisuje je partiami w jednej transakcji
+    co 'flush_interval' sekund lub po zebraniu 'batch_size' wierszy. Dzięki temu wątek
+    wywołujący (np. interfejs Tk) nigdy nie czeka na zapis na dysk.
+    """
+    def __init__(self, write, flush_interval=FLUSH_INTERVAL, batch_size=BATCH_SIZE, durability="normal"):
+        """
+        :param write: funkcja zapisująca partię: write(rows, synchronous)
+        :param flush_interval: maksymalny czas (s) oczekiwania wiersza w kolejce
+        :param batch_size: maksymalna liczba wierszy w jednej transakcji
+        :param durability: poziom trwałości zapisu: 'off', 'normal' lub 'full' (PRAGMA synchronous)
+        """
+        if durability not in DURABILITY:
+            raise ValueError(f"Nieznany poziom trwałości: {durability}")
+        self.write = write
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.durability = durability
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _start(self):
+        """
+        Uruchamia wątek zapisujący przy pierwszym użyciu.
+        """
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="game-writer", daemon=True)
+                self._thread.start()
+
+    def put(self, row):
+        """
+        Dodaje wiersz do kolejki zapisu i od razu wraca.
+        :param row: krotka parametrów przekazywana do funkcji zapisującej
+        """
+        self._start()
+        self._queue.put(row)
+
+    def flush(self):
+        """
+        Wymusza natychmiastowy zapis i czeka, aż wszystkie wiersze z kolejki trafią do bazy.
+        """
+        if self._thread is None:
+            return
+        self._queue.put(_FLUSH)
+        self._queue.join()
+
+    def close(self):
+        """
+        Zapisuje wszystko, co zostało w kolejce, i zatrzymuje wątek zapisujący.
+        """
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._thread = None
+
+    def _write_batch(self, batch):
+        """
+        Zapisuje partię wierszy; błąd zapisu jest logowany, żeby nie zatrzymać wątku.
+        """
+        if not batch:
+            return
+        try:
+            self.write(batch, DURABILITY[self.durability])
+        except Exception:
+            log.exception("Nie udało się zapisać %d wierszy", len(batch))
+
+    def _run(self):
+        """
+        Pętla wątku zapisującego: zbiera wiersze do partii i zapisuje je.
+        """
+        batch = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = _FLUSH
+                done = 0
+            else:
+                done = 1
+
+            if item is _FLUSH or item is _STOP:
+                self._write_batch(batch)
+                for _ in range(len(batch) + done):
+                    self._queue.task_done()
+                batch = []
+                deadline = None
+                if item is _STOP:
+                    return
+                continue
+
+            batch.append(item)
+            if deadline is None:
+                deadline = time.monotonic() + self.flush_interval
+            if len(batch) >= self.batch_size:
+                self._write_batch(batch)
+                for _ in batch:
+                    self._queue.task_done()
+                batch = []
+                deadline = None
@@ -0,0 +1,21 @@
+import os
+import sys
+
+import pytest
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+sys.path.insert(0, SRC)
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """
+    Świeża baza SQLite w katalogu tymczasowym, ze słownikiem z 'words.json'.
+    Testy działają w katalogu src, tak jak gra (database.WORDS_FILE jest względny).
+    """
+    import database
+
+    monkeypatch.chdir(SRC)
+    database.configure_db(str(tmp_path / "hangman.db"))
+    database.init_db()
+    yield database
+    database.pool.dispose()
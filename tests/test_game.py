@@ -0,0 +1,36 @@
+import game
+from alphabet import DEFAULT_ALPHABET
+from session import restore_game
+
+def test_guest_games_skip_summaries(db):
+    with db.get_connection() as conn:
+        user_id = conn.execute("INSERT INTO users (username, password) VALUES ('ala', '-')").lastrowid
+    game.save_games([(None, "KOT", 2, 1, "Zwierzęta"), (user_id, "PIES", 1, 1, "Zwierzęta")])
+
+    with db.get_connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM games").fetchone()[0] == 2
+        assert conn.execute("SELECT user_id, games FROM user_stats").fetchall() == [(user_id, 1)]
+        assert conn.execute("SELECT COUNT(*) FROM leaderboard WHERE user_id IS NULL").fetchone()[0] == 0
+        assert conn.execute("SELECT COUNT(*) FROM leaderboard").fetchone()[0] == 2
+
+def test_progress_restores_guesses(db):
+    with db.get_connection() as conn:
+        user_id = conn.execute("INSERT INTO users (username, password) VALUES ('ala', '-')").lastrowid
+    letters = DEFAULT_ALPHABET.letters
+    game.start_progress(user_id, "KOT", "Zwierzęta", "classic", letters)
+    for seq, guessed in enumerate(("K", "KA", "KAE"), 1):
+        game.save_guess(user_id, seq, guessed[-1], DEFAULT_ALPHABET.mask(guessed))
+    game.progress_writer.flush()
+
+    progress = game.get_progress(user_id)
+    assert (progress["word"], progress["category"], progress["mode"]) == ("KOT", "Zwierzęta", "classic")
+    restored, _ = restore_game(progress, DEFAULT_ALPHABET)
+    assert restored.used_letters == {"K", "A", "E"}
+    assert restored.mistakes == 2
+
+    game.finish_game(user_id, "KOT", 2, 0, "Zwierzęta")
+    game.progress_writer.flush()
+    assert game.get_progress(user_id) is None
+    with db.get_connection() as conn:
+        assert conn.execute("SELECT word, mistakes, won FROM games WHERE user_id = ?",
+                            (user_id,)).fetchall() == [("KOT", 2, 0)]
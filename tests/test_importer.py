@@ -0,0 +1,16 @@
+from importer import import_words
+
+def test_import_counts_added_words_and_updates_category(db, tmp_path):
+    words = tmp_path / "ptaki.txt"
+    words.write_text("wróbel\nsikorka\nwróbel\n", encoding="utf-8")
+    first = import_words(str(words), category="Ptaki", batch_size=2)
+    assert (first["read"], first["added"], first["duplicates"]) == (3, 2, 1)
+
+    words.write_text("sikorka\nżuraw\n", encoding="utf-8")
+    second = import_words(str(words), category="Ptaki")
+    assert (second["added"], second["duplicates"]) == (1, 1)
+
+    with db.get_connection() as conn:
+        word_count, alphabet = conn.execute("SELECT word_count, alphabet FROM categories WHERE name = 'Ptaki'").fetchone()
+    assert word_count == 3
+    assert {"Ó", "Ż"} <= set(alphabet)
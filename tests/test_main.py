@@ -0,0 +1,25 @@
+import pytest
+
+from animation import FrameScheduler
+from main import parse_args, run_solver
+
+def test_fps_must_be_positive():
+    assert parse_args(["--fps", "30"]).fps == 30
+    for value in ("0", "-5", "x"):
+        with pytest.raises(SystemExit):
+            parse_args(["--fps", value])
+
+def test_scheduler_rejects_zero_fps():
+    with pytest.raises(ValueError):
+        FrameScheduler(None, 0)
+
+def test_solver_games_must_be_positive():
+    for command in ("solve", "simulate"):
+        assert parse_args([command, "--games", "10"]).games == 10
+        with pytest.raises(SystemExit):
+            parse_args([command, "--games", "0"])
+
+def test_solver_without_words_prints_message(db, capsys):
+    run_solver(parse_args(["--storage", "memory", "solve", "--category", "Brak", "--games", "10",
+                           "--workers", "0"]))
+    assert "Brak słów" in capsys.readouterr().out
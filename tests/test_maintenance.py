@@ -0,0 +1,80 @@
+import sqlite3
+
+import pytest
+
+import maintenance
+from difficulty import update_difficulty
+
+OLD_GAME_SQL = "INSERT INTO games (user_id, word, mistakes, won, category, played_at) VALUES (?, ?, ?, ?, ?, '2000-01-01 00:00:00')"
+
+def add_old_games(database, words):
+    with database.get_connection() as conn:
+        conn.executemany(OLD_GAME_SQL, [(None, word, 1, 1, "Zwierzęta") for word in words])
+
+def archived(path):
+    with sqlite3.connect(path) as conn:
+        return conn.execute("SELECT id, word FROM games ORDER BY id").fetchall()
+
+def test_archive_twice_keeps_every_game(db, tmp_path):
+    archive = str(tmp_path / "archive.db")
+    add_old_games(db, ["KOT", "PIES"])
+    update_difficulty()
+    assert maintenance.archive_games(archive=archive, pause=0)["games"] == 2
+
+    add_old_games(db, ["KRET", "ŻABA"])
+    update_difficulty()
+    assert maintenance.archive_games(archive=archive, pause=0)["games"] == 2
+
+    rows = archived(archive)
+    assert [word for _, word in rows] == ["KOT", "PIES", "KRET", "ŻABA"]
+    assert len({game_id for game_id, _ in rows}) == 4
+    with db.get_connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM games").fetchone()[0] == 0
+        assert conn.execute("SELECT SUM(games) FROM games_daily").fetchone()[0] == 4
+
+def test_new_games_skip_ids_of_archived_games(db, tmp_path):
+    archive = str(tmp_path / "archive.db")
+    add_old_games(db, ["KOT"])
+    update_difficulty()
+    maintenance.archive_games(archive=archive, pause=0)
+    with sqlite3.connect(archive) as conn:
+        conn.execute("INSERT INTO games (id, word) VALUES (100, 'SOWA')")
+
+    maintenance.archive_games(archive=archive, pause=0)
+    add_old_games(db, ["KRET"])
+    with db.get_connection() as conn:
+        assert conn.execute("SELECT id FROM games WHERE word='KRET'").fetchone()[0] > 100
+
+def test_archive_conflict_keeps_live_games(db, tmp_path):
+    archive = str(tmp_path / "archive.db")
+    add_old_games(db, ["KOT"])
+    update_difficulty()
+    with db.get_connection() as conn:
+        game_id = conn.execute("SELECT id FROM games").fetchone()[0]
+    with sqlite3.connect(archive) as conn:
+        conn.execute(maintenance.ARCHIVE_TABLE_SQL.replace("archive.games", "games"))
+        conn.execute("INSERT INTO games (id, word) VALUES (?, 'SOWA')", (game_id,))
+
+    with pytest.raises(sqlite3.IntegrityError):
+        maintenance.archive_games(archive=archive, pause=0)
+    with db.get_connection() as conn:
+        assert conn.execute("SELECT word FROM games").fetchall() == [("KOT",)]
+
+def test_migration_adds_autoincrement(db):
+    with db.get_connection() as conn:
+        conn.execute("ALTER TABLE games RENAME TO games_new")
+        conn.execute("CREATE TABLE games (id INTEGER PRIMARY KEY, user_id INTEGER, word VARCHAR NOT NULL,"
+                     " mistakes INTEGER, won BOOLEAN, category VARCHAR, guesses VARCHAR, played_at VARCHAR)")
+        conn.execute("INSERT INTO games SELECT * FROM games_new")
+        conn.execute("DROP TABLE games_new")
+        conn.execute("INSERT INTO games (id, word) VALUES (7, 'KOT')")
+        conn.execute("INSERT INTO job_progress (name, last_id) VALUES ('word_difficulty', 20)")
+    db.set_schema_version(db.SCHEMA_VERSION - 1)
+    db.init_db()
+
+    add_old_games(db, ["PIES"])
+    with db.get_connection() as conn:
+        sql = conn.execute("SELECT sql FROM sqlite_master WHERE name='games'").fetchone()[0]
+        assert "AUTOINCREMENT" in sql
+        assert conn.execute("SELECT word FROM games WHERE id=7").fetchone() == ("KOT",)
+        assert conn.execute("SELECT id FROM games WHERE word='PIES'").fetchone()[0] == 21
@@ -0,0 +1,72 @@
+import asyncio
+import json
+
+import pytest
+
+import auth
+from client import GameClient, ServerError
+from server import GameServer
+
+@pytest.fixture
+def no_processes(monkeypatch):
+    monkeypatch.setattr(auth, "USE_PROCESSES", False)
+
+async def serve(check):
+    """
+    Uruchamia serwer gry na 127.0.0.1 (dowolny wolny port) i czeka na korutynę check(server).
+    """
+    server = GameServer("127.0.0.1", 0, workers=2)
+    await server.start()
+    try:
+        return await check(server)
+    finally:
+        server.close()
+        await server.server.wait_closed()
+
+def test_round_through_client(db, no_processes):
+    def play(server):
+        client = GameClient("127.0.0.1", server.port)
+        try:
+            with pytest.raises(ServerError):
+                client.get_user_stats(None)
+            assert client.register("ala", "kot") is True
+            user_id = client.login("ala", "kot")
+            assert user_id is not None
+
+            category = client.get_categories()[0]
+            word = client.get_random_word(category)
+            alphabet = client.get_alphabet(category)
+            client.start_progress(user_id, word, category, "classic", alphabet.letters)
+            client.save_guess(user_id, 1, word[0], 1)
+            progress = client.get_progress(user_id)
+            assert (progress["word"], progress["mask"]) == (word, 1)
+
+            client.finish_game(user_id, word, 2, True, category)
+            assert client.get_progress(user_id) is None
+            stats = client.get_user_stats(user_id)
+            assert (stats["games"], stats["wins"], stats["mistakes"]) == (1, 1, 2)
+            assert [row[1:] for row in client.get_game_history(user_id)] == [(word, 2, 1)]
+        finally:
+            client.close()
+
+    # GameClient używa blokujących gniazd, więc działa w osobnym wątku
+    asyncio.run(serve(lambda server: asyncio.to_thread(play, server)))
+
+def test_malformed_line_keeps_connection(db, no_processes, caplog):
+    async def exchange(server):
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+        try:
+            writer.write(b'{"id": 1, "op": \n')
+            writer.write(json.dumps({"id": 2, "op": "nieznana"}).encode() + b"\n")
+            writer.write(json.dumps({"id": 3, "op": "categories"}).encode() + b"\n")
+            await writer.drain()
+            return [json.loads(await reader.readline()) for _ in range(2)]
+        finally:
+            writer.close()
+            await writer.wait_closed()
+
+    # Linia, której nie da się odczytać, nie ma id, więc serwer tylko ją loguje
+    unknown, categories = asyncio.run(serve(exchange))
+    assert unknown == {"id": 2, "ok": False, "error": "Nieznana operacja: nieznana"}
+    assert categories["id"] == 3 and categories["ok"] is True and categories["result"]
+    assert "nie powiodło się" in caplog.text
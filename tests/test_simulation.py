@@ -0,0 +1,21 @@
+from difficulty import lexical_difficulty
+from simulation import letter_order, play, simulate, words_alphabet
+
+def test_letter_order_covers_category_alphabet():
+    alphabet = words_alphabet(["ŻABA", "KOT"])
+    order = letter_order(["ŻABA", "KOT"], alphabet)
+    assert sorted(order) == sorted(alphabet.letters)
+    assert "Ż" in order[:5]
+
+def test_play_folds_letters_without_own_key():
+    alphabet = words_alphabet(["CAFÉ"])
+    assert play("CAFÉ", "CAFE", 6, alphabet).hidden == 0
+
+def test_random_strategy_wins_polish_words():
+    assert simulate(["ŻABA"], 1000, "random", seed=1)["wins"] > 0
+
+def test_lexical_difficulty_uses_whole_keyboard():
+    alphabet = words_alphabet(["ŻÓŁW"])
+    order = letter_order(["KOT"], alphabet)
+    # Ż jest ostatnią literą klawiatury, więc słowo odgaduje dopiero ostatnia próba.
+    assert lexical_difficulty("ŻÓŁW", order, alphabet=alphabet) == (len(order) - 4) / 6
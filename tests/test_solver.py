@@ -0,0 +1,22 @@
+import random
+
+from simulation import words_alphabet
+from solver import Dictionary, solve
+
+def test_dictionary_skips_revealed_characters():
+    words = ["NOWY JORK", "NOWY-SĄCZ"]
+    dictionary = Dictionary(words, words_alphabet(words))
+    assert " " not in dictionary.letters and "-" not in dictionary.letters
+    assert "Ą" in dictionary.letters
+    assert all(letter.isalpha() for pattern in dictionary.word_patterns for letter in pattern)
+
+def test_dictionary_folds_letters_to_keys():
+    dictionary = Dictionary(["CAFÉ"], words_alphabet(["CAFÉ"]))
+    assert "É" not in dictionary.letters
+    won, mistakes = dictionary.play("CAFÉ", "frequency", random.Random(1))
+    assert won and mistakes == 0
+
+def test_solve_wins_words_with_spaces():
+    words = {"Stolice": ["NOWY JORK", "RZYM", "ŁÓDŹ"]}
+    results = solve(words, 300, ["frequency"], workers=0, seed=1)
+    assert all(r["wins"] == r["games"] for r in results)
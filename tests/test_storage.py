@@ -0,0 +1,104 @@
+import pytest
+
+import auth
+from api import LocalApi
+from repository import Repository
+from storage import FastHasher, MemoryApi, SqlAlchemyApi, open_storage
+
+@pytest.fixture(params=["sqlite", "memory", "sqlalchemy"])
+def api(request, db, tmp_path, monkeypatch):
+    """
+    Każdy magazyn danych na świeżej bazie; fikstura db ustawia też katalog src,
+    z którego MemoryApi i SqlAlchemyApi czytają słownik.
+    """
+    monkeypatch.setattr(auth, "USE_PROCESSES", False)
+    if request.param == "sqlite":
+        yield LocalApi()
+        return
+    if request.param == "memory":
+        storage = MemoryApi()
+    else:
+        storage = SqlAlchemyApi(f"sqlite:///{tmp_path / 'sqlalchemy.db'}")
+    storage.init()
+    yield storage
+    storage.close()
+
+def test_backends_implement_repository(api):
+    assert isinstance(api, Repository)
+
+def test_register_and_login(api):
+    assert api.register("ala", "kot") is True
+    assert api.register("ala", "pies") is False
+    user_id = api.login("ala", "kot")
+    assert user_id is not None
+    assert api.login("ala", "pies") is None
+    assert api.login("ola", "kot") is None
+
+def test_words_and_categories(api):
+    categories = api.get_categories()
+    assert categories and categories == sorted(categories)
+    words = api.get_words(categories[0])
+    assert words and all(word == word.upper() for word in words)
+    assert api.get_random_word(categories[0]) in words
+    assert api.get_words("Brak") == []
+    assert set(api.get_alphabet(categories[0]).letters) >= set("ABCXYZ")
+
+def test_stats_and_ranking(api):
+    api.register("ala", "1")
+    api.register("ola", "2")
+    ala, ola = api.login("ala", "1"), api.login("ola", "2")
+    for won, mistakes in ((1, 1), (1, 3), (0, 6)):
+        api.save_game(ala, "KOT", mistakes, won, "Zwierzęta")
+    api.save_game(ola, "PIES", 0, 1, "Zwierzęta")
+    api.save_game(None, "KRET", 2, 1, "Zwierzęta")
+    api.flush()
+
+    stats = api.get_user_stats(ala)
+    assert (stats["games"], stats["wins"], stats["mistakes"]) == (3, 2, 10)
+    assert api.get_user_stats(ola)["games"] == 1
+
+    top = api.get_leaderboard("Zwierzęta")
+    assert [(place, name, games, wins) for place, name, games, wins, *_ in top] == \
+        [(1, "ala", 3, 2), (2, "ola", 1, 1)]
+    assert len(api.get_leaderboard()) == 2
+    assert api.get_rank(ola)["rank"] == 2
+    assert api.get_rank(ala, "Owoce") is None
+
+def test_history_paging(api):
+    api.register("ala", "1")
+    user_id = api.login("ala", "1")
+    for i in range(5):
+        api.save_game(user_id, f"SLOWO{i}", i, 1)
+    api.flush()
+
+    first = api.get_game_history(user_id, limit=2)
+    assert [word for _, word, _, _ in first] == ["SLOWO4", "SLOWO3"]
+    second = api.get_game_history(user_id, first[-1][0], 2)
+    assert [word for _, word, _, _ in second] == ["SLOWO2", "SLOWO1"]
+    assert [tuple(row)[1:] for row in api.get_game_history(user_id, second[-1][0])] == [("SLOWO0", 0, 1)]
+
+def test_progress_round_trip(api):
+    api.register("ala", "1")
+    user_id = api.login("ala", "1")
+    api.start_progress(user_id, "KOT", "Zwierzęta", "classic", "ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+    api.save_guess(user_id, 1, "K", 1 << 10)
+    api.save_guess(user_id, 2, "A", 1 << 10 | 1)
+    api.flush()
+    progress = api.get_progress(user_id)
+    assert (progress["word"], progress["mode"], progress["mask"]) == ("KOT", "classic", 1 << 10 | 1)
+
+    api.finish_game(user_id, "KOT", 1, 1, "Zwierzęta")
+    api.flush()
+    assert api.get_progress(user_id) is None
+    assert api.get_user_stats(user_id)["games"] == 1
+
+def test_memory_backend_uses_fast_hasher():
+    api = MemoryApi()
+    assert isinstance(api.hasher, FastHasher)
+    stored = api.hasher.hash_password("kot")
+    assert api.hasher.verify_password("kot", stored) == (True, False)
+    assert api.hasher.verify_password("pies", stored) == (False, False)
+
+def test_open_storage_rejects_unknown_backend():
+    with pytest.raises(ValueError):
+        open_storage("redis")